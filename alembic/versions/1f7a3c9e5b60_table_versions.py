@@ -0,0 +1,32 @@
+"""table_versions
+
+Revision ID: 1f7a3c9e5b60
+Revises: e41c8b5f0d27
+Create Date: 2026-10-18 13:40:19.502871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1f7a3c9e5b60'
+down_revision = 'e41c8b5f0d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    table_versions = op.create_table('table_versions',
+    sa.Column('tabela', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('tabela')
+    )
+    op.bulk_insert(table_versions, [
+        {'tabela': 'categorias', 'version': 0},
+        {'tabela': 'centros_treinamento', 'version': 0},
+    ])
+
+
+def downgrade() -> None:
+    op.drop_table('table_versions')
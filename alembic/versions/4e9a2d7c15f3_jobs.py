@@ -0,0 +1,51 @@
+"""jobs
+
+Revision ID: 4e9a2d7c15f3
+Revises: b3d81f6e2c94
+Create Date: 2026-10-18 20:41:07.318254
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e9a2d7c15f3'
+down_revision = 'b3d81f6e2c94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('jobs',
+    sa.Column('pk_id', sa.Integer(), nullable=False),
+    sa.Column('tipo', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('resultado', sa.JSON(), nullable=True),
+    sa.Column('erro', sa.Text(), nullable=True),
+    sa.Column('progresso', sa.Float(), nullable=False),
+    sa.Column('mensagem', sa.String(length=200), nullable=True),
+    sa.Column('tentativas', sa.Integer(), nullable=False),
+    sa.Column('max_tentativas', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('worker', sa.String(length=100), nullable=True),
+    sa.Column('travado_ate', sa.DateTime(), nullable=True),
+    sa.Column('executar_em', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('iniciado_em', sa.DateTime(), nullable=True),
+    sa.Column('concluido_em', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.PrimaryKeyConstraint('pk_id')
+    )
+    op.create_index('ix_jobs_id', 'jobs', ['id'], unique=True)
+    op.create_index('ix_jobs_user_id', 'jobs', ['user_id'], unique=False)
+    op.create_index('ix_jobs_tipo_status_executar_em', 'jobs', ['tipo', 'status', 'executar_em'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_tipo_status_executar_em', table_name='jobs')
+    op.drop_index('ix_jobs_user_id', table_name='jobs')
+    op.drop_index('ix_jobs_id', table_name='jobs')
+    op.drop_table('jobs')
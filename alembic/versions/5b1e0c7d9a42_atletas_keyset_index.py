@@ -0,0 +1,30 @@
+"""atletas_keyset_index
+
+Revision ID: 5b1e0c7d9a42
+Revises: c006e8463eb4
+Create Date: 2026-10-18 09:12:41.208315
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e0c7d9a42'
+down_revision = 'c006e8463eb4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_atletas_created_at_pk_id', 'atletas', ['created_at', 'pk_id'],
+            unique=False, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_atletas_created_at_pk_id', table_name='atletas', postgresql_concurrently=True)
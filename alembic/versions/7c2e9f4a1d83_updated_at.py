@@ -0,0 +1,34 @@
+"""updated_at
+
+Revision ID: 7c2e9f4a1d83
+Revises: 1f7a3c9e5b60
+Create Date: 2026-10-18 15:02:47.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e9f4a1d83'
+down_revision = '1f7a3c9e5b60'
+branch_labels = None
+depends_on = None
+
+_TABELAS = ('atletas', 'categorias', 'centros_treinamento')
+
+
+def upgrade() -> None:
+    for tabela in _TABELAS:
+        # now() é estável: o postgres (11+) grava o default no catálogo, sem reescrever a tabela.
+        # O default só serve para preencher as linhas existentes; a aplicação preenche o valor.
+        op.add_column(tabela, sa.Column(
+            'updated_at', sa.DateTime(), nullable=False,
+            server_default=sa.text("(now() at time zone 'utc')")
+        ))
+        op.alter_column(tabela, 'updated_at', server_default=None)
+
+
+def downgrade() -> None:
+    for tabela in reversed(_TABELAS):
+        op.drop_column(tabela, 'updated_at')
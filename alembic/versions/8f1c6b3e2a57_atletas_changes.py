@@ -0,0 +1,49 @@
+"""atletas_changes
+
+Revision ID: 8f1c6b3e2a57
+Revises: 4e9a2d7c15f3
+Create Date: 2026-10-18 21:36:52.904117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f1c6b3e2a57'
+down_revision = '4e9a2d7c15f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('atletas_changes',
+    sa.Column('pk_id', sa.Integer(), nullable=False),
+    sa.Column('atleta_id', sa.UUID(), nullable=False),
+    sa.Column('operacao', sa.String(length=10), nullable=False),
+    sa.Column('dados', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('pk_id')
+    )
+    op.create_index('ix_atletas_changes_created_at', 'atletas_changes', ['created_at'], unique=False)
+
+    # NOTIFY no canal atletas_changes a cada INSERT no log (GET /atletas/changes; ver `atleta/models.py`)
+    op.execute('''
+        CREATE OR REPLACE FUNCTION atletas_changes_notify() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('atletas_changes', '');
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    ''')
+    op.execute('''
+        CREATE TRIGGER atletas_changes_notify AFTER INSERT ON atletas_changes
+        FOR EACH STATEMENT EXECUTE PROCEDURE atletas_changes_notify()
+    ''')
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER atletas_changes_notify ON atletas_changes')
+    op.execute('DROP FUNCTION atletas_changes_notify()')
+    op.drop_index('ix_atletas_changes_created_at', table_name='atletas_changes')
+    op.drop_table('atletas_changes')
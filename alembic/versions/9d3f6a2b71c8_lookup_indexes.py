@@ -0,0 +1,40 @@
+"""lookup_indexes
+
+Revision ID: 9d3f6a2b71c8
+Revises: 5b1e0c7d9a42
+Create Date: 2026-10-18 10:03:55.671902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3f6a2b71c8'
+down_revision = '5b1e0c7d9a42'
+branch_labels = None
+depends_on = None
+
+# (nome do índice, tabela, colunas, único)
+INDEXES = [
+    ('ix_categorias_id', 'categorias', ['id'], True),
+    ('ix_centros_treinamento_id', 'centros_treinamento', ['id'], True),
+    ('ix_atletas_id', 'atletas', ['id'], True),
+    ('ix_atletas_nome', 'atletas', ['nome'], False),
+    ('ix_atletas_categoria_id', 'atletas', ['categoria_id'], False),
+    ('ix_atletas_centro_treinamento_id', 'atletas', ['centro_treinamento_id'], False),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação.
+    # Se um build concorrente falhar, o postgres deixa o índice INVALID: remova-o antes de rodar de novo.
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(name, table, columns, unique=unique, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
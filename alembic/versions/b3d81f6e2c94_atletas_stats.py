@@ -0,0 +1,78 @@
+"""atletas_stats
+
+Revision ID: b3d81f6e2c94
+Revises: 7c2e9f4a1d83
+Create Date: 2026-10-18 19:12:35.640127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3d81f6e2c94'
+down_revision = '7c2e9f4a1d83'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('atletas_resumo',
+    sa.Column('categoria_id', sa.Integer(), nullable=False),
+    sa.Column('centro_treinamento_id', sa.Integer(), nullable=False),
+    sa.Column('sexo', sa.String(length=1), nullable=False),
+    sa.Column('faixa_imc', sa.String(length=10), nullable=False),
+    sa.Column('quantidade', sa.Integer(), nullable=False),
+    sa.Column('soma_peso', sa.Float(), nullable=False),
+    sa.Column('soma_peso2', sa.Float(), nullable=False),
+    sa.Column('soma_altura', sa.Float(), nullable=False),
+    sa.Column('soma_altura2', sa.Float(), nullable=False),
+    sa.Column('soma_idade', sa.Float(), nullable=False),
+    sa.Column('soma_idade2', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('categoria_id', 'centro_treinamento_id', 'sexo', 'faixa_imc')
+    )
+
+    # Carga inicial a partir dos atletas existentes (mesmas faixas de IMC de `atleta/stats.py`)
+    op.execute('''
+        INSERT INTO atletas_resumo
+        SELECT categoria_id, centro_treinamento_id, sexo, faixa_imc, count(*),
+               sum(peso), sum(peso * peso), sum(altura), sum(altura * altura), sum(idade), sum(idade * idade)
+        FROM (
+            SELECT *, CASE
+                WHEN peso / (altura * altura) < 18.5 THEN 'abaixo'
+                WHEN peso / (altura * altura) < 25 THEN 'normal'
+                WHEN peso / (altura * altura) < 30 THEN 'sobrepeso'
+                ELSE 'obesidade'
+            END AS faixa_imc
+            FROM atletas
+        ) AS atletas
+        GROUP BY categoria_id, centro_treinamento_id, sexo, faixa_imc
+    ''')
+
+    # Percentis por todas as combinações de categoria, centro e sexo (GET /atletas/stats)
+    op.execute('''
+        CREATE MATERIALIZED VIEW atletas_percentis AS
+        SELECT
+            GROUPING(categoria_id, centro_treinamento_id, sexo) AS grupo,
+            COALESCE(categoria_id, 0) AS categoria_id,
+            COALESCE(centro_treinamento_id, 0) AS centro_treinamento_id,
+            COALESCE(sexo, '') AS sexo,
+            percentile_cont(ARRAY[0.25, 0.5, 0.75, 0.9]) WITHIN GROUP (ORDER BY peso) AS peso,
+            percentile_cont(ARRAY[0.25, 0.5, 0.75, 0.9]) WITHIN GROUP (ORDER BY altura) AS altura,
+            percentile_cont(ARRAY[0.25, 0.5, 0.75, 0.9]) WITHIN GROUP (ORDER BY idade) AS idade,
+            now() AT TIME ZONE 'utc' AS atualizado_em
+        FROM atletas
+        GROUP BY CUBE (categoria_id, centro_treinamento_id, sexo)
+    ''')
+    # Exigido pelo REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index(
+        'ix_atletas_percentis_grupo', 'atletas_percentis',
+        ['grupo', 'categoria_id', 'centro_treinamento_id', 'sexo'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP MATERIALIZED VIEW atletas_percentis')
+    # Posição do log de alterações incluída na view, gravada pelo refresher
+    op.execute("DELETE FROM table_versions WHERE tabela = 'atletas_percentis'")
+    op.drop_table('atletas_resumo')
@@ -0,0 +1,39 @@
+"""atletas_search_indexes
+
+Revision ID: e41c8b5f0d27
+Revises: 9d3f6a2b71c8
+Create Date: 2026-10-18 11:27:08.114356
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41c8b5f0d27'
+down_revision = '9d3f6a2b71c8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        # Similaridade (operadores % e <%) e ILIKE na busca de GET /atletas/search
+        op.create_index(
+            'ix_atletas_nome_trgm', 'atletas', ['nome'],
+            postgresql_using='gin', postgresql_ops={'nome': 'gin_trgm_ops'}, postgresql_concurrently=True
+        )
+        # Prefixo de palavras (to_tsquery('simple', 'joa:*'))
+        op.create_index(
+            'ix_atletas_nome_tsv', 'atletas', [sa.text("to_tsvector('simple', nome)")],
+            postgresql_using='gin', postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_atletas_nome_tsv', table_name='atletas', postgresql_concurrently=True)
+        op.drop_index('ix_atletas_nome_trgm', table_name='atletas', postgresql_concurrently=True)
@@ -0,0 +1,7 @@
+import os
+
+# Os módulos da API leem as configurações ao serem importados; os benchmarks
+# recebem a URL do banco por parâmetro, então basta garantir valores padrão.
+os.environ.setdefault('DATABASE_URL', 'sqlite+aiosqlite:///bench.db')
+os.environ.setdefault('API_SECRET_KEY', 'benchmark')
+os.environ.setdefault('API_ALGORITHM', 'HS256')
@@ -0,0 +1,70 @@
+"""
+Compara a listagem de atletas hidratando o ORM (caminho antigo) com a projeção enxuta.
+
+    python -m benchmarks.bench_listagem --url sqlite+aiosqlite:///bench.db --atletas 100000
+"""
+import argparse
+import asyncio
+import time
+
+import benchmarks  # noqa: F401
+from benchmarks.seed import seed
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+
+from workout_api.atleta.models import AtletaModel
+from workout_api.atleta.schemas import AtletaCustom
+from workout_api.atleta.service import AtletaService
+
+
+async def listagem_orm(session: AsyncSession) -> list:
+    query = select(AtletaModel).options(
+        selectinload(AtletaModel.centro_treinamento),
+        selectinload(AtletaModel.categoria)
+    )
+    atletas = (await session.execute(query)).scalars().all()
+    return [
+        AtletaCustom(nome=a.nome, centro_treinamento=a.centro_treinamento.nome, categoria=a.categoria.nome)
+        for a in atletas
+    ]
+
+
+async def listagem_projecao(session: AsyncSession) -> list:
+    rows = (await session.execute(AtletaService._listagem_query())).all()
+    return AtletaService._listagem(rows)
+
+
+async def medir(engine, funcao, repeticoes: int) -> float:
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        # Sessão nova a cada rodada para não aproveitar o identity map da anterior
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            inicio = time.perf_counter()
+            linhas = len(await funcao(session))
+            melhor = min(melhor, time.perf_counter() - inicio)
+    return linhas / melhor
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default='sqlite+aiosqlite:///bench.db')
+    parser.add_argument('--atletas', type=int, default=100_000)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url)
+    await seed(engine, atletas=args.atletas)
+
+    orm = await medir(engine, listagem_orm, args.repeticoes)
+    projecao = await medir(engine, listagem_projecao, args.repeticoes)
+    await engine.dispose()
+
+    print(f'{"caminho":<12}{"linhas/s":>14}')
+    print(f'{"orm":<12}{orm:>14,.0f}')
+    print(f'{"projecao":<12}{projecao:>14,.0f}')
+    print(f'ganho: {projecao / orm:.1f}x')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
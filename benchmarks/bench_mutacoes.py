@@ -0,0 +1,100 @@
+"""
+Compara PATCH/DELETE de atletas no caminho antigo (SELECT + setattr/delete + commit + refresh)
+com o UPDATE/DELETE ... RETURNING do `AtletaService`: idas ao banco e latência por operação.
+
+    python -m benchmarks.bench_mutacoes --url sqlite+aiosqlite:///bench.db --operacoes 500
+"""
+import argparse
+import asyncio
+import time
+
+import benchmarks  # noqa: F401
+from benchmarks.seed import seed
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.future import select
+
+from workout_api.atleta.models import AtletaModel
+from workout_api.atleta.schemas import AtletaUpdate
+from workout_api.atleta.service import AtletaService
+from workout_api.categorias.cache import categorias_cache
+from workout_api.centro_treinamento.cache import centros_treinamento_cache
+
+
+class ContadorIdas:
+    """Conta statements e commits enviados ao banco (cada um é uma ida e volta)."""
+
+    def __init__(self, engine) -> None:
+        self.total = 0
+        event.listen(engine.sync_engine, 'before_cursor_execute', self._contar)
+        event.listen(engine.sync_engine, 'commit', self._contar)
+
+    def _contar(self, *args, **kwargs) -> None:
+        self.total += 1
+
+
+async def update_antigo(session: AsyncSession, id, atleta_up: AtletaUpdate) -> None:
+    atleta = (await session.execute(select(AtletaModel).filter_by(id=id))).scalars().first()
+    for key, value in atleta_up.model_dump(exclude_unset=True).items():
+        setattr(atleta, key, value)
+    await session.commit()
+    await session.refresh(atleta)
+
+
+async def delete_antigo(session: AsyncSession, id) -> None:
+    atleta = (await session.execute(select(AtletaModel).filter_by(id=id))).scalars().first()
+    await session.delete(atleta)
+    await session.commit()
+
+
+async def update_novo(session: AsyncSession, id, atleta_up: AtletaUpdate) -> None:
+    await AtletaService.update(db_session=session, id=id, atleta_up=atleta_up)
+
+
+async def delete_novo(session: AsyncSession, id) -> None:
+    await AtletaService.delete(db_session=session, id=id)
+
+
+async def medir(engine, contador: ContadorIdas, ids: list, operacao) -> tuple:
+    idas_antes = contador.total
+    inicio = time.perf_counter()
+    for id in ids:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            await operacao(session, id)
+    duracao = time.perf_counter() - inicio
+    return (contador.total - idas_antes) / len(ids), duracao / len(ids) * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default='sqlite+aiosqlite:///bench.db')
+    parser.add_argument('--operacoes', type=int, default=500)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url)
+    await seed(engine, atletas=args.operacoes * 4)
+    async with AsyncSession(engine) as session:
+        await categorias_cache.load(session)
+        await centros_treinamento_cache.load(session)
+        ids = (await session.execute(select(AtletaModel.id).order_by(AtletaModel.pk_id))).scalars().all()
+
+    contador = ContadorIdas(engine)
+    atleta_up = AtletaUpdate(nome='Atualizado', idade=30)
+    n = args.operacoes
+    cenarios = [
+        ('patch antigo', ids[:n], lambda s, id: update_antigo(s, id, atleta_up)),
+        ('patch novo', ids[n:2 * n], lambda s, id: update_novo(s, id, atleta_up)),
+        ('delete antigo', ids[2 * n:3 * n], delete_antigo),
+        ('delete novo', ids[3 * n:4 * n], delete_novo),
+    ]
+
+    print(f'{"operacao":<16}{"idas/op":>10}{"ms/op":>10}')
+    for nome, lote, operacao in cenarios:
+        idas, ms = await medir(engine, contador, lote, operacao)
+        print(f'{nome:<16}{idas:>10.1f}{ms:>10.2f}')
+
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
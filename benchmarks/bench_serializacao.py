@@ -0,0 +1,100 @@
+"""
+Custo de serialização por 1.000 objetos: o caminho padrão do FastAPI (`response_model` valida de
+novo e o `JSONResponse` serializa com o json da stdlib) contra as respostas rápidas (FAST_RESPONSES).
+
+    python -m benchmarks.bench_serializacao --objetos 1000 --repeticoes 50
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List
+from uuid import uuid4
+
+import benchmarks  # noqa: F401
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from workout_api.atleta.schemas import AtletaCustom, AtletaOut, CategoriaIn, CentroTreinamentoIn
+from workout_api.contrib.responses import FastJSONResponse, _adapter, dumps, orjson, rows_to_dicts
+
+
+def gerar_atletas(quantidade: int) -> List[AtletaOut]:
+    base = datetime(2024, 1, 1)
+    return [
+        AtletaOut(
+            id=uuid4(), created_at=base + timedelta(seconds=i), nome=f'Atleta {i}', cpf=f'{i:011d}',
+            idade=20 + i % 30, peso=60.0 + i % 40, altura=1.6 + (i % 40) / 100, sexo='MF'[i % 2],
+            categoria=CategoriaIn(nome='Scale'), centro_treinamento=CentroTreinamentoIn(nome='CT King'),
+        )
+        for i in range(quantidade)
+    ]
+
+
+def gerar_linhas(quantidade: int) -> list:
+    # Mesmo formato das linhas da projeção da listagem: (nome, categoria, centro_treinamento)
+    return [(f'Atleta {i}', 'Scale', 'CT King') for i in range(quantidade)]
+
+
+async def padrao(objetos, modelo) -> bytes:
+    field = create_response_field(name='Response', type_=modelo)
+    content = await serialize_response(field=field, response_content=objetos)
+    return JSONResponse(content).body
+
+
+async def padrao_orjson(objetos, modelo) -> bytes:
+    field = create_response_field(name='Response', type_=modelo)
+    content = await serialize_response(field=field, response_content=objetos)
+    return FastJSONResponse(content).body
+
+
+async def confiavel(objetos, modelo) -> bytes:
+    return _adapter(modelo).dump_json(objetos)
+
+
+async def listagem_padrao(linhas, modelo) -> bytes:
+    itens = [AtletaCustom.model_construct(nome=n, categoria=c, centro_treinamento=ct) for n, c, ct in linhas]
+    return await padrao(itens, modelo)
+
+
+async def listagem_linhas(linhas, modelo) -> bytes:
+    return dumps(rows_to_dicts(linhas, tuple(AtletaCustom.model_fields)))
+
+
+async def medir(funcao, objetos, modelo, repeticoes: int) -> float:
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        await funcao(objetos, modelo)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--objetos', type=int, default=1_000)
+    parser.add_argument('--repeticoes', type=int, default=50)
+    args = parser.parse_args()
+
+    atletas = gerar_atletas(args.objetos)
+    linhas = gerar_linhas(args.objetos)
+    casos = [
+        ('AtletaOut', 'padrao (response_model + json)', padrao, atletas, List[AtletaOut]),
+        ('AtletaOut', 'padrao + orjson', padrao_orjson, atletas, List[AtletaOut]),
+        ('AtletaOut', 'confiavel (dump_json)', confiavel, atletas, List[AtletaOut]),
+        ('listagem', 'padrao (AtletaCustom + json)', listagem_padrao, linhas, List[AtletaCustom]),
+        ('listagem', 'linhas -> bytes', listagem_linhas, linhas, List[AtletaCustom]),
+    ]
+
+    print(f'orjson: {"sim" if orjson is not None else "não (json da stdlib)"}')
+    print(f'{"objeto":<11}{"caminho":<32}{"ms/1000":>10}')
+    referencia = {}
+    for objeto, nome, funcao, dados, modelo in casos:
+        ms = await medir(funcao, dados, modelo, args.repeticoes) * 1000 * 1000 / args.objetos
+        referencia.setdefault(objeto, ms)
+        print(f'{objeto:<11}{nome:<32}{ms:>10.2f}   {referencia[objeto] / ms:.1f}x')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""
+Ocupação do pool com e sem a liberação antecipada da sessão (DATABASE_EARLY_RELEASE),
+com clientes lentos para receber o corpo da resposta.
+
+    DATABASE_URL=sqlite+aiosqlite:///bench.db python -m benchmarks.bench_sessoes --requisicoes 200
+"""
+import argparse
+import asyncio
+import time
+
+import benchmarks  # noqa: F401
+import httpx
+from benchmarks.seed import seed
+
+from workout_api.configs.settings import settings
+from workout_api.contrib.database import engine, occupancy
+from workout_api.main import app
+
+
+def cliente_lento(app, atraso: float):
+    """Atrasa cada pedaço do corpo da resposta, como uma rede lenta até o cliente."""
+
+    async def wrapped(scope, receive, send):
+        async def send_lento(message):
+            if message['type'] == 'http.response.body':
+                await asyncio.sleep(atraso)
+            await send(message)
+
+        await app(scope, receive, send_lento)
+
+    return wrapped
+
+
+async def rodada(cliente: httpx.AsyncClient, requisicoes: int, concorrencia: int) -> None:
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    async def requisicao(i: int) -> None:
+        async with semaforo:
+            await cliente.get('/atletas/', params={'page': i % 20 + 1, 'size': 50})
+
+    await asyncio.gather(*(requisicao(i) for i in range(requisicoes)))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--atletas', type=int, default=10_000)
+    parser.add_argument('--requisicoes', type=int, default=200)
+    parser.add_argument('--concorrencia', type=int, default=10)
+    parser.add_argument('--atraso-ms', type=float, default=100)
+    args = parser.parse_args()
+
+    await seed(engine, atletas=args.atletas)
+
+    transport = httpx.ASGITransport(app=cliente_lento(app, args.atraso_ms / 1000))
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as cliente:
+        print(f'{"liberacao":<12}{"conexao ms (media)":>20}{"conexao ms (max)":>18}{"em uso (media)":>16}{"em uso (max)":>14}')
+        for antecipada in (False, True):
+            settings.DATABASE_EARLY_RELEASE = antecipada
+            occupancy.reset()
+            inicio = time.perf_counter()
+            await rodada(cliente, args.requisicoes, args.concorrencia)
+            duracao = time.perf_counter() - inicio
+            stats = occupancy.stats()
+            print(f'{"antecipada" if antecipada else "no fim":<12}'
+                  f'{stats["held_seconds_mean"] * 1000:>20.1f}'
+                  f'{stats["held_seconds_max"] * 1000:>18.1f}'
+                  f'{stats["held_seconds_total"] / duracao:>16.1f}'
+                  f'{stats["in_use_max"]:>14}')
+
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""
+Compara dois resultados em JSON e termina com código 1 se alguma medida piorou além do limite.
+Aceita os dois formatos dos benchmarks: o do `benchmarks.load` (RPS e p95 de cada rota) e o do
+pytest-benchmark (`--benchmark-json`, mediana de cada microbenchmark).
+
+    python -m benchmarks.compare base.json atual.json --limite 10
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Tuple
+
+# Medidas comparadas de cada formato e se um valor maior é pior (latência) ou melhor (RPS)
+MEDIDAS_LOAD = {'p95_ms': True, 'rps': False}
+MEDIDAS_MICRO = {'median': True}
+
+
+def medidas(resultado: dict) -> Dict[Tuple[str, str], Tuple[float, bool]]:
+    """
+    Normaliza os dois formatos em {(nome, medida): (valor, maior_e_pior)}.
+    """
+    if 'routes' in resultado:
+        return {
+            (rota, medida): (valores[medida], maior_e_pior)
+            for rota, valores in resultado['routes'].items()
+            for medida, maior_e_pior in MEDIDAS_LOAD.items()
+        }
+    if 'benchmarks' in resultado:
+        return {
+            (bench['name'], medida): (bench['stats'][medida], maior_e_pior)
+            for bench in resultado['benchmarks']
+            for medida, maior_e_pior in MEDIDAS_MICRO.items()
+        }
+    raise ValueError('Formato desconhecido: esperado o JSON do benchmarks.load ou do pytest-benchmark')
+
+
+def piora(base: float, atual: float, maior_e_pior: bool) -> float:
+    """Variação percentual no sentido de piora (positiva quando piorou)."""
+    if not base:
+        return 0.0
+    variacao = atual - base if maior_e_pior else base - atual
+    return variacao / base * 100
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('base')
+    parser.add_argument('atual')
+    parser.add_argument('--limite', type=float, default=10, help='piora máxima aceita, em %%')
+    args = parser.parse_args()
+
+    with open(args.base) as arquivo:
+        base = medidas(json.load(arquivo))
+    with open(args.atual) as arquivo:
+        atual = medidas(json.load(arquivo))
+
+    regressoes = 0
+    print(f'{"nome":<36}{"medida":>8}{"base":>14}{"atual":>14}{"piora %":>10}')
+    for chave in sorted(base.keys() | atual.keys()):
+        nome, medida = chave
+        if chave not in base or chave not in atual:
+            print(f'{nome:<36}{medida:>8}{"(só em " + ("atual" if chave in atual else "base") + ")":>38}')
+            continue
+
+        (valor_base, maior_e_pior), (valor_atual, _) = base[chave], atual[chave]
+        variacao = piora(valor_base, valor_atual, maior_e_pior)
+        regressao = variacao > args.limite
+        regressoes += regressao
+        print(f'{nome:<36}{medida:>8}{valor_base:>14.6g}{valor_atual:>14.6g}{variacao:>+10.1f}'
+              f'{"  REGRESSÃO" if regressao else ""}')
+
+    if regressoes:
+        print(f'\n{regressoes} medida(s) pioraram mais de {args.limite:g}%')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
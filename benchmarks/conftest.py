@@ -0,0 +1,64 @@
+"""
+Fixtures dos microbenchmarks: um banco populado pelo `seed` (uma vez por execução) e um event loop
+para rodar as corrotinas do service dentro do `benchmark`, que é síncrono.
+
+O banco vem de BENCH_DATABASE_URL (um postgres local, por exemplo) ou, sem ela, de um sqlite
+temporário. BENCH_ATLETAS define o tamanho da tabela de atletas.
+"""
+import asyncio
+import os
+
+import benchmarks  # noqa: F401
+import pytest
+from benchmarks.seed import seed
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.future import select
+
+from workout_api.atleta.models import AtletaModel
+from workout_api.categorias.cache import categorias_cache
+from workout_api.centro_treinamento.cache import centros_treinamento_cache
+
+
+@pytest.fixture(scope='session')
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope='session')
+def engine(loop, tmp_path_factory):
+    url = os.environ.get('BENCH_DATABASE_URL') or f'sqlite+aiosqlite:///{tmp_path_factory.mktemp("bench") / "micro.db"}'
+    engine = create_async_engine(url)
+    loop.run_until_complete(seed(engine, atletas=int(os.environ.get('BENCH_ATLETAS', 10_000))))
+    yield engine
+    loop.run_until_complete(engine.dispose())
+
+
+@pytest.fixture
+def session(loop, engine):
+    session = AsyncSession(engine, expire_on_commit=False)
+    loop.run_until_complete(categorias_cache.load(session))
+    loop.run_until_complete(centros_treinamento_cache.load(session))
+    yield session
+    loop.run_until_complete(session.close())
+
+
+@pytest.fixture(scope='session')
+def ids(loop, engine):
+    async def carregar():
+        async with AsyncSession(engine) as session:
+            return (await session.execute(select(AtletaModel.id).order_by(AtletaModel.pk_id))).scalars().all()
+
+    return loop.run_until_complete(carregar())
+
+
+@pytest.fixture
+def medir(benchmark, loop):
+    """
+    `medir(funcao, *args)` mede `await funcao(*args)` (uma corrotina nova a cada rodada).
+    """
+    def medir_async(funcao, *args, **kwargs):
+        return benchmark(lambda: loop.run_until_complete(funcao(*args, **kwargs)))
+
+    return medir_async
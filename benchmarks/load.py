@@ -0,0 +1,190 @@
+"""
+Carga HTTP em processo (httpx + ASGITransport, sem rede): uma mistura de rotas com pesos,
+`--concorrencia` clientes simultâneos durante `--duracao` segundos e, por rota, RPS e p50/p95/p99.
+O resultado é gravado em JSON para comparar duas execuções com `benchmarks.compare`.
+
+ATENÇÃO: o banco de DATABASE_URL é apagado e populado pelo `seed`; use um banco dedicado.
+
+    DATABASE_URL=sqlite+aiosqlite:///bench.db python -m benchmarks.load --atletas 10000 --duracao 30 --saida load.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from itertools import count
+from typing import Callable, Dict, List, Tuple
+
+import benchmarks  # noqa: F401
+import httpx
+from benchmarks.seed import gerar_cpf, nome_categoria, nome_centro, seed
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from workout_api.atleta.models import AtletaModel
+from workout_api.contrib.database import engine
+from workout_api.main import app
+
+EMAIL, SENHA = 'bench@workout.com', 'senha-bench'
+
+# CPFs dos atletas criados durante a carga, fora da faixa usada pelo `seed`
+_CPFS = count(800_000_000)
+
+
+class Cenario:
+    """Estado compartilhado pelos clientes: ids existentes e o header de autenticação."""
+
+    def __init__(self, ids: list, autorizacao: dict, categorias: int, centros: int) -> None:
+        self.ids = ids
+        self.autorizacao = autorizacao
+        self.categorias = categorias
+        self.centros = centros
+
+
+async def listar(cliente: httpx.AsyncClient, cenario: Cenario, rng: random.Random) -> httpx.Response:
+    return await cliente.get('/atletas/', params={'page': rng.randint(1, 20), 'size': 50})
+
+
+async def consultar(cliente: httpx.AsyncClient, cenario: Cenario, rng: random.Random) -> httpx.Response:
+    return await cliente.get(f'/atletas/{rng.choice(cenario.ids)}')
+
+
+async def categorias(cliente: httpx.AsyncClient, cenario: Cenario, rng: random.Random) -> httpx.Response:
+    return await cliente.get('/categorias/')
+
+
+async def criar(cliente: httpx.AsyncClient, cenario: Cenario, rng: random.Random) -> httpx.Response:
+    return await cliente.post('/atletas/', headers=cenario.autorizacao, json={
+        'nome': 'Carga', 'cpf': gerar_cpf(next(_CPFS)), 'idade': rng.randint(16, 60),
+        'peso': 80.0, 'altura': 1.8, 'sexo': rng.choice('MF'),
+        'categoria': {'nome': nome_categoria(rng.randint(1, cenario.categorias))},
+        'centro_treinamento': {'nome': nome_centro(rng.randint(1, cenario.centros))},
+    })
+
+
+async def editar(cliente: httpx.AsyncClient, cenario: Cenario, rng: random.Random) -> httpx.Response:
+    return await cliente.patch(
+        f'/atletas/{rng.choice(cenario.ids)}', headers=cenario.autorizacao, json={'idade': rng.randint(16, 60)}
+    )
+
+
+async def login(cliente: httpx.AsyncClient, cenario: Cenario, rng: random.Random) -> httpx.Response:
+    return await cliente.post('/auth/token', data={'username': EMAIL, 'password': SENHA})
+
+
+# Rota (como aparece no relatório), peso na mistura e a requisição
+ROTAS: List[Tuple[str, int, Callable]] = [
+    ('GET /atletas/', 30, listar),
+    ('GET /atletas/{id}', 30, consultar),
+    ('GET /categorias/', 10, categorias),
+    ('POST /atletas/', 12, criar),
+    ('PATCH /atletas/{id}', 15, editar),
+    ('POST /auth/token', 3, login),
+]
+
+
+def resumo(latencias: List[float], erros: int, duracao: float) -> dict:
+    # Percentis pelo método inclusivo, para não extrapolar além da maior latência medida
+    cortes = statistics.quantiles(latencias, n=100, method='inclusive') if len(latencias) > 1 else latencias * 99
+    return {
+        'requests': len(latencias),
+        'errors': erros,
+        'rps': round(len(latencias) / duracao, 2),
+        'mean_ms': round(statistics.fmean(latencias), 3),
+        'p50_ms': round(cortes[49], 3),
+        'p95_ms': round(cortes[94], 3),
+        'p99_ms': round(cortes[98], 3),
+    }
+
+
+async def carga(cliente: httpx.AsyncClient, cenario: Cenario, args) -> Dict[str, dict]:
+    amostras: Dict[str, List[float]] = {nome: [] for nome, _, _ in ROTAS}
+    erros: Dict[str, int] = {nome: 0 for nome, _, _ in ROTAS}
+    pesos = [peso for _, peso, _ in ROTAS]
+
+    inicio = time.perf_counter()
+    inicio_medicao = inicio + args.aquecimento
+    fim = inicio_medicao + args.duracao
+
+    async def usuario(numero: int) -> None:
+        # Um gerador por cliente: a sequência de requisições se repete entre execuções
+        rng = random.Random(args.semente + numero)
+        while (agora := time.perf_counter()) < fim:
+            nome, _, requisicao = rng.choices(ROTAS, weights=pesos)[0]
+            resposta = await requisicao(cliente, cenario, rng)
+            if agora >= inicio_medicao:
+                amostras[nome].append((time.perf_counter() - agora) * 1000)
+                erros[nome] += resposta.status_code >= 400
+
+    await asyncio.gather(*(usuario(i) for i in range(args.concorrencia)))
+
+    rotas = {nome: resumo(latencias, erros[nome], args.duracao) for nome, latencias in amostras.items() if latencias}
+    todas = [latencia for latencias in amostras.values() for latencia in latencias]
+    rotas['total'] = resumo(todas, sum(erros.values()), args.duracao)
+    return rotas
+
+
+def commit_atual() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--atletas', type=int, default=10_000)
+    parser.add_argument('--categorias', type=int, default=5)
+    parser.add_argument('--centros', type=int, default=10)
+    parser.add_argument('--concorrencia', type=int, default=10)
+    parser.add_argument('--duracao', type=float, default=20, help='segundos medidos')
+    parser.add_argument('--aquecimento', type=float, default=2, help='segundos iniciais descartados')
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--saida', help='arquivo JSON com o resultado')
+    args = parser.parse_args()
+
+    await seed(engine, atletas=args.atletas, categorias=args.categorias, centros=args.centros, semente=args.semente)
+    async with AsyncSession(engine) as session:
+        ids = [str(id) for id in (await session.execute(select(AtletaModel.id))).scalars()]
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench') as cliente:
+            await cliente.post('/auth/register', json={'email': EMAIL, 'password': SENHA})
+            token = (await cliente.post('/auth/token', data={'username': EMAIL, 'password': SENHA})).json()
+            autorizacao = {'Authorization': f'Bearer {token["access_token"]}'}
+
+            rotas = await carga(cliente, Cenario(ids, autorizacao, args.categorias, args.centros), args)
+
+    resultado = {
+        'meta': {
+            'date': datetime.utcnow().isoformat(timespec='seconds'),
+            'commit': commit_atual(),
+            'database': engine.dialect.name,
+            'python': platform.python_version(),
+            'atletas': args.atletas,
+            'concorrencia': args.concorrencia,
+            'duracao': args.duracao,
+            'semente': args.semente,
+        },
+        'routes': rotas,
+    }
+
+    print(f'{"rota":<24}{"req":>8}{"erros":>7}{"rps":>10}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}')
+    for nome, r in rotas.items():
+        print(f'{nome:<24}{r["requests"]:>8}{r["errors"]:>7}{r["rps"]:>10.1f}'
+              f'{r["p50_ms"]:>10.2f}{r["p95_ms"]:>10.2f}{r["p99_ms"]:>10.2f}')
+
+    if args.saida:
+        with open(args.saida, 'w') as arquivo:
+            json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+Mede a latência de uma rota não relacionada (GET /categorias/) enquanto há logins concorrentes.
+Com o bcrypt fora do event loop, o p99 da rota não deve subir junto com a carga de login.
+
+    python -m benchmarks.load_login --url sqlite+aiosqlite:///bench.db --logins 200
+    python -m benchmarks.load_login --bloqueante   # referência: bcrypt rodando no event loop
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import benchmarks  # noqa: F401
+import httpx
+from benchmarks.seed import seed
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from workout_api.auth import security
+from workout_api.main import app
+
+EMAIL, SENHA = 'bench@workout.com', 'senha-bench'
+
+
+class HasherBloqueante(security.PasswordHasher):
+    """Comportamento anterior: o bcrypt roda direto no event loop."""
+
+    async def run(self, func, *args):
+        return func(*args)
+
+
+def percentil(valores: list, p: float) -> float:
+    return statistics.quantiles(valores, n=100)[int(p) - 1] if len(valores) > 1 else valores[0]
+
+
+async def sondar(cliente: httpx.AsyncClient, parar: asyncio.Event, latencias: list) -> None:
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        await cliente.get('/categorias/')
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        await asyncio.sleep(0.005)
+
+
+async def cenario(cliente: httpx.AsyncClient, logins: int, concorrencia: int) -> list:
+    latencias: list = []
+    parar = asyncio.Event()
+    sonda = asyncio.create_task(sondar(cliente, parar, latencias))
+
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    async def login() -> None:
+        async with semaforo:
+            await cliente.post('/auth/token', data={'username': EMAIL, 'password': SENHA})
+
+    if logins:
+        await asyncio.gather(*(login() for _ in range(logins)))
+    else:
+        await asyncio.sleep(2)
+    parar.set()
+    await sonda
+    return latencias
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default='sqlite+aiosqlite:///bench.db')
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--concorrencia', type=int, default=16)
+    parser.add_argument('--bloqueante', action='store_true')
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url)
+    await seed(engine, atletas=0)
+    await engine.dispose()
+
+    if args.bloqueante:
+        security.password_hasher = HasherBloqueante(1, 10**6, 1)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as cliente:
+        await cliente.post('/auth/register', json={'email': EMAIL, 'password': SENHA})
+
+        print(f'{"cenario":<16}{"p50 (ms)":>10}{"p99 (ms)":>10}{"amostras":>10}')
+        for nome, logins in (('sem login', 0), ('com login', args.logins)):
+            latencias = await cenario(cliente, logins, args.concorrencia)
+            print(f'{nome:<16}{percentil(latencias, 50):>10.1f}{percentil(latencias, 99):>10.1f}{len(latencias):>10}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+"""
+Microbenchmarks da camada de schemas: validação da entrada e serialização das respostas
+(1.000 objetos por rodada), pelo caminho do `response_model` e pelo das respostas rápidas.
+
+    pytest benchmarks/micro_schemas.py
+"""
+from typing import List
+
+import pytest
+from benchmarks.bench_serializacao import gerar_atletas, gerar_linhas, listagem_padrao, padrao
+
+from workout_api.atleta.fields import CAMPOS_LISTAGEM
+from workout_api.atleta.schemas import AtletaCustom, AtletaIn, AtletaOut
+from workout_api.contrib.responses import _adapter, dumps, rows_to_dicts
+
+OBJETOS = 1_000
+
+PAYLOAD = {
+    'nome': 'Joao', 'cpf': '12345678900', 'idade': 25, 'peso': 75.5, 'altura': 1.8, 'sexo': 'M',
+    'categoria': {'nome': 'Scale'}, 'centro_treinamento': {'nome': 'CT King'},
+}
+
+
+@pytest.fixture(scope='module')
+def atletas():
+    return gerar_atletas(OBJETOS)
+
+
+@pytest.fixture(scope='module')
+def linhas():
+    return gerar_linhas(OBJETOS)
+
+
+def bench_atleta_in_validacao(benchmark):
+    benchmark(AtletaIn.model_validate, PAYLOAD)
+
+
+def bench_atleta_out_response_model(medir, atletas):
+    medir(padrao, atletas, List[AtletaOut])
+
+
+def bench_atleta_out_dump_json(benchmark, atletas):
+    benchmark(_adapter(List[AtletaOut]).dump_json, atletas)
+
+
+def bench_listagem_response_model(medir, linhas):
+    medir(listagem_padrao, linhas, List[AtletaCustom])
+
+
+def bench_listagem_linhas(benchmark, linhas):
+    benchmark(lambda: dumps(rows_to_dicts(linhas, CAMPOS_LISTAGEM)))
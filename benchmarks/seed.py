@@ -0,0 +1,116 @@
+"""
+Gerador determinístico do banco dos benchmarks: N categorias, centros de treinamento e atletas
+(com CPFs válidos e únicos). A mesma semente gera sempre os mesmos dados.
+ATENÇÃO: apaga e recria as tabelas; use um banco dedicado.
+
+    python -m benchmarks.seed --url sqlite+aiosqlite:///bench.db --atletas 100000 --categorias 5 --centros 10
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from workout_api.atleta.stats import VIEW_PERCENTIS, VIEW_PERCENTIS_DDL, reconstruir_resumo
+from workout_api.contrib.models import BaseModel
+from workout_api.contrib.repository.models import AtletaModel, CategoriaModel, CentroTreinamentoModel
+
+NOMES = ['Ana', 'Bruno', 'Carla', 'Diego', 'Eduarda', 'Felipe', 'Gabriela', 'Hugo', 'Isabela', 'João']
+SOBRENOMES = ['Silva', 'Souza', 'Oliveira', 'Santos', 'Lima', 'Pereira', 'Costa', 'Almeida', 'Rocha', 'Gomes']
+
+
+def gerar_cpf(numero: int) -> str:
+    """
+    Gera um CPF válido e único a partir de um número sequencial (os 9 primeiros dígitos).
+    """
+    digitos = [int(d) for d in f'{numero:09d}']
+    for peso_inicial in (10, 11):
+        soma = sum(d * peso for d, peso in zip(digitos, range(peso_inicial, 1, -1)))
+        resto = soma * 10 % 11
+        digitos.append(0 if resto == 10 else resto)
+    return ''.join(map(str, digitos))
+
+
+def nome_categoria(numero: int) -> str:
+    return f'Cat {numero}'
+
+
+def nome_centro(numero: int) -> str:
+    return f'CT {numero}'
+
+
+async def seed(
+    engine: AsyncEngine,
+    atletas: int,
+    categorias: int = 5,
+    centros: int = 10,
+    semente: int = 42,
+    lote: int = 5_000,
+) -> None:
+    """
+    Recria as tabelas e popula o banco de forma determinística: a mesma semente gera sempre os mesmos dados.
+    """
+    rng = random.Random(semente)
+    uuid = lambda: UUID(int=rng.getrandbits(128), version=4)  # noqa: E731
+
+    postgres = engine.dialect.name == 'postgresql'
+
+    async with engine.begin() as conn:
+        if postgres:
+            # A view dos percentis (criada pelas migrations) depende de `atletas`
+            await conn.execute(text(f'DROP MATERIALIZED VIEW IF EXISTS {VIEW_PERCENTIS}'))
+        await conn.run_sync(BaseModel.metadata.drop_all)
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+        await conn.execute(insert(CategoriaModel), [
+            {'pk_id': i, 'id': uuid(), 'nome': nome_categoria(i)} for i in range(1, categorias + 1)
+        ])
+        await conn.execute(insert(CentroTreinamentoModel), [
+            {'pk_id': i, 'id': uuid(), 'nome': nome_centro(i), 'endereco': f'Rua {i}', 'proprietario': 'Bench'}
+            for i in range(1, centros + 1)
+        ])
+
+        inicio = datetime(2023, 1, 1)
+        for offset in range(0, atletas, lote):
+            await conn.execute(insert(AtletaModel), [
+                {
+                    'id': uuid(),
+                    'nome': f'{rng.choice(NOMES)} {rng.choice(SOBRENOMES)}',
+                    'cpf': gerar_cpf(n),
+                    'idade': rng.randint(16, 60),
+                    'peso': round(rng.uniform(50, 120), 1),
+                    'altura': round(rng.uniform(1.5, 2.0), 2),
+                    'sexo': rng.choice('MF'),
+                    'created_at': inicio + timedelta(seconds=n),
+                    'categoria_id': rng.randint(1, categorias),
+                    'centro_treinamento_id': rng.randint(1, centros),
+                }
+                for n in range(offset, min(offset + lote, atletas))
+            ])
+
+        await reconstruir_resumo(conn)
+        if postgres:
+            for ddl in VIEW_PERCENTIS_DDL:
+                await conn.execute(text(ddl))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default='sqlite+aiosqlite:///bench.db')
+    parser.add_argument('--atletas', type=int, default=100_000)
+    parser.add_argument('--categorias', type=int, default=5)
+    parser.add_argument('--centros', type=int, default=10)
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url)
+    await seed(engine, atletas=args.atletas, categorias=args.categorias, centros=args.centros, semente=args.semente)
+    await engine.dispose()
+    print(f'{args.atletas} atletas, {args.categorias} categorias e {args.centros} centros em {args.url}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,10 @@
+import os
+import tempfile
+
+# Os módulos da API leem as configurações ao serem importados: o banco dos testes precisa
+# estar definido antes. TEST_DATABASE_URL aponta para um postgres local; sem ela, um sqlite temporário.
+os.environ['DATABASE_URL'] = (
+    os.environ.get('TEST_DATABASE_URL') or f'sqlite+aiosqlite:///{tempfile.mkdtemp()}/testes.db'
+)
+os.environ.setdefault('API_SECRET_KEY', 'testes')
+os.environ.setdefault('API_ALGORITHM', 'HS256')
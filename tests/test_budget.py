@@ -0,0 +1,89 @@
+import logging
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert
+
+from tests.conftest import atleta
+from workout_api.auth.dependencies import principal_cache
+from workout_api.auth.models import UserModel
+from workout_api.auth.security import create_access_token
+from workout_api.categorias.models import CategoriaModel
+from workout_api.centro_treinamento.models import CentroTreinamentoModel
+from workout_api.configs.settings import settings
+from workout_api.contrib import instrumentation
+from workout_api.contrib.database import async_session_maker
+from workout_api.contrib.reference import bump_table_version
+from workout_api.main import app
+
+EMAIL = 'orcamento@example.com'
+
+
+@pytest.fixture
+def pior_caso(cliente, rodar, monkeypatch):
+    """
+    Cada requisição no pior caso: usuário fora do cache do principal e os dois caches de
+    referência conferindo a versão e recarregando.
+    """
+    monkeypatch.setattr(settings, 'SQL_QUERY_BUDGET_MODE', 'error')
+    monkeypatch.setattr(settings, 'REFERENCE_CACHE_POLL_SECONDS', 0)
+    app.dependency_overrides.clear()
+
+    async def criar_usuario():
+        async with async_session_maker() as session:
+            await session.execute(insert(UserModel).values(id=uuid4(), email=EMAIL, hashed_password='x'))
+            await session.commit()
+
+    rodar(criar_usuario())
+    autorizacao = {'Authorization': f'Bearer {create_access_token({"sub": EMAIL})}'}
+
+    async def requisitar(metodo, url, headers=None, **kwargs):
+        principal_cache.clear()
+        async with async_session_maker() as session:
+            await bump_table_version(session, CategoriaModel.__tablename__)
+            await bump_table_version(session, CentroTreinamentoModel.__tablename__)
+            await session.commit()
+        return await cliente.request(metodo, url, headers={**autorizacao, **(headers or {})}, **kwargs)
+
+    return lambda metodo, url, **kwargs: rodar(requisitar(metodo, url, **kwargs))
+
+
+def test_rotas_de_atletas_cabem_no_orcamento(pior_caso, caplog):
+    caplog.set_level(logging.WARNING, logger=instrumentation.__name__)
+
+    resposta = pior_caso('POST', '/atletas/', json=atleta(1))
+    assert resposta.status_code == 201
+    id = resposta.json()['id']
+    assert pior_caso('POST', '/atletas/', json=atleta(1)).status_code == 303
+    assert pior_caso('POST', '/atletas/bulk', json=[atleta(2), atleta(3)]).status_code == 200
+
+    for url, params in (
+        ('/atletas/', {}),
+        ('/atletas/', {'total': 'estimated'}),
+        ('/atletas/', {'total': 'cached'}),
+        ('/atletas/cursor', {}),
+        ('/atletas/search', {'q': 'Atleta'}),
+        ('/atletas/stats', {'group_by': 'categoria,sexo'}),
+        ('/atletas/export', {}),
+        (f'/atletas/{id}', {}),
+    ):
+        assert pior_caso('GET', url, params=params).status_code == 200, url
+    assert pior_caso('POST', '/atletas/batch-get', json={'ids': [id]}).status_code == 200
+
+    assert pior_caso('PATCH', f'/atletas/{id}', json={'idade': 30}).status_code == 200
+    assert pior_caso('PATCH', f'/atletas/{id}', json={'nome': 'Outro'}, headers={'If-Match': '*'}).status_code == 200
+    assert pior_caso('DELETE', f'/atletas/{id}').status_code == 204
+
+    assert [registro.getMessage() for registro in caplog.records] == []
+
+
+def test_modo_error_so_troca_a_resposta_das_leituras(cliente, rodar, monkeypatch, caplog):
+    monkeypatch.setattr(settings, 'SQL_QUERY_BUDGET_MODE', 'error')
+    monkeypatch.setattr(instrumentation.QueryStats, 'violations', lambda self: ['excedido'])
+
+    assert rodar(cliente.get('/atletas/')).status_code == 500
+
+    # A escrita já foi confirmada: responde normalmente e registra o aviso
+    with caplog.at_level(logging.WARNING, logger=instrumentation.__name__):
+        assert rodar(cliente.post('/atletas/', json=atleta(1))).status_code == 201
+    assert 'excedido' in caplog.text
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+from sqlalchemy import func
+from sqlalchemy.future import select
+
+from tests.conftest import atleta
+from workout_api.atleta.models import AtletaModel
+from workout_api.configs.settings import settings
+from workout_api.contrib.database import async_session_maker
+from workout_api.contrib.streaming import NDJSON_MEDIA_TYPE
+
+
+@pytest.fixture(autouse=True)
+def lotes_pequenos(monkeypatch):
+    # Vários commits por importação, para que o erro chegue depois de lotes já gravados
+    monkeypatch.setattr(settings, 'ATLETA_BULK_CHUNK_SIZE', 5)
+
+
+def importar(cliente, rodar, corpo: str, content_type: str = 'application/json'):
+    async def pedacos():
+        # Pedaços pequenos: registros e separadores cortados entre dois pedaços
+        for inicio in range(0, len(corpo), 37):
+            yield corpo[inicio:inicio + 37].encode()
+
+    return rodar(cliente.post('/atletas/bulk', content=pedacos(), headers={'content-type': content_type}))
+
+
+def contar_atletas(rodar) -> int:
+    async def contar():
+        async with async_session_maker() as session:
+            return (await session.execute(select(func.count()).select_from(AtletaModel))).scalar_one()
+
+    return rodar(contar())
+
+
+def test_ndjson_linha_quebrada_reportada_sem_perder_lotes(cliente, rodar):
+    linhas = [json.dumps(atleta(i)) for i in range(1, 8)] + ['{quebrado', json.dumps(atleta(8))]
+
+    response = importar(cliente, rodar, '\n'.join(linhas), NDJSON_MEDIA_TYPE)
+
+    assert response.status_code == 200
+    resultado = response.json()
+    assert resultado['total'] == 9
+    assert resultado['criados'] == 8
+    assert [(erro['linha'], erro['motivo']) for erro in resultado['erros']] == [(8, 'invalido')]
+    assert contar_atletas(rodar) == 8
+
+
+def test_array_quebrado_depois_de_lotes_gravados(cliente, rodar):
+    corpo = '[' + ', '.join(json.dumps(atleta(i)) for i in range(1, 8)) + ', {quebrado]'
+
+    response = importar(cliente, rodar, corpo)
+
+    assert response.status_code == 200
+    resultado = response.json()
+    assert resultado['criados'] == 7
+    assert [(erro['linha'], erro['motivo']) for erro in resultado['erros']] == [(8, 'corpo_invalido')]
+    assert contar_atletas(rodar) == 7
+
+
+def test_array_sem_virgula_entre_registros(cliente, rodar):
+    corpo = f'[{json.dumps(atleta(1))} {json.dumps(atleta(2))}]'
+
+    response = importar(cliente, rodar, corpo)
+
+    assert response.status_code == 200
+    resultado = response.json()
+    assert resultado['criados'] == 1
+    assert [(erro['linha'], erro['motivo']) for erro in resultado['erros']] == [(2, 'corpo_invalido')]
+    assert contar_atletas(rodar) == 1
+
+
+@pytest.mark.parametrize('corpo', ['[1 2]', '[1,]', '[,1]', '[1] [2]', '{"nome": "x"}', '[1'])
+def test_array_malformado_sem_registros_validos(cliente, rodar, corpo):
+    response = importar(cliente, rodar, corpo)
+
+    if response.status_code == 200:
+        # O registro antes do erro é lido (e rejeitado pela validação); a importação para no erro
+        assert response.json()['erros'][-1]['motivo'] == 'corpo_invalido'
+    else:
+        assert response.status_code == 400
+    assert contar_atletas(rodar) == 0
+
+
+def test_array_valido(cliente, rodar):
+    corpo = ' [ ' + ' ,\n'.join(json.dumps(atleta(i)) for i in range(1, 12)) + ' ] \n'
+
+    response = importar(cliente, rodar, corpo)
+
+    assert response.status_code == 200
+    assert response.json() == {'total': 11, 'criados': 11, 'erros': []}
+    assert contar_atletas(rodar) == 11
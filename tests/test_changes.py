@@ -0,0 +1,98 @@
+import json
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert
+
+from workout_api.atleta.changes import AtletaChangeFeed, stream
+from workout_api.atleta.models import AtletaChangeModel
+from workout_api.contrib.database import async_session_maker, engine
+
+
+@pytest.fixture
+def feed(banco, monkeypatch):
+    # Um feed só dos testes, sem o loop em segundo plano: cada rodada é um `ler()`
+    feed = AtletaChangeFeed(intervalo=60, espera_lacuna=60, tamanho_fila=100)
+    monkeypatch.setattr('workout_api.atleta.changes.atleta_changes', feed)
+    return feed
+
+
+async def gravar(pk_id: int) -> None:
+    # Como o commit de uma transação que pegou esse id da sequência
+    async with engine.begin() as conn:
+        await conn.execute(insert(AtletaChangeModel.__table__).values(
+            pk_id=pk_id, atleta_id=uuid4(), operacao='delete', dados=None, created_at=datetime.utcnow()
+        ))
+
+
+async def ler(feed: AtletaChangeFeed) -> None:
+    async with engine.begin() as conn:
+        await feed._ler(conn)
+
+
+async def ids(eventos, quantidade: int) -> list:
+    recebidos = []
+    while len(recebidos) < quantidade:
+        evento = await eventos.__anext__()
+        if evento.startswith(b'id:'):
+            recebidos.append(json.loads(evento.split(b'data: ', 1)[1])['id'])
+    return recebidos
+
+
+def test_id_confirmado_fora_de_ordem_chega_ao_stream(feed, rodar):
+    rodar(ler(feed))
+    eventos = stream(async_session_maker, None)
+    rodar(eventos.__anext__())  # retry
+
+    rodar(gravar(2))
+    rodar(ler(feed))
+    rodar(gravar(1))
+    rodar(ler(feed))
+
+    assert rodar(ids(eventos, 2)) == [2, 1]
+    rodar(eventos.aclose())
+
+
+def test_lacuna_acompanhada_sem_assinantes(feed, rodar):
+    rodar(ler(feed))
+    rodar(gravar(2))
+    # Nenhum stream aberto: o feed ainda guarda o id 1 como pulado
+    rodar(ler(feed))
+
+    eventos = stream(async_session_maker, 0)
+    rodar(eventos.__anext__())
+    assert rodar(ids(eventos, 1)) == [2]
+
+    rodar(gravar(1))
+    rodar(ler(feed))
+    assert rodar(ids(eventos, 1)) == [1]
+    rodar(eventos.aclose())
+
+
+def test_id_pulado_na_recuperacao_e_publicado_depois(feed, rodar):
+    rodar(gravar(3))
+    rodar(ler(feed))
+    feed._lacunas.clear()  # O feed já desistiu dos ids 1 e 2
+
+    eventos = stream(async_session_maker, 0)
+    rodar(eventos.__anext__())
+    assert rodar(ids(eventos, 1)) == [3]
+
+    rodar(gravar(1))
+    rodar(ler(feed))
+    assert rodar(ids(eventos, 1)) == [1]
+    rodar(eventos.aclose())
+
+
+def test_reconexao_reenvia_eventos_recentes_anteriores_ao_cursor(feed, rodar):
+    rodar(ler(feed))
+    rodar(gravar(2))
+    # O cliente recebeu o 2 e caiu; o 1 é confirmado depois
+    rodar(gravar(1))
+    rodar(gravar(3))
+
+    eventos = stream(async_session_maker, 2)
+    rodar(eventos.__anext__())
+    assert rodar(ids(eventos, 3)) == [1, 2, 3]
+    rodar(eventos.aclose())
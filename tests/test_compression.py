@@ -0,0 +1,17 @@
+import pytest
+
+from workout_api.atleta.changes import SSE_MEDIA_TYPE
+from workout_api.contrib.compression import is_compressible
+
+
+@pytest.mark.parametrize('content_type, esperado', [
+    ('application/json', True),
+    ('application/x-ndjson', True),
+    ('text/csv; charset=utf-8', True),
+    (SSE_MEDIA_TYPE, False),
+    (f'{SSE_MEDIA_TYPE}; charset=utf-8', False),
+    ('image/png', False),
+    (None, False),
+])
+def test_tipos_comprimidos(content_type, esperado):
+    assert is_compressible(content_type) is esperado
@@ -0,0 +1,15 @@
+import json
+
+from tests.conftest import atleta
+
+
+def test_exportacao_ndjson(cliente, rodar):
+    assert rodar(cliente.post('/atletas/bulk', json=[atleta(i) for i in range(1, 4)])).status_code == 200
+
+    response = rodar(cliente.get('/atletas/export'))
+
+    assert response.status_code == 200
+    linhas = [json.loads(linha) for linha in response.text.splitlines()]
+    assert sorted(linha['cpf'] for linha in linhas) == [f'{i:011d}' for i in range(1, 4)]
+    assert {linha['categoria'] for linha in linhas} == {'Scale'}
+
@@ -0,0 +1,200 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.future import select
+
+from workout_api.configs.settings import settings
+from workout_api.contrib.database import async_session_maker
+from workout_api.contrib.schemas import BaseSchema
+from workout_api.jobs.models import JobModel
+from workout_api.jobs.pool import JobWorkerPool
+from workout_api.jobs.registry import JOB_TYPES, JobType
+from workout_api.jobs.schemas import JobIn
+from workout_api.jobs.service import JobService
+
+
+class SemPayload(BaseSchema):
+    pass
+
+
+async def nada(ctx, payload):
+    return {'ok': True}
+
+
+@pytest.fixture
+def tipos(banco, monkeypatch):
+    """
+    Troca os tipos registrados pelos dos testes: `tipos(nome, handler, concorrencia, max_tentativas)`.
+    """
+    for nome in list(JOB_TYPES):
+        monkeypatch.delitem(JOB_TYPES, nome)
+
+    def registrar(nome, handler=nada, concorrencia=None, max_tentativas=3) -> JobType:
+        monkeypatch.setitem(JOB_TYPES, nome, JobType(nome, handler, SemPayload, concorrencia, max_tentativas))
+        return JOB_TYPES[nome]
+
+    return registrar
+
+
+async def enfileirar(tipo: str) -> int:
+    async with async_session_maker() as session:
+        job = await JobService.submit(session, JobIn(tipo=tipo), user_id=None)
+        return (await session.execute(select(JobModel.pk_id).filter_by(id=job.id))).scalar_one()
+
+
+async def reservar(job_type: JobType, worker: str):
+    async with async_session_maker() as session:
+        return await JobService.claim(session, job_type, worker)
+
+
+async def ler(pk_id: int) -> JobModel:
+    async with async_session_maker() as session:
+        return await session.get(JobModel, pk_id)
+
+
+async def alterar(pk_id: int, **valores) -> None:
+    async with async_session_maker() as session:
+        await session.execute(update(JobModel).where(JobModel.pk_id == pk_id).values(**valores))
+        await session.commit()
+
+
+def test_reserva_entrega_cada_job_a_um_worker(tipos, rodar):
+    job_type = tipos('testes.simples')
+    primeiro = rodar(enfileirar('testes.simples'))
+    segundo = rodar(enfileirar('testes.simples'))
+
+    reservas = [rodar(reservar(job_type, f'w{numero}')) for numero in range(3)]
+
+    assert [reserva.pk_id for reserva in reservas[:2]] == [primeiro, segundo]
+    assert reservas[2] is None
+    job = rodar(ler(primeiro))
+    assert (job.status, job.worker, job.tentativas) == ('executando', 'w0', 1)
+
+
+def test_falha_volta_para_a_fila_com_espera_dobrada(tipos, rodar, monkeypatch):
+    monkeypatch.setattr(settings, 'JOBS_RETRY_BACKOFF_SECONDS', 10)
+    job_type = tipos('testes.falha', max_tentativas=3)
+    pk_id = rodar(enfileirar('testes.falha'))
+
+    esperas = []
+    for _ in range(2):
+        reserva = rodar(reservar(job_type, 'w'))
+        inicio = datetime.utcnow()
+        async def falhar():
+            async with async_session_maker() as session:
+                return await JobService.fail(session, reserva, 'w', 'RuntimeError: erro')
+
+        assert rodar(falhar()) == 'pendente'
+        job = rodar(ler(pk_id))
+        esperas.append((job.executar_em - inicio).total_seconds())
+        # Antes do backoff, o job não é reservado de novo
+        assert rodar(reservar(job_type, 'w')) is None
+        rodar(alterar(pk_id, executar_em=datetime.utcnow()))
+
+    assert esperas[0] == pytest.approx(10, abs=1)
+    assert esperas[1] == pytest.approx(20, abs=1)
+
+    reserva = rodar(reservar(job_type, 'w'))
+    assert reserva.tentativas == 3
+
+    async def falhar_de_vez():
+        async with async_session_maker() as session:
+            return await JobService.fail(session, reserva, 'w', 'RuntimeError: erro')
+
+    assert rodar(falhar_de_vez()) == 'falhou'
+    assert rodar(reservar(job_type, 'w')) is None
+
+
+def test_reserva_vencida_passa_para_outro_worker(tipos, rodar, monkeypatch):
+    monkeypatch.setattr(settings, 'JOBS_LEASE_SECONDS', 0.2)
+    job_type = tipos('testes.lento')
+    pk_id = rodar(enfileirar('testes.lento'))
+
+    assert rodar(reservar(job_type, 'w1')).pk_id == pk_id
+    assert rodar(reservar(job_type, 'w2')) is None
+
+    rodar(asyncio.sleep(0.3))
+    reserva = rodar(reservar(job_type, 'w2'))
+    assert (reserva.pk_id, reserva.tentativas) == (pk_id, 2)
+
+    # O worker antigo não altera mais o job
+    async def antigo():
+        async with async_session_maker() as session:
+            renovada = await JobService.heartbeat(session, pk_id, 'w1')
+            await JobService.finish(session, pk_id, 'w1', {'ok': True})
+            return renovada
+
+    assert rodar(antigo()) is False
+    job = rodar(ler(pk_id))
+    assert (job.status, job.worker) == ('executando', 'w2')
+
+
+def test_limite_de_concorrencia(tipos, rodar):
+    job_type = tipos('testes.limitado', concorrencia=1)
+    primeiro = rodar(enfileirar('testes.limitado'))
+    segundo = rodar(enfileirar('testes.limitado'))
+
+    assert rodar(reservar(job_type, 'w1')).pk_id == primeiro
+    assert rodar(reservar(job_type, 'w2')) is None
+
+    async def concluir():
+        async with async_session_maker() as session:
+            await JobService.finish(session, primeiro, 'w1', None)
+
+    rodar(concluir())
+    assert rodar(reservar(job_type, 'w2')).pk_id == segundo
+
+
+def test_pool_executa_e_conclui(tipos, rodar):
+    tipos('testes.simples')
+    pk_id = rodar(enfileirar('testes.simples'))
+
+    async def cenario():
+        pool = JobWorkerPool(workers=1, intervalo=0.05)
+        await pool.start()
+        try:
+            for _ in range(100):
+                job = await ler(pk_id)
+                if job.status == 'concluido':
+                    return job
+                await asyncio.sleep(0.05)
+        finally:
+            await pool.stop()
+
+    job = rodar(cenario())
+    assert (job.status, job.resultado, job.worker) == ('concluido', {'ok': True}, None)
+
+
+def test_pool_cancela_a_execucao_quando_perde_a_reserva(tipos, rodar, monkeypatch):
+    # Heartbeat a cada 0,1s
+    monkeypatch.setattr(settings, 'JOBS_LEASE_SECONDS', 0.3)
+    iniciado, cancelado = asyncio.Event(), asyncio.Event()
+
+    async def lento(ctx, payload):
+        iniciado.set()
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelado.set()
+            raise
+
+    tipos('testes.lento', handler=lento)
+    pk_id = rodar(enfileirar('testes.lento'))
+
+    async def cenario():
+        pool = JobWorkerPool(workers=1, intervalo=0.05)
+        await pool.start()
+        try:
+            await asyncio.wait_for(iniciado.wait(), 5)
+            # Outro worker assume o job, como depois de a reserva vencer
+            await alterar(pk_id, worker='outro')
+            await asyncio.wait_for(cancelado.wait(), 5)
+        finally:
+            await pool.stop()
+
+    rodar(cenario())
+    job = rodar(ler(pk_id))
+    # O job continua com o novo dono: o worker cancelado não o devolve nem o conclui
+    assert (job.status, job.worker) == ('executando', 'outro')
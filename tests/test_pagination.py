@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+from sqlalchemy.future import select
+
+from tests.conftest import atleta
+from workout_api.atleta.models import AtletaModel
+from workout_api.contrib import pagination
+from workout_api.contrib.cache import TTLCache
+from workout_api.contrib.database import async_session_maker
+from workout_api.contrib.pagination import count_total
+
+QUERY = select(AtletaModel.pk_id)
+
+
+def test_total_contado_durante_uma_escrita_nao_fica_em_cache(rodar, monkeypatch):
+    cache = TTLCache(maxsize=10, ttl=60)
+
+    async def contar(db_session, query):
+        # A escrita confirma (e limpa o cache) enquanto o COUNT ainda roda
+        cache.clear()
+        return 10
+
+    monkeypatch.setattr(pagination, '_contar', contar)
+    primario = SimpleNamespace()
+    assert rodar(count_total(primario, QUERY, 'cached', cache, 'chave')) == 10
+    assert cache.get('chave') is None
+
+    async def contar_de_novo(db_session, query):
+        return 11
+
+    monkeypatch.setattr(pagination, '_contar', contar_de_novo)
+    assert rodar(count_total(primario, QUERY, 'cached', cache, 'chave')) == 11
+    assert cache.get('chave') == 11
+
+
+def test_total_da_replica_logo_depois_de_uma_escrita_nao_fica_em_cache(rodar, monkeypatch):
+    agora = [0.0]
+    cache = TTLCache(maxsize=10, ttl=60, clock=lambda: agora[0])
+
+    async def contar(db_session, query):
+        return 10
+
+    monkeypatch.setattr(pagination, '_contar', contar)
+    monkeypatch.setattr(pagination.settings, 'DATABASE_REPLICA_MAX_LAG_SECONDS', 5)
+    replica = SimpleNamespace(replica=object())
+
+    cache.clear()
+    assert rodar(count_total(replica, QUERY, 'cached', cache, 'chave')) == 10
+    assert cache.get('chave') is None
+
+    agora[0] = 6.0
+    assert rodar(count_total(replica, QUERY, 'cached', cache, 'chave')) == 10
+    assert cache.get('chave') == 10
+
+
+def test_estimativa_com_dois_pontos_no_filtro(cliente, rodar, postgres, monkeypatch):
+    monkeypatch.setattr(pagination.settings, 'PAGINATION_ESTIMATE_EXACT_BELOW', 0)
+    rodar(cliente.post('/atletas/', json=atleta(1, nome='a :x')))
+
+    resposta = rodar(cliente.get('/atletas/', params={'nome': 'a :x', 'total': 'estimated'}))
+    assert resposta.status_code == 200
+    assert resposta.json()['items'][0]['nome'] == 'a :x'
+
+    async def estimar():
+        async with async_session_maker() as session:
+            return await pagination._estimar(session, QUERY.where(AtletaModel.nome == "it's :x"))
+
+    assert rodar(estimar()) >= 0
@@ -0,0 +1,41 @@
+import asyncio
+
+from workout_api.categorias.cache import categorias_cache
+from workout_api.contrib.database import async_session_maker
+from workout_api.contrib.reference import bump_table_version, get_table_version
+
+
+def test_versao_criada_na_primeira_escrita_e_incrementada(banco, rodar):
+    async def incrementar():
+        async with async_session_maker() as session:
+            await bump_table_version(session, 'tabela_nova')
+            await session.commit()
+
+    async def ler():
+        async with async_session_maker() as session:
+            return await get_table_version(session, 'tabela_nova')
+
+    assert rodar(ler()) == 0
+    rodar(incrementar())
+    assert rodar(ler()) == 1
+
+    async def concorrentes():
+        await asyncio.gather(incrementar(), incrementar())
+
+    rodar(concorrentes())
+    assert rodar(ler()) == 3
+
+
+def test_cache_nao_volta_para_versao_mais_antiga(banco, rodar):
+    async def conferir():
+        async with async_session_maker() as session:
+            await categorias_cache.ensure_fresh(session, force=True)
+
+    # Como depois de uma carga pelo primário, com uma versão que a réplica ainda não tem
+    atual = categorias_cache.version
+    categorias_cache.version = atual + 1
+    categorias_cache.pk_by_nome = {'Nova': 99}
+
+    rodar(conferir())
+    assert categorias_cache.version == atual + 1
+    assert categorias_cache.pk_by_nome == {'Nova': 99}
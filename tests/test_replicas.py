@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+
+from workout_api.contrib.database import engine
+from workout_api.contrib.replicas import Replica, replica_router
+
+
+@pytest.fixture
+def replica_fora_do_ar(banco, monkeypatch, rodar):
+    # Réplica que aponta para o próprio banco dos testes, mas recusa todas as conexões
+    replica = Replica(engine.url.render_as_string(hide_password=False))
+
+    def recusar(*_):
+        raise ConnectionRefusedError('réplica fora do ar')
+
+    event.listen(replica.engine.sync_engine, 'do_connect', recusar)
+    monkeypatch.setattr(replica_router, 'replicas', [replica])
+    yield replica
+    rodar(replica.engine.dispose())
+
+
+def test_leitura_repetida_no_primario_quando_a_replica_cai(cliente, rodar, replica_fora_do_ar):
+    assert replica_fora_do_ar.healthy
+
+    response = rodar(cliente.get('/atletas/', params={'total': 'exact'}))
+
+    assert response.status_code == 200
+    assert response.json()['total'] == 0
+    assert not replica_fora_do_ar.healthy
+    # Sem réplica saudável, as próximas leituras já vão direto para o primário
+    assert replica_router.choose() is None
+
+
+def test_monitoramento_continua_depois_de_uma_falha(rodar, monkeypatch):
+    chamadas = []
+
+    async def verificar():
+        chamadas.append(1)
+        if len(chamadas) == 1:
+            raise RuntimeError('falha inesperada')
+        raise asyncio.CancelledError  # Encerra o loop na segunda rodada
+
+    monkeypatch.setattr(replica_router, 'check_all', verificar)
+    monkeypatch.setattr('workout_api.contrib.replicas.settings.DATABASE_REPLICA_CHECK_SECONDS', 0)
+
+    with pytest.raises(asyncio.CancelledError):
+        rodar(replica_router._monitor_loop())
+    assert len(chamadas) == 2
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.future import select
+
+from tests.conftest import atleta
+from workout_api.atleta.stats import VIEW_PERCENTIS_DDL, percentis_refresher
+from workout_api.configs.settings import settings
+from workout_api.contrib.database import async_session_maker
+from workout_api.contrib.models import TableVersionModel
+
+
+def test_escritas_nao_gravam_versao_compartilhada(cliente, rodar):
+    id = rodar(cliente.post('/atletas/', json=atleta(1))).json()['id']
+    rodar(cliente.patch(f'/atletas/{id}', json={'idade': 30}))
+    rodar(cliente.delete(f'/atletas/{id}'))
+
+    async def versoes():
+        async with async_session_maker() as session:
+            return (await session.execute(select(TableVersionModel.tabela))).scalars().all()
+
+    # Nenhuma linha de `table_versions` serializa as escritas dos atletas
+    assert rodar(versoes()) == []
+
+
+def test_erro_de_integridade_fora_do_cpf_nao_vira_303(cliente, rodar, monkeypatch):
+    async def falhar(*args, **kwargs):
+        raise IntegrityError('INSERT INTO atletas_changes', {}, Exception('violação'))
+
+    monkeypatch.setattr('workout_api.atleta.service.registrar', falhar)
+    with pytest.raises(IntegrityError):
+        rodar(cliente.post('/atletas/', json=atleta(1)))
+
+
+def test_refresh_dos_percentis_segue_o_log(cliente, rodar, postgres, monkeypatch):
+    monkeypatch.setattr(settings, 'ATLETA_CHANGES_GAP_SECONDS', 0)
+
+    async def criar_view():
+        async with postgres.begin() as conn:
+            for ddl in VIEW_PERCENTIS_DDL:
+                await conn.execute(text(ddl))
+
+    rodar(criar_view())
+    assert not rodar(percentis_refresher.refresh(postgres))
+
+    rodar(cliente.post('/atletas/', json=atleta(1)))
+    assert rodar(percentis_refresher.refresh(postgres))
+    assert not rodar(percentis_refresher.refresh(postgres))
+
+    stats = rodar(cliente.get('/atletas/stats')).json()
+    assert stats['grupos'][0]['peso']['p50'] == 75.0
+    assert stats['percentis_atualizados_em'] is not None
@@ -0,0 +1,324 @@
+import asyncio
+import contextlib
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.future import select
+
+from workout_api.atleta.models import AtletaChangeModel
+from workout_api.atleta.schemas import AtletaIn
+from workout_api.configs.settings import settings
+from workout_api.contrib.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+# Canal do LISTEN/NOTIFY (ver o trigger em `atleta/models.py`)
+CANAL = 'atletas_changes'
+SSE_MEDIA_TYPE = 'text/event-stream'
+
+# Eventos lidos por consulta, tanto na recuperação (`since`) quanto no feed
+_LOTE = 500
+
+_COLUNAS = (
+    AtletaChangeModel.pk_id,
+    AtletaChangeModel.atleta_id,
+    AtletaChangeModel.operacao,
+    AtletaChangeModel.dados,
+    AtletaChangeModel.created_at,
+)
+
+# Espera sugerida ao cliente antes de reconectar (campo `retry` do SSE), em milissegundos
+_RETRY_MS = 3000
+
+# Intervalo entre as limpezas dos eventos mais antigos que ATLETA_CHANGES_RETENTION_DAYS
+_LIMPEZA_SECONDS = 3600
+
+
+def dados_atleta(atleta_in: AtletaIn, id: UUID, created_at: datetime) -> dict:
+    """
+    Atleta no formato do `AtletaOut`, para os eventos de criação.
+    """
+    return {'id': str(id), 'created_at': created_at.isoformat(), **atleta_in.model_dump(mode='json')}
+
+
+async def registrar(db_session: AsyncSession, operacao: str, eventos: Iterable[Tuple[UUID, Optional[dict]]]) -> None:
+    """
+    Acrescenta ao log um evento por (id do atleta, dados). Deve rodar na mesma transação da
+    escrita, antes do commit: o evento existe se e somente se a escrita foi confirmada.
+    """
+    agora = datetime.utcnow()
+    linhas = [
+        {'atleta_id': atleta_id, 'operacao': operacao, 'dados': dados, 'created_at': agora}
+        for atleta_id, dados in eventos
+    ]
+    if linhas:
+        await db_session.execute(insert(AtletaChangeModel.__table__), linhas)
+
+
+def _evento(row) -> bytes:
+    # Um evento SSE: o `id` é o cursor que o cliente reenvia em `since` ou `Last-Event-ID`
+    corpo = dumps({
+        'id': row.pk_id,
+        'atleta_id': row.atleta_id,
+        'operacao': row.operacao,
+        'dados': row.dados,
+        'created_at': row.created_at,
+    })
+    return f'id: {row.pk_id}\nevent: {row.operacao}\ndata: '.encode() + corpo + b'\n\n'
+
+
+async def verificar_cursor(db_session: AsyncSession, since: int) -> None:
+    """
+    410 quando os eventos seguintes ao cursor já foram removidos pela retenção: o cliente precisa
+    recarregar os atletas (GET /atletas) em vez de recuperar as alterações.
+    """
+    menor = (await db_session.execute(select(func.min(AtletaChangeModel.pk_id)))).scalar()
+    if menor is not None and since < menor - 1:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=f'As alterações seguintes ao cursor {since} não estão mais disponíveis; recarregue os atletas'
+        )
+
+
+class AtletaChangeFeed:
+    """
+    Distribui os eventos novos do log para todos os streams abertos neste worker: uma única
+    leitura do log por rodada, qualquer que seja o número de assinantes.
+
+    No postgres, uma conexão por worker fica em LISTEN no canal e acorda o feed a cada commit
+    com eventos; ATLETA_CHANGES_POLL_SECONDS é só a rede de segurança (e o polling nos demais bancos).
+
+    Os ids saem de uma sequência, mas as transações podem confirmar fora de ordem: um id pulado
+    é procurado de novo por até ATLETA_CHANGES_GAP_SECONDS (transação ainda aberta) antes de ser
+    dado como perdido (rollback). Por isso a entrega é "pelo menos uma vez", nem sempre em ordem.
+    O log é lido mesmo sem assinantes, para que os ids pulados continuem sendo acompanhados.
+    """
+
+    def __init__(self, intervalo: float, espera_lacuna: float, tamanho_fila: int) -> None:
+        self.intervalo = intervalo
+        self.espera_lacuna = espera_lacuna
+        self.tamanho_fila = tamanho_fila
+        self._assinantes: Set[asyncio.Queue] = set()
+        self._acordar = asyncio.Event()
+        # Maior id já publicado e ids pulados ainda esperados (com o momento em que foram notados)
+        self._topo: Optional[int] = None
+        self._lacunas: Dict[int, float] = {}
+        self._limpeza = -float(_LIMPEZA_SECONDS)
+        self._notify = False
+        self._tasks: List[asyncio.Task] = []
+
+    def acordar(self) -> None:
+        self._acordar.set()
+
+    def escrita(self) -> None:
+        """
+        Chamado depois do commit de uma escrita. Sem NOTIFY, acorda o feed deste worker na hora;
+        os outros só percebem a escrita no próximo polling.
+        """
+        if not self._notify:
+            self.acordar()
+
+    def assinar(self) -> asyncio.Queue:
+        fila: asyncio.Queue = asyncio.Queue(self.tamanho_fila)
+        self._assinantes.add(fila)
+        return fila
+
+    def cancelar(self, fila: asyncio.Queue) -> None:
+        self._assinantes.discard(fila)
+
+    def _publicar(self, evento: Tuple[int, bytes]) -> None:
+        for fila in list(self._assinantes):
+            try:
+                fila.put_nowait(evento)
+            except asyncio.QueueFull:
+                # Assinante lento: em vez de acumular sem limite, encerra o stream dele
+                # (o cliente reconecta com Last-Event-ID e recupera o que faltou)
+                self._assinantes.discard(fila)
+                while not fila.empty():
+                    fila.get_nowait()
+                fila.put_nowait(None)
+
+    def esperar(self, ids: Iterable[int]) -> None:
+        """
+        Ids pulados na recuperação de um stream (`since`): se forem confirmados nos próximos
+        ATLETA_CHANGES_GAP_SECONDS, o feed os publica. Os maiores que o topo o feed encontra sozinho.
+        """
+        agora = time.monotonic()
+        for pk_id in ids:
+            if self._topo is None or pk_id <= self._topo:
+                self._lacunas[pk_id] = agora
+
+    async def _ler(self, conn: AsyncConnection) -> None:
+        # Lê o log mesmo sem assinantes: os ids pulados continuam sendo acompanhados, e um stream
+        # aberto depois ainda recebe os que forem confirmados fora de ordem
+        agora = time.monotonic()
+        if self._topo is None:
+            # Na partida, os ids que faltam entre os mais recentes podem ser de transações abertas
+            self._topo = (await conn.execute(select(func.coalesce(func.max(AtletaChangeModel.pk_id), 0)))).scalar()
+            recentes = (await conn.execute(
+                select(AtletaChangeModel.pk_id).where(AtletaChangeModel.pk_id > self._topo - _LOTE)
+            )).scalars().all()
+            self.esperar(set(range(max(self._topo - _LOTE, 0) + 1, self._topo)) - set(recentes))
+            return
+
+        if self._lacunas:
+            rows = (await conn.execute(
+                select(*_COLUNAS).where(AtletaChangeModel.pk_id.in_(list(self._lacunas))).order_by(AtletaChangeModel.pk_id)
+            )).all()
+            for row in rows:
+                del self._lacunas[row.pk_id]
+                self._publicar((row.pk_id, _evento(row)))
+            for pk_id, desde in list(self._lacunas.items()):
+                if agora - desde > self.espera_lacuna:
+                    del self._lacunas[pk_id]
+
+        while True:
+            rows = (await conn.execute(
+                select(*_COLUNAS).where(AtletaChangeModel.pk_id > self._topo).order_by(AtletaChangeModel.pk_id).limit(_LOTE)
+            )).all()
+            for row in rows:
+                for pulado in range(self._topo + 1, row.pk_id):
+                    self._lacunas[pulado] = agora
+                self._topo = row.pk_id
+                self._publicar((row.pk_id, _evento(row)))
+            if len(rows) < _LOTE:
+                return
+
+    async def _limpar(self, conn: AsyncConnection) -> None:
+        if time.monotonic() - self._limpeza < _LIMPEZA_SECONDS:
+            return
+        self._limpeza = time.monotonic()
+        limite = datetime.utcnow() - timedelta(days=settings.ATLETA_CHANGES_RETENTION_DAYS)
+        await conn.execute(delete(AtletaChangeModel).where(AtletaChangeModel.created_at < limite))
+
+    async def _loop(self, engine: AsyncEngine) -> None:
+        while True:
+            try:
+                async with engine.begin() as conn:
+                    await self._ler(conn)
+                    await self._limpar(conn)
+            except Exception:  # Uma leitura com problema não derruba o feed; tenta de novo na próxima rodada
+                logger.exception('Falha ao ler o log de alterações dos atletas')
+
+            # Com ids pulados, volta a procurá-los mesmo sem aviso
+            espera = min(self.intervalo, self.espera_lacuna) if self._lacunas else self.intervalo
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._acordar.wait(), espera)
+            self._acordar.clear()
+
+    async def _escutar(self, engine: AsyncEngine) -> None:
+        """
+        Mantém uma conexão do pool em LISTEN enquanto o worker vive e reconecta se ela cair.
+        """
+        def avisado(*_) -> None:
+            self.acordar()
+
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    raw = (await conn.get_raw_connection()).driver_connection
+                    perdida = asyncio.Event()
+                    raw.add_termination_listener(lambda _: perdida.set())
+                    try:
+                        await raw.add_listener(CANAL, avisado)
+                        # Avisos perdidos enquanto estava desconectado
+                        self.acordar()
+                        await perdida.wait()
+                    finally:
+                        # Não devolve ao pool uma conexão em LISTEN
+                        await conn.invalidate()
+            except Exception:
+                logger.exception('Conexão de LISTEN do canal %s perdida', CANAL)
+            await asyncio.sleep(self.intervalo)
+
+    async def start(self, engine: AsyncEngine) -> None:
+        self._tasks = [asyncio.create_task(self._loop(engine))]
+        # Com o PgBouncer em modo transaction, o LISTEN não sobrevive: fica só o polling
+        self._notify = engine.dialect.name == 'postgresql' and not settings.DATABASE_PGBOUNCER
+        if self._notify:
+            self._tasks.append(asyncio.create_task(self._escutar(engine)))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+        for fila in list(self._assinantes):
+            self.cancelar(fila)
+            with contextlib.suppress(asyncio.QueueFull):
+                fila.put_nowait(None)
+
+
+async def stream(session_maker, since: Optional[int]) -> AsyncIterator[bytes]:
+    """
+    Stream SSE das alterações: com `since`, primeiro os eventos seguintes ao cursor (lidos do log
+    em lotes), depois os novos, à medida que o feed os publica. A assinatura vem antes da
+    recuperação, para que nenhum evento confirmado no meio dela se perca; os repetidos são descartados.
+
+    Como os ids podem ser confirmados fora de ordem, a recuperação também reenvia os eventos
+    recentes (últimos ATLETA_CHANGES_GAP_SECONDS) anteriores ao cursor, que o cliente pode não ter
+    recebido, e entrega ao feed os ids que pulou, para publicá-los se ainda forem confirmados.
+    """
+    fila = atleta_changes.assinar()
+    try:
+        yield f'retry: {_RETRY_MS}\n\n'.encode()
+
+        enviados: Set[int] = set()
+        if since is not None:
+            limite = datetime.utcnow() - timedelta(seconds=atleta_changes.espera_lacuna)
+            async with session_maker() as session:
+                rows = (await session.execute(
+                    select(*_COLUNAS).where(
+                        AtletaChangeModel.pk_id > since - _LOTE,
+                        AtletaChangeModel.pk_id <= since,
+                        AtletaChangeModel.created_at >= limite,
+                    ).order_by(AtletaChangeModel.pk_id)
+                )).all()
+            for row in rows:
+                enviados.add(row.pk_id)
+                yield _evento(row)
+
+        cursor = since
+        while cursor is not None:
+            async with session_maker() as session:
+                rows = (await session.execute(
+                    select(*_COLUNAS).where(AtletaChangeModel.pk_id > cursor).order_by(AtletaChangeModel.pk_id).limit(_LOTE)
+                )).all()
+            pulados: List[int] = []
+            anterior = cursor
+            for row in rows:
+                pulados.extend(range(anterior + 1, row.pk_id))
+                anterior = row.pk_id
+            atleta_changes.esperar(pulados)
+            for row in rows:
+                enviados.add(row.pk_id)
+                yield _evento(row)
+            cursor = rows[-1].pk_id if len(rows) == _LOTE else None
+
+        while True:
+            try:
+                evento = await asyncio.wait_for(fila.get(), settings.ATLETA_CHANGES_PING_SECONDS)
+            except asyncio.TimeoutError:
+                yield b': ping\n\n'
+                continue
+
+            if evento is None:
+                return
+            pk_id, corpo = evento
+            if pk_id not in enviados:
+                yield corpo
+    finally:
+        atleta_changes.cancelar(fila)
+
+
+atleta_changes = AtletaChangeFeed(
+    settings.ATLETA_CHANGES_POLL_SECONDS, settings.ATLETA_CHANGES_GAP_SECONDS, settings.ATLETA_CHANGES_QUEUE_SIZE
+)
@@ -1,61 +1,284 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
-from fastapi_pagination import Page, paginate
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from fastapi_pagination import Page, Params
 from pydantic import UUID4
 
+from workout_api.atleta.changes import SSE_MEDIA_TYPE, stream, verificar_cursor
+from workout_api.atleta.fields import CAMPOS, CAMPOS_EXPORT, CAMPOS_LISTAGEM, parse_fields
 from workout_api.atleta.models import AtletaModel
-from workout_api.atleta.schemas import (AtletaCustom, AtletaIn, AtletaOut,
-                                       AtletaUpdate)
+from workout_api.atleta.schemas import (AtletaBatchIn, AtletaBatchOut, AtletaBulkOut, AtletaBusca,
+                                       AtletaCustom, AtletaIn, AtletaOut, AtletaStatsOut, AtletaUpdate)
 from workout_api.atleta.service import AtletaService
-from workout_api.contrib.dependencies import DatabaseDependency
+from workout_api.atleta.stats import GRUPOS, parse_group_by
+from workout_api.auth.dependencies import get_current_user
+from workout_api.auth.schemas import Principal
+from workout_api.configs.settings import settings
+from workout_api.contrib.conditional import cache_headers, is_not_modified, not_modified, version_etag
+from workout_api.contrib.database import async_session_maker
+from workout_api.contrib.dependencies import DatabaseDependency, ReadOnlyDatabaseDependency
+from workout_api.contrib.instrumentation import query_budget
+from workout_api.contrib.pagination import TOTAL_DESCRIPTION, CursorPage, OptionalTotalPage, TotalStrategy
+from workout_api.contrib.replicas import read_session_maker
+from workout_api.contrib.responses import dumps, page_response, rows_to_dicts, trusted_response
+from workout_api.contrib.streaming import NDJSON_MEDIA_TYPE, gzip_stream, iter_json_records
 
-router = APIRouter(prefix='/atletas', tags=['atleta'])
+router = APIRouter(tags=['atleta'])
+
+_FIELDS_DESCRIPTION = (
+    'Campos da resposta, separados por vírgula (ex.: `id,nome`). '
+    f'Disponíveis: {", ".join(CAMPOS)}. Sem o parâmetro, todos os campos do endpoint.'
+)
 
 
 @router.post(
     '/',
     summary='Criar um novo atleta',
     status_code=status.HTTP_201_CREATED,
-    response_model=AtletaOut
+    response_model=AtletaOut,
+    # INSERT, resumo e log de alterações, além das consultas comuns do router (ver `routers.py`)
+    dependencies=[query_budget(8)],
 )
 async def post(
     db_session: DatabaseDependency,
     atleta_in: AtletaIn = Body(...),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Cria um novo atleta na base de dados.
     Apenas usuários autenticados podem criar atletas.
     """
     try:
-        return await AtletaService.create(db_session=db_session, atleta_in=atleta_in)
+        atleta_out = await AtletaService.create(db_session=db_session, atleta_in=atleta_in)
     except Exception as e:
         raise e
 
+    return trusted_response(atleta_out, AtletaOut, status_code=status.HTTP_201_CREATED)
+
+
+@router.post(
+    '/bulk',
+    summary='Importar atletas em lote',
+    status_code=status.HTTP_200_OK,
+    response_model=AtletaBulkOut,
+    # Um INSERT por lote: o número de consultas cresce com o corpo
+    dependencies=[query_budget(None)],
+    openapi_extra={
+        'requestBody': {
+            'required': True,
+            'content': {
+                'application/json': {'schema': {'type': 'array', 'items': AtletaIn.model_json_schema()}},
+                NDJSON_MEDIA_TYPE: {'schema': AtletaIn.model_json_schema()},
+            },
+        },
+    },
+)
+async def bulk(
+    request: Request,
+    db_session: DatabaseDependency,
+    current_user: Principal = Depends(get_current_user)
+) -> AtletaBulkOut:
+    """
+    Recebe um array JSON ou NDJSON (`Content-Type: application/x-ndjson`) de atletas.
+    O corpo é lido aos poucos e inserido em lotes; linhas inválidas ou com CPF já
+    cadastrado são listadas em `erros` sem interromper a importação. Um array JSON malformado
+    no meio do corpo encerra a importação ali: os registros anteriores ficam importados.
+    """
+    registros = iter_json_records(request, max_item_size=settings.ATLETA_BULK_MAX_ITEM_BYTES)
+    return await AtletaService.bulk_create(db_session=db_session, registros=registros)
+
+
+@router.post(
+    '/batch-get',
+    summary='Consultar vários atletas pelos ids',
+    status_code=status.HTTP_200_OK,
+    response_model=AtletaBatchOut,
+)
+async def batch_get(
+    db_session: ReadOnlyDatabaseDependency,
+    batch_in: AtletaBatchIn = Body(...),
+    fields: Optional[str] = Query(None, description=_FIELDS_DESCRIPTION),
+) -> AtletaBatchOut:
+    """
+    Resolve até ATLETA_BATCH_MAX_IDS atletas em uma única consulta. Os atletas voltam na ordem
+    dos ids enviados; os ids sem atleta correspondente vêm em `missing`.
+    """
+    campos = parse_fields(fields)
+    if campos:
+        atletas = await AtletaService.get_many_campos(db_session=db_session, ids=batch_in.ids, campos=campos)
+        return Response(content=dumps(atletas), media_type='application/json')
+
+    atletas = await AtletaService.get_many(db_session=db_session, ids=batch_in.ids)
+    return trusted_response(atletas, AtletaBatchOut)
+
 
 @router.get(
     '/',
     summary='Consultar todos os atletas',
     status_code=status.HTTP_200_OK,
-    response_model=Page[AtletaCustom],
+    response_model=OptionalTotalPage[AtletaCustom],
 )
 async def query(
-    db_session: DatabaseDependency,
+    db_session: ReadOnlyDatabaseDependency,
+    params: Params = Depends(),
+    nome: Optional[str] = Query(None, description="Filtrar por nome do atleta"),
+    cpf: Optional[str] = Query(None, description="Filtrar por CPF do atleta"),
+    fields: Optional[str] = Query(None, description=_FIELDS_DESCRIPTION),
+    total: Optional[TotalStrategy] = Query(None, description=TOTAL_DESCRIPTION),
+) -> OptionalTotalPage[AtletaCustom]:
+    campos = parse_fields(fields)
+    if campos or settings.FAST_RESPONSES:
+        # Linhas direto para bytes, sem instanciar o `AtletaCustom` nem o `Page`
+        campos = campos or CAMPOS_LISTAGEM
+        rows, contagem = await AtletaService.query_rows(
+            db_session=db_session, params=params, nome=nome, cpf=cpf, campos=campos, total=total
+        )
+        return page_response(rows_to_dicts(rows, campos), contagem, params)
+
+    return await AtletaService.query(db_session=db_session, params=params, nome=nome, cpf=cpf, total=total)
+
+
+@router.get(
+    '/cursor',
+    summary='Consultar todos os atletas paginando por cursor',
+    status_code=status.HTTP_200_OK,
+    response_model=CursorPage[AtletaCustom],
+)
+async def query_cursor(
+    db_session: ReadOnlyDatabaseDependency,
+    cursor: Optional[str] = Query(None, description="Cursor retornado em `next_cursor` pela página anterior"),
+    size: int = Query(50, ge=1, le=100, description="Tamanho da página"),
     nome: Optional[str] = Query(None, description="Filtrar por nome do atleta"),
     cpf: Optional[str] = Query(None, description="Filtrar por CPF do atleta")
-) -> Page[AtletaCustom]:
-    atletas: List[AtletaOut] = await AtletaService.query(db_session=db_session, nome=nome, cpf=cpf)
-    atletas_custom = [
-        AtletaCustom(
-            nome=atleta.nome,
-            centro_treinamento=atleta.centro_treinamento.nome,
-            categoria=atleta.categoria.nome
-        ) for atleta in atletas
-    ]
-    return paginate(atletas_custom)
+) -> CursorPage[AtletaCustom]:
+    """
+    Lista os atletas com paginação keyset: o custo de cada página independe da sua profundidade.
+    """
+    if settings.FAST_RESPONSES:
+        rows, next_cursor = await AtletaService.query_cursor_rows(
+            db_session=db_session, size=size, cursor=cursor, nome=nome, cpf=cpf
+        )
+        return Response(
+            content=dumps({'items': rows_to_dicts(rows, CAMPOS_LISTAGEM), 'size': size, 'next_cursor': next_cursor}),
+            media_type='application/json',
+        )
+
+    return await AtletaService.query_cursor(
+        db_session=db_session, size=size, cursor=cursor, nome=nome, cpf=cpf
+    )
+
+
+@router.get(
+    '/export',
+    summary='Exportar todos os atletas (NDJSON ou CSV)',
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+async def export(
+    request: Request,
+    formato: Literal['ndjson', 'csv'] = Query('ndjson', alias='format', description="Formato do arquivo"),
+    gzip: bool = Query(False, description="Comprimir a resposta com gzip"),
+    nome: Optional[str] = Query(None, description="Filtrar por nome do atleta"),
+    cpf: Optional[str] = Query(None, description="Filtrar por CPF do atleta"),
+    fields: Optional[str] = Query(None, description=_FIELDS_DESCRIPTION),
+    current_user: Principal = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Exporta os atletas com os nomes da categoria e do centro de treinamento, em stream.
+    """
+    media_type = NDJSON_MEDIA_TYPE if formato == 'ndjson' else 'text/csv'
+    headers = {'Content-Disposition': f'attachment; filename="atletas.{formato}"'}
+
+    content = AtletaService.export(
+        session_maker=read_session_maker(request), formato=formato, nome=nome, cpf=cpf,
+        campos=parse_fields(fields) or CAMPOS_EXPORT
+    )
+    if gzip:
+        content = gzip_stream(content, level=settings.EXPORT_GZIP_LEVEL)
+        headers['Content-Encoding'] = 'gzip'
+
+    return StreamingResponse(content, media_type=media_type, headers=headers)
+
+
+@router.get(
+    '/search',
+    summary='Buscar atletas pelo nome (prefixo e similaridade)',
+    status_code=status.HTTP_200_OK,
+    response_model=Page[AtletaBusca],
+)
+async def search(
+    db_session: ReadOnlyDatabaseDependency,
+    q: str = Query(..., min_length=2, max_length=50, description="Trecho do nome do atleta"),
+    categoria: Optional[str] = Query(None, description="Restringir a uma categoria"),
+    centro_treinamento: Optional[str] = Query(None, description="Restringir a um centro de treinamento"),
+    params: Params = Depends(),
+) -> Page[AtletaBusca]:
+    """
+    Busca tolerante a erros de digitação: os resultados que começam com o termo vêm primeiro,
+    seguidos dos mais parecidos.
+    """
+    return await AtletaService.buscar(
+        db_session=db_session, params=params, q=q,
+        categoria=categoria, centro_treinamento=centro_treinamento
+    )
+
+
+@router.get(
+    '/stats',
+    summary='Estatísticas dos atletas por categoria, centro de treinamento e sexo',
+    status_code=status.HTTP_200_OK,
+    response_model=AtletaStatsOut,
+)
+async def stats(
+    db_session: ReadOnlyDatabaseDependency,
+    group_by: Optional[str] = Query(
+        None, description=f'Agrupar por, separados por vírgula: {", ".join(GRUPOS)}. Sem o parâmetro, um único grupo.'
+    ),
+) -> AtletaStatsOut:
+    """
+    Quantidade, média, desvio padrão e percentis de peso, altura e idade, distribuição por faixa
+    de IMC e por sexo. Contagens e médias refletem todas as escritas; os percentis, a última
+    atualização da view (ver `percentis_atualizados_em`).
+    """
+    return await AtletaService.stats(db_session=db_session, grupos=parse_group_by(group_by))
+
+
+@router.get(
+    '/changes',
+    summary='Acompanhar as alterações dos atletas (Server-Sent Events)',
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {'content': {SSE_MEDIA_TYPE: {}}},
+        status.HTTP_410_GONE: {'description': 'Os eventos seguintes ao cursor já foram removidos'},
+    },
+)
+async def changes(
+    db_session: DatabaseDependency,
+    since: Optional[int] = Query(None, ge=0, description="Cursor (id do último evento recebido) a partir do qual recuperar"),
+    last_event_id: Optional[int] = Header(None, ge=0),
+) -> StreamingResponse:
+    """
+    Stream de eventos `create`, `update` e `delete` dos atletas. O `id` de cada evento é o cursor:
+    reenviado em `since` (ou no `Last-Event-ID` da reconexão automática), o stream começa pelos
+    eventos perdidos. Sem cursor, só os eventos a partir da conexão. A entrega é "pelo menos uma
+    vez" e nem sempre em ordem (os ids podem ser confirmados fora de ordem; por isso a reconexão
+    também reenvia os eventos recentes anteriores ao cursor): o cliente deve ignorar ids repetidos.
+    """
+    if since is None:
+        since = last_event_id
+    if since is not None:
+        await verificar_cursor(db_session, since)
+
+    # Do primário: os ids do feed vêm do primário, uma réplica atrasada pularia eventos
+    return StreamingResponse(
+        stream(async_session_maker, since),
+        media_type=SSE_MEDIA_TYPE,
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
 
 
 @router.get(
@@ -63,9 +286,37 @@ async def query(
     summary='Consultar um atleta pelo id',
     status_code=status.HTTP_200_OK,
     response_model=AtletaOut,
+    responses={status.HTTP_304_NOT_MODIFIED: {'description': 'A versão em cache do cliente continua válida'}},
 )
-async def get(id: UUID4, db_session: DatabaseDependency) -> AtletaOut:
-    return await AtletaService.get(db_session=db_session, id=id)
+async def get(
+    id: UUID4,
+    response: Response,
+    db_session: ReadOnlyDatabaseDependency,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    fields: Optional[str] = Query(None, description=_FIELDS_DESCRIPTION),
+) -> AtletaOut:
+    """
+    Responde com `ETag` e `Last-Modified`. Se a versão enviada em `If-None-Match` ainda for
+    a atual, devolve 304 sem corpo.
+    """
+    campos = parse_fields(fields)
+    if campos:
+        atleta, updated_at = await AtletaService.get_campos(db_session=db_session, id=id, campos=campos)
+        etag = version_etag(updated_at)
+        if is_not_modified(if_none_match, if_modified_since, etag, updated_at):
+            return not_modified(etag, updated_at)
+        return Response(content=dumps(atleta), media_type='application/json', headers=cache_headers(etag, updated_at))
+
+    row = await AtletaService.get_row(db_session=db_session, id=id)
+    etag = version_etag(row.updated_at)
+
+    if is_not_modified(if_none_match, if_modified_since, etag, row.updated_at):
+        return not_modified(etag, row.updated_at)
+
+    response.headers.update(cache_headers(etag, row.updated_at))
+    atleta_out = await AtletaService.atleta_out(db_session, row)
+    return trusted_response(atleta_out, AtletaOut, response)
 
 
 @router.patch(
@@ -73,9 +324,28 @@ async def get(id: UUID4, db_session: DatabaseDependency) -> AtletaOut:
     summary='Editar um atleta pelo id',
     status_code=status.HTTP_200_OK,
     response_model=AtletaOut,
+    # SELECT FOR UPDATE, UPDATE, resumo e log de alterações, além das consultas comuns do router
+    dependencies=[query_budget(9)],
+    responses={status.HTTP_412_PRECONDITION_FAILED: {
+        'description': 'O atleta mudou desde a versão em If-Match (ou não existe, com If-Match: *)'
+    }},
 )
-async def patch(id: UUID4, db_session: DatabaseDependency, atleta_up: AtletaUpdate = Body(...)) -> AtletaOut:
-    return await AtletaService.update(db_session=db_session, id=id, atleta_up=atleta_up)
+async def patch(
+    id: UUID4,
+    response: Response,
+    db_session: DatabaseDependency,
+    atleta_up: AtletaUpdate = Body(...),
+    if_match: Optional[str] = Header(None),
+) -> AtletaOut:
+    """
+    Com `If-Match: <ETag>`, só altera o atleta se ele não mudou desde aquela versão (412 caso contrário).
+    Com `If-Match: *`, só altera se o atleta existe (412 caso contrário).
+    """
+    row = await AtletaService.update_row(db_session=db_session, id=id, atleta_up=atleta_up, if_match=if_match)
+
+    response.headers.update(cache_headers(version_etag(row.updated_at), row.updated_at))
+    atleta_out = await AtletaService.atleta_out(db_session, row)
+    return trusted_response(atleta_out, AtletaOut, response)
 
 
 @router.delete(
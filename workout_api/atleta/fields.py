@@ -0,0 +1,80 @@
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.future import select
+
+from workout_api.atleta.models import AtletaModel
+from workout_api.atleta.schemas import AtletaCustom
+from workout_api.categorias.models import CategoriaModel
+from workout_api.centro_treinamento.models import CentroTreinamentoModel
+
+# Campos que podem ser pedidos em `fields=` e a coluna de cada um.
+# Só `categoria` e `centro_treinamento` exigem JOIN.
+CAMPOS = {
+    'id': AtletaModel.id,
+    'created_at': AtletaModel.created_at,
+    'nome': AtletaModel.nome,
+    'cpf': AtletaModel.cpf,
+    'idade': AtletaModel.idade,
+    'peso': AtletaModel.peso,
+    'altura': AtletaModel.altura,
+    'sexo': AtletaModel.sexo,
+    'categoria': CategoriaModel.nome,
+    'centro_treinamento': CentroTreinamentoModel.nome,
+}
+
+# Campos padrão de cada resposta, quando `fields` não é informado
+CAMPOS_LISTAGEM = tuple(AtletaCustom.model_fields)
+CAMPOS_EXPORT = (
+    'id', 'nome', 'cpf', 'idade', 'peso', 'altura', 'sexo', 'created_at', 'categoria', 'centro_treinamento'
+)
+
+# Campos que no `AtletaOut` saem como objeto (`{"nome": ...}`) e nas listagens como texto
+_ANINHADOS = ('categoria', 'centro_treinamento')
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Lê o parâmetro `fields` (nomes separados por vírgula). Sem o parâmetro, devolve None
+    e o endpoint responde com todos os campos.
+    """
+    if fields is None:
+        return None
+
+    campos = tuple(dict.fromkeys(campo.strip() for campo in fields.split(',') if campo.strip()))
+    invalidos = [campo for campo in campos if campo not in CAMPOS]
+    if not campos or invalidos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Campos inválidos em fields: {", ".join(invalidos) or "(vazio)"}. '
+                   f'Disponíveis: {", ".join(CAMPOS)}'
+        )
+    return campos
+
+
+def select_campos(campos: Sequence[str], *extras):
+    """
+    SELECT apenas com as colunas pedidas (rotuladas com o nome do campo), seguidas de `extras`.
+    Os JOINs com categorias e centros só entram quando algum dos seus nomes é pedido.
+    """
+    query = select(*(CAMPOS[campo].label(campo) for campo in campos), *extras).select_from(AtletaModel)
+
+    if 'categoria' in campos:
+        query = query.join(CategoriaModel, AtletaModel.categoria_id == CategoriaModel.pk_id)
+    if 'centro_treinamento' in campos:
+        query = query.join(CentroTreinamentoModel, AtletaModel.centro_treinamento_id == CentroTreinamentoModel.pk_id)
+
+    return query
+
+
+def row_to_dict(row, campos: Sequence[str], aninhar: bool = False) -> dict:
+    """
+    Monta o dict da resposta a partir das primeiras colunas da linha, sem passar por um schema.
+    Com `aninhar`, categoria e centro saem no formato do `AtletaOut`.
+    """
+    valores = dict(zip(campos, row))
+    if aninhar:
+        for campo in _ANINHADOS:
+            if campo in valores:
+                valores[campo] = {'nome': valores[campo]}
+    return valores
@@ -1,21 +1,90 @@
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Float
+from typing import Any, Optional
+from uuid import UUID
+from sqlalchemy import DDL, JSON, DateTime, ForeignKey, Index, Integer, String, Float, Uuid, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from workout_api.contrib.models import BaseModel
+from workout_api.contrib.models import Base, BaseModel
 
 
 class AtletaModel(BaseModel):
     __tablename__ = 'atletas'
+    __table_args__ = (
+        # Chave da paginação por cursor (keyset) em GET /atletas/cursor
+        Index('ix_atletas_created_at_pk_id', 'created_at', 'pk_id'),
+    )
 
     pk_id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    nome: Mapped[str] = mapped_column(String(50), nullable=False)
+    nome: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
     cpf: Mapped[str] = mapped_column(String(11), unique=True, nullable=False)
     idade: Mapped[int] = mapped_column(Integer, nullable=False)
     peso: Mapped[float] = mapped_column(Float, nullable=False)
     altura: Mapped[float] = mapped_column(Float, nullable=False)
     sexo: Mapped[str] = mapped_column(String(1), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    categoria: Mapped['CategoriaModel'] = relationship(back_populates="atleta", lazy='selectin')
-    categoria_id: Mapped[int] = mapped_column(ForeignKey("categorias.pk_id"))
-    centro_treinamento: Mapped['CentroTreinamentoModel'] = relationship(back_populates="atleta", lazy='selectin')
-    centro_treinamento_id: Mapped[int] = mapped_column(ForeignKey("centros_treinamento.pk_id"))
\ No newline at end of file
+    # Versão da linha: base da ETag de GET /atletas/{id} e do If-Match do PATCH
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # `raise`: os serviços usam projeções com JOIN; um carregamento implícito vira erro em vez de SELECTs extras
+    categoria: Mapped['CategoriaModel'] = relationship(back_populates="atleta", lazy='raise')
+    categoria_id: Mapped[int] = mapped_column(ForeignKey("categorias.pk_id"), index=True)
+    centro_treinamento: Mapped['CentroTreinamentoModel'] = relationship(back_populates="atleta", lazy='raise')
+    centro_treinamento_id: Mapped[int] = mapped_column(ForeignKey("centros_treinamento.pk_id"), index=True)
+
+class AtletaResumoModel(Base):
+    """
+    Resumo dos atletas por categoria, centro de treinamento, sexo e faixa de IMC: quantidade,
+    somas e somas dos quadrados de peso, altura e idade (média e desvio padrão sem varrer `atletas`).
+    Atualizado pelo `AtletaService` na mesma transação de cada escrita; base de GET /atletas/stats.
+    Cada atualização incrementa a versão `atletas_resumo` em `table_versions` (ver `atleta/stats.py`).
+    """
+    __tablename__ = 'atletas_resumo'
+
+    categoria_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    centro_treinamento_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    sexo: Mapped[str] = mapped_column(String(1), primary_key=True)
+    faixa_imc: Mapped[str] = mapped_column(String(10), primary_key=True)
+    quantidade: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    soma_peso: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    soma_peso2: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    soma_altura: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    soma_altura2: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    soma_idade: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    soma_idade2: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+
+
+class AtletaChangeModel(Base):
+    """
+    Log de alterações dos atletas (só inserções), escrito pelo `AtletaService` na mesma transação
+    de cada escrita. O `pk_id` é o cursor do GET /atletas/changes.
+    """
+    __tablename__ = 'atletas_changes'
+
+    pk_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    atleta_id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), nullable=False)
+    # create, update ou delete
+    operacao: Mapped[str] = mapped_column(String(10), nullable=False)
+    # Atleta completo (create), campos alterados (update) ou nulo (delete)
+    dados: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)
+    # Indexado para a limpeza dos eventos mais antigos que ATLETA_CHANGES_RETENTION_DAYS
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+
+# A cada INSERT no log, um NOTIFY no canal de mesmo nome (só postgres), entregue no commit.
+# Por statement e com payload vazio: o postgres junta notificações iguais da mesma transação,
+# então um lote de mil atletas acorda cada worker uma única vez
+ATLETAS_CHANGES_NOTIFY_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION atletas_changes_notify() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('atletas_changes', '');
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER atletas_changes_notify AFTER INSERT ON atletas_changes
+    FOR EACH STATEMENT EXECUTE PROCEDURE atletas_changes_notify()
+    """,
+)
+
+for _ddl in ATLETAS_CHANGES_NOTIFY_DDL:
+    event.listen(AtletaChangeModel.__table__, 'after_create', DDL(_ddl).execute_if(dialect='postgresql'))
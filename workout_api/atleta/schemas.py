@@ -1,5 +1,7 @@
-from typing import Annotated, Optional
-from pydantic import Field, PositiveFloat
+from datetime import datetime
+from typing import Annotated, Dict, List, Literal, Optional
+from pydantic import UUID4, Field, PositiveFloat
+from workout_api.configs.settings import settings
 from workout_api.contrib.schemas import BaseSchema, OutMixin
 
 
@@ -47,3 +49,71 @@ class AtletaCustom(BaseSchema):
     nome: Annotated[str, Field(description='Nome do atleta', example='Joao', max_length=50)]
     categoria: Annotated[str, Field(description='Nome da categoria', example='Scale')]
     centro_treinamento: Annotated[str, Field(description='Nome do centro de treinamento', example='CT King')]
+
+
+# Schema de resultado da busca por nome (endpoint GET /atletas/search)
+class AtletaBusca(AtletaCustom):
+    id: Annotated[UUID4, Field(description='Identificador do atleta')]
+    score: Annotated[float, Field(description='Relevância do resultado (maior é melhor)', example=0.8)]
+
+
+# Linha da importação em lote que não foi inserida
+class AtletaBulkErro(BaseSchema):
+    linha: Annotated[int, Field(description='Posição do registro no corpo (a partir de 1)', example=3)]
+    cpf: Annotated[Optional[str], Field(None, description='CPF informado no registro', example='12345678900')]
+    motivo: Annotated[Literal['cpf_duplicado', 'invalido', 'corpo_invalido'], Field(
+        description='Motivo da rejeição; `corpo_invalido` interrompe a importação a partir dessa linha'
+    )]
+    detalhe: Annotated[str, Field(description='Descrição do erro')]
+
+
+# Resultado da importação em lote (endpoint POST /atletas/bulk)
+class AtletaBulkOut(BaseSchema):
+    total: Annotated[int, Field(description='Registros recebidos', example=1000)]
+    criados: Annotated[int, Field(description='Atletas inseridos', example=998)]
+    erros: Annotated[List[AtletaBulkErro], Field(description='Registros rejeitados, sem abortar o lote')]
+
+
+# Ids da consulta em lote (endpoint POST /atletas/batch-get)
+class AtletaBatchIn(BaseSchema):
+    ids: Annotated[List[UUID4], Field(
+        description='Ids dos atletas', min_length=1, max_length=settings.ATLETA_BATCH_MAX_IDS
+    )]
+
+
+# Resultado da consulta em lote: atletas na ordem pedida e os ids não encontrados
+class AtletaBatchOut(BaseSchema):
+    items: Annotated[List[AtletaOut], Field(description='Atletas encontrados, na ordem dos ids enviados')]
+    missing: Annotated[List[UUID4], Field(description='Ids sem atleta correspondente')]
+
+
+# Estatísticas de uma medida (peso, altura ou idade) em GET /atletas/stats
+class AtletaMedidaStats(BaseSchema):
+    media: Annotated[float, Field(description='Média', example=75.2)]
+    desvio_padrao: Annotated[float, Field(description='Desvio padrão amostral', example=9.8)]
+    p25: Annotated[Optional[float], Field(None, description='Percentil 25 (só no postgres)', example=68.0)]
+    p50: Annotated[Optional[float], Field(None, description='Mediana (só no postgres)', example=75.0)]
+    p75: Annotated[Optional[float], Field(None, description='Percentil 75 (só no postgres)', example=82.5)]
+    p90: Annotated[Optional[float], Field(None, description='Percentil 90 (só no postgres)', example=88.0)]
+
+
+# Um grupo de GET /atletas/stats; os campos do agrupamento que não foram pedidos saem nulos
+class AtletaStatsGrupo(BaseSchema):
+    categoria: Annotated[Optional[str], Field(None, description='Categoria do grupo', example='Scale')]
+    centro_treinamento: Annotated[Optional[str], Field(None, description='Centro de treinamento do grupo', example='CT King')]
+    sexo: Annotated[Optional[str], Field(None, description='Sexo do grupo', example='M')]
+    quantidade: Annotated[int, Field(description='Atletas no grupo', example=120)]
+    peso: Annotated[AtletaMedidaStats, Field(description='Peso (kg)')]
+    altura: Annotated[AtletaMedidaStats, Field(description='Altura (m)')]
+    idade: Annotated[AtletaMedidaStats, Field(description='Idade (anos)')]
+    imc: Annotated[Dict[str, int], Field(description='Atletas por faixa de IMC', example={'normal': 80, 'sobrepeso': 40})]
+    por_sexo: Annotated[Dict[str, int], Field(description='Atletas por sexo', example={'F': 55, 'M': 65})]
+
+
+# Resposta de GET /atletas/stats
+class AtletaStatsOut(BaseSchema):
+    group_by: Annotated[List[str], Field(description='Agrupamento usado', example=['categoria'])]
+    grupos: Annotated[List[AtletaStatsGrupo], Field(description='Estatísticas de cada grupo')]
+    percentis_atualizados_em: Annotated[Optional[datetime], Field(
+        None, description='Instante dos dados usados nos percentis (atualizados a cada ATLETA_STATS_REFRESH_SECONDS)'
+    )]
@@ -0,0 +1,93 @@
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Hashable, List, Set, Tuple
+
+# Mesmo limiar padrão do `pg_trgm.similarity_threshold`
+SIMILARITY_THRESHOLD = 0.3
+
+
+def normalizar(texto: str) -> str:
+    """
+    Remove acentos e caixa, para que 'João' e 'joao' gerem os mesmos trigramas.
+    """
+    sem_acento = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode()
+    return sem_acento.lower()
+
+
+def palavras(texto: str) -> List[str]:
+    return re.findall(r'[a-z0-9]+', normalizar(texto))
+
+
+def trigramas(texto: str) -> Set[str]:
+    """
+    Trigramas no mesmo formato do `pg_trgm`: cada palavra recebe dois espaços antes e um depois.
+    """
+    resultado: Set[str] = set()
+    for palavra in palavras(texto):
+        padded = f'  {palavra} '
+        resultado.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return resultado
+
+
+def similaridade(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class TrigramIndex:
+    """
+    Índice invertido de trigramas em memória, equivalente em Python à busca por
+    `pg_trgm` + prefixo do `tsvector`. Usado quando o banco não é postgres (ex.: sqlite).
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._documentos: Dict[Hashable, Tuple[List[str], Set[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documentos)
+
+    def add(self, chave: Hashable, texto: str) -> None:
+        if chave in self._documentos:
+            self.remove(chave)
+
+        tris = trigramas(texto)
+        self._documentos[chave] = (palavras(texto), tris)
+        for tri in tris:
+            self._postings[tri].add(chave)
+
+    def remove(self, chave: Hashable) -> None:
+        _, tris = self._documentos.pop(chave)
+        for tri in tris:
+            self._postings[tri].discard(chave)
+
+    def search(self, q: str) -> List[Tuple[Hashable, float]]:
+        """
+        Retorna `(chave, score)` ordenados: primeiro os casamentos por prefixo (todas as
+        palavras da busca iniciam alguma palavra do nome), depois pela similaridade.
+        """
+        termos = palavras(q)
+        tris_q = trigramas(q)
+        if not termos:
+            return []
+
+        candidatos: Set[Hashable] = set()
+        for tri in tris_q:
+            candidatos.update(self._postings.get(tri, ()))
+
+        ranking = []
+        for chave in candidatos:
+            nome_palavras, tris = self._documentos[chave]
+            prefixo = all(any(p.startswith(t) for p in nome_palavras) for t in termos)
+            # Como o `word_similarity`, compara a busca também com cada palavra do nome isoladamente
+            score = max(
+                [similaridade(tris_q, tris)] + [similaridade(tris_q, trigramas(p)) for p in nome_palavras]
+            )
+            if prefixo or score >= SIMILARITY_THRESHOLD:
+                ranking.append((not prefixo, -score, chave, score))
+
+        # Empates são desfeitos pela chave (pk_id), como o ORDER BY da busca no postgres
+        ranking.sort(key=lambda item: item[:3])
+        return [(chave, score) for _, _, chave, score in ranking]
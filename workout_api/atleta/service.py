@@ -1,20 +1,85 @@
+import csv
+import io
+import math
+import re
 from datetime import datetime
-from typing import List, Optional
-from uuid import uuid4
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
 
 from fastapi import Depends, HTTPException, status
+from fastapi_pagination import Page, Params, create_page
+from pydantic import ValidationError
+from sqlalchemy import any_, bindparam, delete, func, literal, literal_column, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, sessionmaker
 
-from workout_api.atleta.models import AtletaModel
-from workout_api.atleta.schemas import AtletaIn, AtletaOut, AtletaUpdate
+from workout_api.atleta.changes import atleta_changes, dados_atleta, registrar
+from workout_api.atleta.fields import CAMPOS_EXPORT, CAMPOS_LISTAGEM, row_to_dict, select_campos
+from workout_api.atleta.models import AtletaModel, AtletaResumoModel
+from workout_api.atleta.schemas import (AtletaBatchOut, AtletaBulkErro, AtletaBulkOut, AtletaBusca,
+                                       AtletaCustom, AtletaIn, AtletaMedidaStats, AtletaOut, AtletaStatsGrupo,
+                                       AtletaStatsOut, AtletaUpdate, CategoriaIn, CentroTreinamentoIn)
+from workout_api.atleta.search import TrigramIndex, palavras
+from workout_api.atleta.stats import (CAMPOS_RESUMO, COLUNAS_RESUMO, GRUPOS, MEDIDAS, SOMAS, atualizar_resumo,
+                                     percentis)
+from workout_api.categorias.cache import categorias_cache
 from workout_api.categorias.models import CategoriaModel
+from workout_api.centro_treinamento.cache import centros_treinamento_cache
 from workout_api.centro_treinamento.models import CentroTreinamentoModel
+from workout_api.configs.settings import settings
+from workout_api.contrib.conditional import etag_matches, parse_version_etags, version_etag
+from workout_api.contrib.database import dialect_insert
 from workout_api.contrib.dependencies import DatabaseDependency
+from workout_api.contrib.cache import TTLCache
+from workout_api.contrib.pagination import (CursorPage, OptionalTotalPage, TotalStrategy, count_total, decode_cursor,
+                                            encode_cursor)
+from workout_api.contrib.responses import dumps
+from workout_api.contrib.streaming import InvalidBody, InvalidRecord
+
+# Configuração de texto dos índices de busca; precisa ser literal para casar com o índice de expressão
+_TS_CONFIG = literal_column("'simple'")
+
+
+# Colunas próprias do `AtletaOut`
+_COLUNAS_ATLETA = (
+    AtletaModel.id,
+    AtletaModel.created_at,
+    AtletaModel.nome,
+    AtletaModel.cpf,
+    AtletaModel.idade,
+    AtletaModel.peso,
+    AtletaModel.altura,
+    AtletaModel.sexo,
+)
+
+# Colunas do `AtletaOut`; categoria e centro saem como pk_id e são resolvidos pelo cache de referência.
+# O `updated_at` não faz parte do corpo: é a versão da linha, usada na ETag.
+_COLUNAS_OUT = _COLUNAS_ATLETA + (
+    AtletaModel.categoria_id,
+    AtletaModel.centro_treinamento_id,
+    AtletaModel.updated_at,
+)
+
+
+# Totais da listagem (estratégia `cached`) por filtros (nome, cpf); cada worker tem o seu
+atletas_total_cache: TTLCache[tuple, int] = TTLCache(
+    maxsize=settings.PAGINATION_TOTAL_CACHE_SIZE, ttl=settings.PAGINATION_TOTAL_CACHE_SECONDS
+)
 
 
 class AtletaService:
+    @staticmethod
+    def _escrita_confirmada(muda_totais: bool = True) -> None:
+        """
+        Depois do commit de uma escrita: acorda o feed de alterações e, se a escrita muda a
+        quantidade de atletas de algum filtro da listagem, descarta os totais em cache deste worker.
+        """
+        atleta_changes.escrita()
+        if muda_totais:
+            atletas_total_cache.clear()
+
     @staticmethod
     async def create(db_session: DatabaseDependency, atleta_in: AtletaIn) -> AtletaOut:
         """
@@ -23,132 +88,700 @@ class AtletaService:
         categoria_nome = atleta_in.categoria.nome
         centro_treinamento_nome = atleta_in.centro_treinamento.nome
 
-        # Busca a categoria no banco de dados
-        categoria = (await db_session.execute(
-            select(CategoriaModel).filter_by(nome=categoria_nome))
-        ).scalars().first()
+        # Resolve a categoria pelo cache de referência
+        categoria_id = await categorias_cache.get_pk(db_session, categoria_nome)
 
-        if not categoria:
+        if not categoria_id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f'A categoria {categoria_nome} não foi encontrada.'
             )
 
-        # Busca o centro de treinamento no banco de dados
-        centro_treinamento = (await db_session.execute(
-            select(CentroTreinamentoModel).filter_by(nome=centro_treinamento_nome))
-        ).scalars().first()
+        # Resolve o centro de treinamento pelo cache de referência
+        centro_treinamento_id = await centros_treinamento_cache.get_pk(db_session, centro_treinamento_nome)
 
-        if not centro_treinamento:
+        if not centro_treinamento_id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f'O centro de treinamento {centro_treinamento_nome} não foi encontrado.'
             )
         
+        # `atleta_in` já foi validado: o `AtletaOut` é montado sem validar de novo
+        atleta_out = AtletaOut.model_construct(
+            id=uuid4(), created_at=datetime.utcnow(), **dict(atleta_in)
+        )
+        valores = {
+            **atleta_in.model_dump(exclude={'categoria', 'centro_treinamento'}),
+            'categoria_id': categoria_id,
+            'centro_treinamento_id': centro_treinamento_id,
+        }
+        atleta_model = AtletaModel(
+            id=atleta_out.id,
+            created_at=atleta_out.created_at,
+            updated_at=atleta_out.created_at,
+            **valores,
+        )
+
         # Tenta criar o atleta no banco de dados
         try:
-            atleta_out = AtletaOut(id=uuid4(), created_at=datetime.utcnow(), **atleta_in.model_dump())
-            atleta_model = AtletaModel(**atleta_out.model_dump(exclude={'categoria', 'centro_treinamento'}))
-            
-            atleta_model.categoria_id = categoria.pk_id
-            atleta_model.centro_treinamento_id = centro_treinamento.pk_id
-            
             db_session.add(atleta_model)
-            await db_session.commit()
-            await db_session.refresh(atleta_model)
+            await db_session.flush()
 
-        # Captura o erro de violação de integridade (CPF único)
+        # Captura o erro de violação de integridade (CPF único); só o INSERT do atleta fica aqui dentro
         except IntegrityError:
             await db_session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_303_SEE_OTHER,
                 detail=f"Já existe um atleta cadastrado com o cpf: {atleta_in.cpf}"
             )
-        
-        # O `refresh` não carrega os relacionamentos, então os associamos manualmente para o retorno
-        atleta_out.categoria = categoria
-        atleta_out.centro_treinamento = centro_treinamento
-        
+
+        await atualizar_resumo(db_session, adicionados=[valores])
+        await registrar(db_session, 'create', [
+            (atleta_out.id, dados_atleta(atleta_in, atleta_out.id, atleta_out.created_at))
+        ])
+        await db_session.commit()
+
+        AtletaService._escrita_confirmada()
+
+        # `atleta_out` já traz os nomes da categoria e do centro de treinamento recebidos
         return atleta_out
 
+    @staticmethod
+    async def bulk_create(db_session: DatabaseDependency, registros: AsyncIterator[Any]) -> AtletaBulkOut:
+        """
+        Importa atletas em lotes de ATLETA_BULK_CHUNK_SIZE: um INSERT ... ON CONFLICT (cpf) DO NOTHING
+        e um commit por lote. CPFs já existentes e registros inválidos são reportados por linha, sem
+        abortar a importação. Se o corpo deixa de ser legível no meio, os registros anteriores são
+        importados e a importação para ali, com o erro em `erros`.
+        """
+        resultado = AtletaBulkOut(total=0, criados=0, erros=[])
+        lote: List[Tuple[int, AtletaIn]] = []
+
+        try:
+            async for registro in registros:
+                resultado.total += 1
+                if isinstance(registro, InvalidRecord):
+                    resultado.erros.append(AtletaBulkErro(
+                        linha=resultado.total, motivo='invalido', detalhe=registro.detail
+                    ))
+                    continue
+
+                try:
+                    lote.append((resultado.total, AtletaIn.model_validate(registro)))
+                except ValidationError as exc:
+                    cpf = registro.get('cpf') if isinstance(registro, dict) else None
+                    resultado.erros.append(AtletaBulkErro(
+                        linha=resultado.total, cpf=cpf if isinstance(cpf, str) else None,
+                        motivo='invalido',
+                        detalhe='; '.join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors())
+                    ))
+                    continue
+
+                if len(lote) >= settings.ATLETA_BULK_CHUNK_SIZE:
+                    await AtletaService._inserir_lote(db_session, lote, resultado)
+                    lote = []
+        except InvalidBody as exc:
+            # Nenhum registro lido: o corpo todo é inválido
+            if not resultado.total:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+            resultado.erros.append(AtletaBulkErro(linha=resultado.total + 1, motivo='corpo_invalido', detalhe=str(exc)))
+
+        if lote:
+            await AtletaService._inserir_lote(db_session, lote, resultado)
+
+        resultado.erros.sort(key=lambda erro: erro.linha)
+        return resultado
+
+    @staticmethod
+    async def _inserir_lote(
+        db_session: DatabaseDependency, lote: List[Tuple[int, AtletaIn]], resultado: AtletaBulkOut
+    ) -> None:
+        # Cada nome de categoria/centro é resolvido uma vez por lote
+        categorias = {nome: await categorias_cache.get_pk(db_session, nome)
+                      for nome in {atleta_in.categoria.nome for _, atleta_in in lote}}
+        centros = {nome: await centros_treinamento_cache.get_pk(db_session, nome)
+                   for nome in {atleta_in.centro_treinamento.nome for _, atleta_in in lote}}
+
+        created_at = datetime.utcnow()
+        linhas: Dict[str, int] = {}
+        atletas: Dict[str, AtletaIn] = {}
+        rows = []
+        for linha, atleta_in in lote:
+            erro = None
+            if not categorias[atleta_in.categoria.nome]:
+                erro = f'A categoria {atleta_in.categoria.nome} não foi encontrada.'
+            elif not centros[atleta_in.centro_treinamento.nome]:
+                erro = f'O centro de treinamento {atleta_in.centro_treinamento.nome} não foi encontrado.'
+            elif atleta_in.cpf in linhas:
+                resultado.erros.append(AtletaBulkErro(
+                    linha=linha, cpf=atleta_in.cpf, motivo='cpf_duplicado',
+                    detalhe=f'CPF repetido na linha {linhas[atleta_in.cpf]} da importação'
+                ))
+                continue
+
+            if erro:
+                resultado.erros.append(AtletaBulkErro(linha=linha, cpf=atleta_in.cpf, motivo='invalido', detalhe=erro))
+                continue
+
+            linhas[atleta_in.cpf] = linha
+            atletas[atleta_in.cpf] = atleta_in
+            rows.append({
+                **atleta_in.model_dump(exclude={'categoria', 'centro_treinamento'}),
+                'id': uuid4(),
+                'created_at': created_at,
+                'updated_at': created_at,
+                'categoria_id': categorias[atleta_in.categoria.nome],
+                'centro_treinamento_id': centros[atleta_in.centro_treinamento.nome],
+            })
+
+        if not rows:
+            return
+
+        stmt = (
+            dialect_insert(db_session, AtletaModel.__table__)
+            .on_conflict_do_nothing(index_elements=['cpf'])
+            .returning(AtletaModel.cpf)
+        )
+        inseridos = set((await db_session.execute(stmt, rows)).scalars().all())
+        criados = [row for row in rows if row['cpf'] in inseridos]
+        await atualizar_resumo(db_session, adicionados=criados)
+        await registrar(db_session, 'create', [
+            (row['id'], dados_atleta(atletas[row['cpf']], row['id'], created_at)) for row in criados
+        ])
+        await db_session.commit()
+        AtletaService._escrita_confirmada()
+
+        resultado.criados += len(inseridos)
+        for cpf, linha in linhas.items():
+            if cpf not in inseridos:
+                resultado.erros.append(AtletaBulkErro(
+                    linha=linha, cpf=cpf, motivo='cpf_duplicado',
+                    detalhe=f'Já existe um atleta cadastrado com o cpf: {cpf}'
+                ))
+
+    @staticmethod
+    async def get_row(db_session: DatabaseDependency, id: str):
+        """
+        Consulta as colunas de um atleta pelo seu ID, sem montar o `AtletaOut`.
+        """
+        row = (await db_session.execute(select(*_COLUNAS_OUT).filter_by(id=id))).first()
+
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f'Atleta não encontrado com id: {id}'
+            )
+
+        return row
+
     @staticmethod
     async def get(db_session: DatabaseDependency, id: str) -> AtletaOut:
         """
         Consulta um atleta pelo seu ID.
         """
-        atleta: AtletaOut | None = (
-            await db_session.execute(select(AtletaModel).filter_by(id=id))
-        ).scalars().first()
+        row = await AtletaService.get_row(db_session=db_session, id=id)
+        return await AtletaService.atleta_out(db_session, row)
+
+    @staticmethod
+    async def get_campos(db_session: DatabaseDependency, id: str, campos: Sequence[str]) -> Tuple[dict, datetime]:
+        """
+        Consulta apenas os `campos` de um atleta, no formato do `AtletaOut`, e a versão da linha (`updated_at`).
+        """
+        row = (await db_session.execute(
+            select_campos(campos, AtletaModel.updated_at.label('_updated_at')).filter(AtletaModel.id == id)
+        )).first()
 
-        if not atleta:
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f'Atleta não encontrado com id: {id}'
             )
-        
-        return atleta
+
+        return row_to_dict(row, campos, aninhar=True), row._updated_at
+
+    @staticmethod
+    def _filtro_ids(db_session: DatabaseDependency, ids: List[UUID]):
+        if db_session.get_bind().dialect.name == 'postgresql':
+            # Um único parâmetro de array: o mesmo statement preparado serve para qualquer quantidade de ids
+            return AtletaModel.id == any_(bindparam('ids', ids, type_=ARRAY(AtletaModel.id.type)))
+        return AtletaModel.id.in_(ids)
 
     @staticmethod
-    async def query(db_session: DatabaseDependency, nome: Optional[str] = None, cpf: Optional[str] = None) -> List[AtletaOut]:
+    async def get_many(db_session: DatabaseDependency, ids: List[UUID]) -> AtletaBatchOut:
         """
-        Consulta uma lista de atletas, com filtros opcionais por nome e CPF.
+        Consulta vários atletas em uma única query (`id = ANY(:ids)`), com os nomes da categoria e
+        do centro de treinamento no mesmo SELECT. Os atletas voltam na ordem dos ids enviados
+        (ids repetidos aparecem uma vez) e os ids sem atleta são listados em `missing`.
         """
+        ids = list(dict.fromkeys(ids))
         query = (
-            select(AtletaModel)
-            .options(
-                selectinload(AtletaModel.centro_treinamento), # <--- Carregar o relacionamento
-                selectinload(AtletaModel.categoria)          # <--- Carregar o relacionamento
+            select(
+                *_COLUNAS_ATLETA,
+                CategoriaModel.nome.label('categoria'),
+                CentroTreinamentoModel.nome.label('centro_treinamento'),
             )
+            .join(CategoriaModel, AtletaModel.categoria_id == CategoriaModel.pk_id)
+            .join(CentroTreinamentoModel, AtletaModel.centro_treinamento_id == CentroTreinamentoModel.pk_id)
+            .where(AtletaService._filtro_ids(db_session, ids))
         )
-        
+        por_id = {row.id: row for row in (await db_session.execute(query)).all()}
+
+        # As linhas vêm do banco com os tipos certos: os schemas são montados sem nova validação
+        items = []
+        for id in ids:
+            row = por_id.get(id)
+            if row is None:
+                continue
+            valores = row._asdict()
+            categoria = CategoriaIn.model_construct(nome=valores.pop('categoria'))
+            centro_treinamento = CentroTreinamentoIn.model_construct(nome=valores.pop('centro_treinamento'))
+            items.append(AtletaOut.model_construct(
+                **valores, categoria=categoria, centro_treinamento=centro_treinamento
+            ))
+
+        return AtletaBatchOut.model_construct(items=items, missing=[id for id in ids if id not in por_id])
+
+    @staticmethod
+    async def get_many_campos(db_session: DatabaseDependency, ids: List[UUID], campos: Sequence[str]) -> dict:
+        """
+        Como `get_many`, mas só com os `campos` pedidos, montando os dicts da resposta direto das linhas.
+        """
+        ids = list(dict.fromkeys(ids))
+        query = (
+            select_campos(campos, AtletaModel.id.label('_id'))
+            .where(AtletaService._filtro_ids(db_session, ids))
+        )
+        por_id = {row._id: row for row in (await db_session.execute(query)).all()}
+
+        return {
+            'items': [row_to_dict(por_id[id], campos, aninhar=True) for id in ids if id in por_id],
+            'missing': [id for id in ids if id not in por_id],
+        }
+
+    @staticmethod
+    def _filtrar(query, nome: Optional[str] = None, cpf: Optional[str] = None):
+        """
+        Aplica os filtros opcionais por nome e CPF a uma consulta de atletas.
+        """
         if nome:
             query = query.filter(AtletaModel.nome == nome)
         if cpf:
             query = query.filter(AtletaModel.cpf == cpf)
-        
-        atletas: List[AtletaOut] = (await db_session.execute(query)).scalars().all()
-        
-        return atletas
+
+        return query
 
     @staticmethod
-    async def update(db_session: DatabaseDependency, id: str, atleta_up: AtletaUpdate) -> AtletaOut:
+    def _listagem_query():
         """
-        Atualiza os dados de um atleta existente.
+        Projeção enxuta da listagem: apenas as colunas do `AtletaCustom`, com um único JOIN.
+        Evita hidratar `AtletaModel` e os `selectinload` dos relacionamentos.
+        """
+        return select_campos(CAMPOS_LISTAGEM)
+
+    @staticmethod
+    def _listagem(rows) -> List[AtletaCustom]:
+        # As linhas já vêm do banco com os tipos certos, então dispensam a validação do Pydantic
+        return [
+            AtletaCustom.model_construct(
+                nome=row.nome,
+                categoria=row.categoria,
+                centro_treinamento=row.centro_treinamento
+            ) for row in rows
+        ]
+
+    @staticmethod
+    async def query_rows(
+        db_session: DatabaseDependency,
+        params: Params,
+        nome: Optional[str] = None,
+        cpf: Optional[str] = None,
+        campos: Sequence[str] = CAMPOS_LISTAGEM,
+        total: Optional[TotalStrategy] = None
+    ) -> Tuple[list, Optional[int]]:
+        """
+        Consulta as linhas de uma página de atletas (limit/offset) e o total, com filtros opcionais
+        por nome e CPF. O LIMIT/OFFSET e a contagem são feitos no banco, apenas a página é carregada.
+        As linhas trazem as colunas de `campos`, nessa ordem. O total segue a estratégia `total`
+        (ver `count_total`) e é nulo com `none`.
         """
-        atleta: AtletaOut | None = (
-            await db_session.execute(select(AtletaModel).filter_by(id=id))
-        ).scalars().first()
+        raw_params = params.to_raw_params()
 
-        if not atleta:
+        contagem = await count_total(
+            db_session, AtletaService._filtrar(select(AtletaModel.pk_id), nome, cpf),
+            estrategia=total, cache=atletas_total_cache, chave=(nome, cpf)
+        )
+
+        query = (
+            AtletaService._filtrar(select_campos(campos), nome, cpf)
+            .order_by(AtletaModel.pk_id)
+            .limit(raw_params.limit)
+            .offset(raw_params.offset)
+        )
+        rows = (await db_session.execute(query)).all()
+
+        return rows, contagem
+
+    @staticmethod
+    async def query(
+        db_session: DatabaseDependency,
+        params: Params,
+        nome: Optional[str] = None,
+        cpf: Optional[str] = None,
+        total: Optional[TotalStrategy] = None
+    ) -> OptionalTotalPage[AtletaCustom]:
+        """
+        Consulta uma página de atletas (limit/offset), com filtros opcionais por nome e CPF.
+        """
+        rows, contagem = await AtletaService.query_rows(
+            db_session=db_session, params=params, nome=nome, cpf=cpf, total=total
+        )
+        # Direto pelo `OptionalTotalPage`: o `create_page` usa o `Page` padrão fora das rotas, que exige o total
+        return OptionalTotalPage[AtletaCustom].create(AtletaService._listagem(rows), params, total=contagem)
+
+    @staticmethod
+    async def query_cursor_rows(
+        db_session: DatabaseDependency,
+        size: int,
+        cursor: Optional[str] = None,
+        nome: Optional[str] = None,
+        cpf: Optional[str] = None
+    ) -> Tuple[list, Optional[str]]:
+        """
+        Consulta as linhas de uma página de atletas por cursor (keyset), ordenada por `(created_at, pk_id)`.
+        A busca parte direto da última chave vista, então o custo não cresce com a profundidade.
+        """
+        query = (
+            AtletaService._filtrar(AtletaService._listagem_query(), nome, cpf)
+            .add_columns(AtletaModel.created_at, AtletaModel.pk_id)
+            .order_by(AtletaModel.created_at, AtletaModel.pk_id)
+            .limit(size + 1)  # Um item a mais indica se existe próxima página
+        )
+
+        if cursor:
+            created_at, pk_id = decode_cursor(cursor)
+            query = query.filter(
+                tuple_(AtletaModel.created_at, AtletaModel.pk_id) > tuple_(created_at, pk_id)
+            )
+
+        rows = (await db_session.execute(query)).all()
+
+        next_cursor = None
+        if len(rows) > size:
+            rows = rows[:size]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].pk_id)
+
+        return rows, next_cursor
+
+    @staticmethod
+    async def query_cursor(
+        db_session: DatabaseDependency,
+        size: int,
+        cursor: Optional[str] = None,
+        nome: Optional[str] = None,
+        cpf: Optional[str] = None
+    ) -> CursorPage[AtletaCustom]:
+        """
+        Consulta uma página de atletas por cursor (keyset).
+        """
+        rows, next_cursor = await AtletaService.query_cursor_rows(
+            db_session=db_session, size=size, cursor=cursor, nome=nome, cpf=cpf
+        )
+        return CursorPage[AtletaCustom](
+            items=AtletaService._listagem(rows), size=size, next_cursor=next_cursor
+        )
+
+    @staticmethod
+    def _export_query(campos: Sequence[str] = CAMPOS_EXPORT):
+        return select_campos(campos).order_by(AtletaModel.pk_id)
+
+    @staticmethod
+    async def export(
+        session_maker: sessionmaker,
+        formato: str,
+        nome: Optional[str] = None,
+        cpf: Optional[str] = None,
+        campos: Sequence[str] = CAMPOS_EXPORT
+    ) -> AsyncIterator[bytes]:
+        """
+        Exporta os atletas em NDJSON ou CSV, em blocos de EXPORT_CHUNK_ROWS linhas lidas de um
+        cursor do servidor. A memória usada não depende do tamanho da tabela.
+
+        Abre a própria sessão (de `session_maker`): o stream continua depois que o handler retorna a resposta.
+        """
+        query = AtletaService._filtrar(AtletaService._export_query(campos), nome, cpf)
+        query = query.execution_options(yield_per=settings.EXPORT_CHUNK_ROWS)
+
+        async with session_maker() as db_session:
+            result = await db_session.stream(query)
+
+            if formato == 'csv':
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(result.keys())
+                yield buffer.getvalue().encode()
+
+            async for partition in result.partitions():
+                if formato == 'csv':
+                    buffer.seek(0)
+                    buffer.truncate()
+                    writer.writerows(partition)
+                    yield buffer.getvalue().encode()
+                else:
+                    yield b''.join(dumps(row._asdict()) + b'\n' for row in partition)
+
+    @staticmethod
+    def _busca_postgres(q: str):
+        """
+        Monta o filtro e o score da busca no postgres, usando os índices GIN de `pg_trgm`
+        (similaridade) e de `to_tsvector('simple', nome)` (prefixo de palavras).
+        """
+        # O `to_tsvector('simple', ...)` preserva acentos, então os termos aqui também preservam
+        termos = re.findall(r'\w+', q.lower())
+        tsquery = func.to_tsquery(_TS_CONFIG, ' & '.join(f'{termo}:*' for termo in termos))
+        prefixo = func.to_tsvector(_TS_CONFIG, AtletaModel.nome).op('@@', is_comparison=True)(tsquery)
+        score = func.greatest(
+            func.similarity(AtletaModel.nome, q),
+            func.word_similarity(q, AtletaModel.nome),
+        )
+        filtro = or_(
+            AtletaModel.nome.op('%', is_comparison=True)(q),
+            literal(q).op('<%', is_comparison=True)(AtletaModel.nome),
+            prefixo,
+        )
+        return filtro, prefixo, score
+
+    @staticmethod
+    async def buscar(
+        db_session: DatabaseDependency,
+        params: Params,
+        q: str,
+        categoria: Optional[str] = None,
+        centro_treinamento: Optional[str] = None
+    ) -> Page[AtletaBusca]:
+        """
+        Busca atletas por prefixo e por similaridade do nome (tolerante a erros de digitação),
+        opcionalmente restrita a uma categoria e/ou centro de treinamento.
+        """
+        raw_params = params.to_raw_params()
+        query = AtletaService._listagem_query().add_columns(AtletaModel.id, AtletaModel.pk_id)
+        if categoria:
+            query = query.filter(CategoriaModel.nome == categoria)
+        if centro_treinamento:
+            query = query.filter(CentroTreinamentoModel.nome == centro_treinamento)
+
+        if not palavras(q):
+            return create_page([], 0, params)
+
+        if db_session.get_bind().dialect.name != 'postgresql':
+            return await AtletaService._buscar_em_memoria(db_session, params, q, query)
+
+        filtro, prefixo, score = AtletaService._busca_postgres(q)
+        query = query.filter(filtro)
+
+        total_query = select(func.count()).select_from(query.subquery())
+        total: int = (await db_session.execute(total_query)).scalar_one()
+
+        query = (
+            query.add_columns(score.label('score'))
+            .order_by(prefixo.desc(), score.desc(), AtletaModel.pk_id)
+            .limit(raw_params.limit)
+            .offset(raw_params.offset)
+        )
+        rows = (await db_session.execute(query)).all()
+
+        return create_page([AtletaBusca.model_construct(**row._mapping) for row in rows], total, params)
+
+    @staticmethod
+    async def _buscar_em_memoria(db_session: DatabaseDependency, params: Params, q: str, query) -> Page[AtletaBusca]:
+        """
+        Alternativa da busca para bancos sem `pg_trgm` (ex.: sqlite nos testes e benchmarks).
+        """
+        raw_params = params.to_raw_params()
+        rows = {row.pk_id: row for row in (await db_session.execute(query)).all()}
+
+        index = TrigramIndex()
+        for pk_id, row in rows.items():
+            index.add(pk_id, row.nome)
+        ranking = index.search(q)
+
+        pagina = ranking[raw_params.offset:raw_params.offset + raw_params.limit]
+        items = [
+            AtletaBusca.model_construct(**rows[pk_id]._mapping, score=score)
+            for pk_id, score in pagina
+        ]
+        return create_page(items, len(ranking), params)
+
+    @staticmethod
+    async def stats(db_session: DatabaseDependency, grupos: Tuple[str, ...]) -> AtletaStatsOut:
+        """
+        Estatísticas por grupo a partir do resumo incremental (`atletas_resumo`), sem varrer `atletas`:
+        o custo depende do número de grupos, não do número de atletas. Os percentis vêm da view materializada.
+        """
+        colunas = [getattr(AtletaResumoModel, GRUPOS[grupo]) for grupo in grupos]
+        detalhes = [coluna for coluna in (AtletaResumoModel.sexo, AtletaResumoModel.faixa_imc) if coluna not in colunas]
+        somas = [func.sum(getattr(AtletaResumoModel, soma)).label(soma) for soma in SOMAS]
+        rows = (await db_session.execute(
+            select(*colunas, *detalhes, *somas)
+            .where(AtletaResumoModel.quantidade > 0)
+            .group_by(*colunas, *detalhes)
+        )).all()
+
+        # Cada linha é um pedaço (sexo x faixa de IMC) de um grupo
+        acumulados: Dict[tuple, dict] = {}
+        for row in rows:
+            chave = tuple(row[:len(grupos)])
+            grupo = acumulados.setdefault(chave, {'somas': dict.fromkeys(SOMAS, 0), 'imc': {}, 'por_sexo': {}})
+            for soma in SOMAS:
+                grupo['somas'][soma] += getattr(row, soma)
+            quantidade = int(row.quantidade)
+            grupo['imc'][row.faixa_imc] = grupo['imc'].get(row.faixa_imc, 0) + quantidade
+            grupo['por_sexo'][row.sexo] = grupo['por_sexo'].get(row.sexo, 0) + quantidade
+
+        por_grupo, percentis_em = await percentis(db_session, grupos)
+
+        resultado = []
+        for chave in sorted(acumulados):
+            grupo = acumulados[chave]
+            n = int(grupo['somas']['quantidade'])
+            medidas = {}
+            for medida in MEDIDAS:
+                soma, soma2 = grupo['somas'][f'soma_{medida}'], grupo['somas'][f'soma_{medida}2']
+                variancia = (soma2 - soma * soma / n) / (n - 1) if n > 1 else 0.0
+                valores = por_grupo.get(chave, {}).get(medida) or (None,) * 4
+                # Arredondado: a variância pelas somas dos quadrados deixa resíduos como 3e-08 em vez de 0
+                medidas[medida] = AtletaMedidaStats(
+                    media=round(soma / n, 4), desvio_padrao=round(math.sqrt(max(variancia, 0.0)), 4),
+                    **dict(zip(('p25', 'p50', 'p75', 'p90'), valores)),
+                )
+
+            valores = dict(zip(grupos, chave))
+            if 'categoria' in valores:
+                valores['categoria'] = await categorias_cache.get_nome(db_session, valores['categoria'])
+            if 'centro_treinamento' in valores:
+                valores['centro_treinamento'] = await centros_treinamento_cache.get_nome(
+                    db_session, valores['centro_treinamento']
+                )
+
+            resultado.append(AtletaStatsGrupo(
+                **valores, quantidade=n, **medidas, imc=grupo['imc'], por_sexo=grupo['por_sexo']
+            ))
+
+        return AtletaStatsOut(group_by=list(grupos), grupos=resultado, percentis_atualizados_em=percentis_em)
+
+    @staticmethod
+    async def atleta_out(db_session: DatabaseDependency, row) -> AtletaOut:
+        """
+        Monta o `AtletaOut` a partir das colunas retornadas pelo banco e dos nomes em cache.
+        """
+        valores = row._asdict()
+        valores.pop('updated_at', None)
+        categoria = await categorias_cache.get_nome(db_session, valores.pop('categoria_id'))
+        centro_treinamento = await centros_treinamento_cache.get_nome(db_session, valores.pop('centro_treinamento_id'))
+
+        return AtletaOut(
+            **valores,
+            categoria=CategoriaIn(nome=categoria),
+            centro_treinamento=CentroTreinamentoIn(nome=centro_treinamento)
+        )
+
+    @staticmethod
+    async def update_row(
+        db_session: DatabaseDependency, id: str, atleta_up: AtletaUpdate, if_match: Optional[str] = None
+    ):
+        """
+        Atualiza os dados de um atleta existente com um único UPDATE ... RETURNING.
+
+        Com `if_match`, a atualização só acontece se a versão atual (`updated_at`) for uma das
+        ETags informadas; caso contrário, responde 412 sem alterar a linha.
+        """
+        # Atualiza apenas os campos que foram enviados
+        atleta_update_data = atleta_up.model_dump(exclude_unset=True)
+        if not atleta_update_data:
+            try:
+                row = await AtletaService.get_row(db_session=db_session, id=id)
+            except HTTPException:
+                if if_match and if_match.strip() == '*':
+                    raise AtletaService._precondicao_falhou(id, existe=False)
+                raise
+            if if_match and not etag_matches(if_match, version_etag(row.updated_at)):
+                raise AtletaService._precondicao_falhou(id)
+            return row
+
+        # Mudanças em campos do resumo das estatísticas precisam dos valores anteriores (linha travada até o commit)
+        anterior = None
+        if atleta_update_data.keys() & set(CAMPOS_RESUMO):
+            anterior = (await db_session.execute(
+                select(*COLUNAS_RESUMO).filter_by(id=id).with_for_update()
+            )).first()
+
+        query = update(AtletaModel).where(AtletaModel.id == id)
+        if if_match and if_match.strip() != '*':
+            query = query.where(AtletaModel.updated_at.in_(parse_version_etags(if_match)))
+
+        row = (await db_session.execute(
+            query
+            .values(**atleta_update_data, updated_at=datetime.utcnow())
+            .returning(*_COLUNAS_OUT)
+            .execution_options(synchronize_session=False)
+        )).first()
+
+        if not row:
+            # Sem If-Match, nenhuma linha significa que o atleta não existe (404). `If-Match: *` também
+            # não filtra a versão, mas exige que o atleta exista: 412 (RFC 9110, 13.1.1). Com ETags,
+            # é preciso conferir se o atleta existe
+            if if_match and if_match.strip() == '*':
+                raise AtletaService._precondicao_falhou(id, existe=False)
+            if if_match and (await db_session.execute(select(AtletaModel.pk_id).filter_by(id=id))).first():
+                raise AtletaService._precondicao_falhou(id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f'Atleta não encontrado com id: {id}'
             )
-        
-        # Atualiza apenas os campos que foram enviados
-        atleta_update_data = atleta_up.model_dump(exclude_unset=True)
-        for key, value in atleta_update_data.items():
-            setattr(atleta, key, value)
-            
+
+        if anterior:
+            await atualizar_resumo(db_session, adicionados=[row._mapping], removidos=[anterior._mapping])
+        await registrar(db_session, 'update', [(row.id, {**atleta_update_data, 'updated_at': row.updated_at.isoformat()})])
         await db_session.commit()
-        await db_session.refresh(atleta)
-        
-        return atleta
+        # Só o nome entra nos filtros da listagem
+        AtletaService._escrita_confirmada(muda_totais='nome' in atleta_update_data)
+
+        return row
+
+    @staticmethod
+    def _precondicao_falhou(id: str, existe: bool = True) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=(f'O atleta {id} foi alterado desde a versão informada em If-Match' if existe
+                    else f'Atleta não encontrado com id: {id} (If-Match: *)')
+        )
+
+    @staticmethod
+    async def update(db_session: DatabaseDependency, id: str, atleta_up: AtletaUpdate) -> AtletaOut:
+        """
+        Atualiza os dados de um atleta existente.
+        """
+        row = await AtletaService.update_row(db_session=db_session, id=id, atleta_up=atleta_up)
+        return await AtletaService.atleta_out(db_session, row)
 
     @staticmethod
     async def delete(db_session: DatabaseDependency, id: str) -> None:
         """
-        Deleta um atleta do banco de dados.
+        Deleta um atleta do banco de dados com um único DELETE ... RETURNING.
         """
-        atleta: AtletaOut | None = (
-            await db_session.execute(select(AtletaModel).filter_by(id=id))
-        ).scalars().first()
+        row = (await db_session.execute(
+            delete(AtletaModel)
+            .where(AtletaModel.id == id)
+            .returning(AtletaModel.id, *COLUNAS_RESUMO)
+            .execution_options(synchronize_session=False)
+        )).first()
 
-        if not atleta:
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f'Atleta não encontrado com id: {id}'
             )
-        
-        await db_session.delete(atleta)
+
+        await atualizar_resumo(db_session, removidos=[row._mapping])
+        await registrar(db_session, 'delete', [(row.id, None)])
         await db_session.commit()
+        AtletaService._escrita_confirmada()
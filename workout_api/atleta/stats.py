@@ -0,0 +1,259 @@
+import asyncio
+import contextlib
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import case, column, exists, func, insert, table, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.future import select
+
+from workout_api.atleta.models import AtletaChangeModel, AtletaModel, AtletaResumoModel
+from workout_api.configs.settings import settings
+from workout_api.contrib.database import dialect_insert
+from workout_api.contrib.models import TableVersionModel
+from workout_api.contrib.reference import get_table_version
+
+logger = logging.getLogger(__name__)
+
+# Faixas de IMC (peso / altura²) e o limite superior de cada uma
+FAIXAS_IMC: Tuple[Tuple[str, Optional[float]], ...] = (
+    ('abaixo', 18.5),
+    ('normal', 25.0),
+    ('sobrepeso', 30.0),
+    ('obesidade', None),
+)
+
+# Agrupamentos aceitos em `group_by` e a coluna do resumo de cada um
+GRUPOS = {
+    'categoria': 'categoria_id',
+    'centro_treinamento': 'centro_treinamento_id',
+    'sexo': 'sexo',
+}
+
+MEDIDAS = ('peso', 'altura', 'idade')
+PERCENTIS = (0.25, 0.5, 0.75, 0.9)
+
+# Colunas de `atletas` que entram no resumo; escritas que mudam alguma delas atualizam o resumo
+CAMPOS_RESUMO = ('categoria_id', 'centro_treinamento_id', 'sexo') + MEDIDAS
+COLUNAS_RESUMO = tuple(getattr(AtletaModel, campo) for campo in CAMPOS_RESUMO)
+
+_CHAVE = ('categoria_id', 'centro_treinamento_id', 'sexo', 'faixa_imc')
+SOMAS = ('quantidade',) + tuple(f'soma_{medida}{sufixo}' for medida in MEDIDAS for sufixo in ('', '2'))
+
+# Percentis por grupo: view materializada (só postgres) com todas as combinações de
+# categoria, centro e sexo (CUBE). `grupo` é o GROUPING(): um bit por coluna fora do agrupamento,
+# na ordem categoria (4), centro (2), sexo (1). As colunas fora do agrupamento saem como 0 ou ''.
+# `atualizado_em` é o instante do REFRESH.
+VIEW_PERCENTIS = 'atletas_percentis'
+VIEW_PERCENTIS_DDL = (
+    f'''
+    CREATE MATERIALIZED VIEW {VIEW_PERCENTIS} AS
+    SELECT
+        GROUPING(categoria_id, centro_treinamento_id, sexo) AS grupo,
+        COALESCE(categoria_id, 0) AS categoria_id,
+        COALESCE(centro_treinamento_id, 0) AS centro_treinamento_id,
+        COALESCE(sexo, '') AS sexo,
+        {", ".join(
+            f"percentile_cont(ARRAY[{', '.join(map(str, PERCENTIS))}]) WITHIN GROUP (ORDER BY {medida}) AS {medida}"
+            for medida in MEDIDAS
+        )},
+        now() AT TIME ZONE 'utc' AS atualizado_em
+    FROM atletas
+    GROUP BY CUBE (categoria_id, centro_treinamento_id, sexo)
+    ''',
+    # O REFRESH ... CONCURRENTLY exige um índice único com todas as linhas
+    f'CREATE UNIQUE INDEX ix_{VIEW_PERCENTIS}_grupo ON {VIEW_PERCENTIS} (grupo, categoria_id, centro_treinamento_id, sexo)',
+)
+
+_percentis = table(
+    VIEW_PERCENTIS,
+    *(column(nome) for nome in ('grupo', 'categoria_id', 'centro_treinamento_id', 'sexo', *MEDIDAS, 'atualizado_em')),
+)
+
+# Chave do advisory lock que impede dois workers de atualizarem a view ao mesmo tempo
+_LOCK_PERCENTIS = 0x41544C53
+
+
+def parse_group_by(group_by: Optional[str]) -> Tuple[str, ...]:
+    """
+    Lê o parâmetro `group_by` (nomes separados por vírgula). Sem o parâmetro, um único grupo com todos.
+    """
+    if not group_by:
+        return ()
+
+    grupos = tuple(dict.fromkeys(grupo.strip() for grupo in group_by.split(',') if grupo.strip()))
+    invalidos = [grupo for grupo in grupos if grupo not in GRUPOS]
+    if invalidos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Agrupamentos inválidos em group_by: {", ".join(invalidos)}. Disponíveis: {", ".join(GRUPOS)}'
+        )
+    return grupos
+
+
+def faixa_imc(peso: float, altura: float) -> str:
+    imc = peso / (altura * altura)
+    for faixa, limite in FAIXAS_IMC:
+        if limite is None or imc < limite:
+            return faixa
+
+
+def faixa_imc_sql(peso, altura):
+    """
+    Mesma classificação do `faixa_imc`, como expressão SQL (reconstrução do resumo).
+    """
+    imc = peso / (altura * altura)
+    *faixas, (ultima, _) = FAIXAS_IMC
+    return case(*((imc < limite, faixa) for faixa, limite in faixas), else_=ultima)
+
+
+def _contribuicao(atleta: Mapping, sinal: int) -> Tuple[tuple, List[float]]:
+    valores = [sinal]
+    for medida in MEDIDAS:
+        valor = atleta[medida]
+        valores += [sinal * valor, sinal * valor * valor]
+    chave = (
+        atleta['categoria_id'], atleta['centro_treinamento_id'], atleta['sexo'],
+        faixa_imc(atleta['peso'], atleta['altura']),
+    )
+    return chave, valores
+
+
+async def atualizar_resumo(
+    db_session: AsyncSession, adicionados: Iterable[Mapping] = (), removidos: Iterable[Mapping] = ()
+) -> None:
+    """
+    Soma (`adicionados`) e subtrai (`removidos`) atletas do resumo com um único UPSERT de incrementos.
+    Cada atleta precisa das chaves categoria_id, centro_treinamento_id,
+    sexo, peso, altura e idade. Deve rodar na mesma transação da escrita, antes do commit.
+    """
+    deltas: Dict[tuple, List[float]] = {}
+    for atletas, sinal in ((adicionados, 1), (removidos, -1)):
+        for atleta in atletas:
+            chave, valores = _contribuicao(atleta, sinal)
+            atual = deltas.get(chave)
+            deltas[chave] = [a + b for a, b in zip(atual, valores)] if atual else valores
+
+    # Ordenadas pela chave: transações concorrentes travam as linhas do resumo na mesma ordem (sem deadlock)
+    linhas = [{**dict(zip(_CHAVE, chave)), **dict(zip(SOMAS, valores))} for chave, valores in sorted(deltas.items())]
+    if not linhas:
+        return
+
+    resumo = AtletaResumoModel.__table__
+    stmt = dialect_insert(db_session, resumo)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(_CHAVE),
+        set_={soma: resumo.c[soma] + stmt.excluded[soma] for soma in SOMAS},
+    )
+    await db_session.execute(stmt, linhas)
+
+
+async def reconstruir_resumo(conn: AsyncConnection) -> None:
+    """
+    Recalcula o resumo inteiro a partir de `atletas` (carga inicial e correção de divergências).
+
+    No postgres, trava o resumo (EXCLUSIVE: leituras continuam, escritas esperam) antes de ler
+    `atletas`: uma escrita confirmada entre a leitura e o DELETE sumiria do resumo. As escritas
+    que esperam aplicam seus incrementos sobre o resumo já recalculado.
+    """
+    if conn.dialect.name == 'postgresql':
+        await conn.execute(text(f'LOCK TABLE {AtletaResumoModel.__tablename__} IN EXCLUSIVE MODE'))
+
+    colunas = {
+        'categoria_id': AtletaModel.categoria_id,
+        'centro_treinamento_id': AtletaModel.centro_treinamento_id,
+        'sexo': AtletaModel.sexo,
+        'faixa_imc': faixa_imc_sql(AtletaModel.peso, AtletaModel.altura).label('faixa_imc'),
+    }
+    somas = [func.count().label('quantidade')]
+    for medida in MEDIDAS:
+        coluna = getattr(AtletaModel, medida)
+        somas += [func.sum(coluna).label(f'soma_{medida}'), func.sum(coluna * coluna).label(f'soma_{medida}2')]
+
+    rows = (await conn.execute(select(*colunas.values(), *somas).group_by(*colunas.values()))).all()
+
+    await conn.execute(AtletaResumoModel.__table__.delete())
+    if rows:
+        await conn.execute(insert(AtletaResumoModel.__table__), [row._asdict() for row in rows])
+
+
+async def percentis(db_session: AsyncSession, grupos: Tuple[str, ...]) -> Tuple[Dict[tuple, dict], Optional[datetime]]:
+    """
+    Percentis dos grupos de um agrupamento, lidos da view materializada, e o instante do último
+    REFRESH da view. Fora do postgres, não há percentis.
+    """
+    if db_session.get_bind().dialect.name != 'postgresql':
+        return {}, None
+
+    bits = {'categoria': 4, 'centro_treinamento': 2, 'sexo': 1}
+    grupo = sum(bit for nome, bit in bits.items() if nome not in grupos)
+    rows = (await db_session.execute(select(_percentis).where(_percentis.c.grupo == grupo))).all()
+
+    resultado = {}
+    for row in rows:
+        chave = tuple(getattr(row, GRUPOS[nome]) for nome in grupos)
+        resultado[chave] = {medida: getattr(row, medida) for medida in MEDIDAS}
+    atualizado_em = max((row.atualizado_em for row in rows if row.atualizado_em), default=None)
+    return resultado, atualizado_em
+
+
+class PercentisRefresher:
+    """
+    Atualiza a view dos percentis com REFRESH MATERIALIZED VIEW CONCURRENTLY (as leituras continuam
+    durante o refresh) a cada ATLETA_STATS_REFRESH_SECONDS, só quando há eventos no log de alterações
+    (`atletas_changes`) além do último incluído na view. Com vários workers, o advisory lock garante
+    um único refresh por vez; os demais veem a view em dia.
+
+    A posição do log incluída fica em `table_versions` e só o refresher a grava: as escritas dos
+    atletas não disputam nenhuma linha. Os ids do log podem ser confirmados fora de ordem, então a
+    posição gravada é a do último evento com mais de ATLETA_CHANGES_GAP_SECONDS (o mesmo prazo do
+    feed): um evento mais recente, confirmado depois do refresh, ainda deixa a view desatualizada.
+    """
+
+    def __init__(self, intervalo: float) -> None:
+        self.intervalo = intervalo
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self, engine: AsyncEngine) -> bool:
+        limite = datetime.utcnow() - timedelta(seconds=settings.ATLETA_CHANGES_GAP_SECONDS)
+        async with engine.begin() as conn:
+            incluido = await get_table_version(conn, VIEW_PERCENTIS)
+            desatualizada = (await conn.execute(select(exists().where(AtletaChangeModel.pk_id > incluido)))).scalar()
+            if not desatualizada:
+                return False
+            if not (await conn.execute(select(func.pg_try_advisory_xact_lock(_LOCK_PERCENTIS)))).scalar():
+                return False
+
+            # Lida antes do REFRESH: tudo até essa posição já está confirmado e entra na view
+            posicao = (await conn.execute(
+                select(func.coalesce(func.max(AtletaChangeModel.pk_id), 0)).where(AtletaChangeModel.created_at < limite)
+            )).scalar()
+            await conn.execute(text(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {VIEW_PERCENTIS}'))
+
+            stmt = postgresql.insert(TableVersionModel.__table__).values(tabela=VIEW_PERCENTIS, version=posicao)
+            await conn.execute(stmt.on_conflict_do_update(index_elements=['tabela'], set_={'version': posicao}))
+        return True
+
+    async def _loop(self, engine: AsyncEngine) -> None:
+        while True:
+            await asyncio.sleep(self.intervalo)
+            try:
+                await self.refresh(engine)
+            except Exception:  # Um refresh com problema não derruba o loop; tenta de novo no próximo intervalo
+                logger.exception('Falha ao atualizar a view %s', VIEW_PERCENTIS)
+
+    async def start(self, engine: AsyncEngine) -> None:
+        if engine.dialect.name == 'postgresql' and self.intervalo > 0:
+            self._task = asyncio.create_task(self._loop(engine))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+
+percentis_refresher = PercentisRefresher(settings.ATLETA_STATS_REFRESH_SECONDS)
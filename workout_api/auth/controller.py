@@ -4,9 +4,10 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
 
 from workout_api.auth.models import UserModel
-from workout_api.auth.schemas import TokenSchema, UserIn, UserOut
-from workout_api.auth.security import create_access_token, get_password_hash, verify_password
-from workout_api.auth.dependencies import get_current_user
+from workout_api.auth.schemas import Principal, TokenSchema, UserIn, UserOut
+from workout_api.auth.security import create_access_token, hash_password, verify_and_update_password
+from workout_api.auth.dependencies import get_current_user, invalidate_principal
+from workout_api.configs.settings import settings
 from workout_api.contrib.dependencies import DatabaseDependency
 
 router = APIRouter(tags=["auth"])
@@ -14,7 +15,7 @@ router = APIRouter(tags=["auth"])
 @router.post("/register", status_code=status.HTTP_201_CREATED, response_model=UserOut)
 async def register(db_session: DatabaseDependency, user_in: UserIn = Body(...)):
     try:
-        hashed_password = get_password_hash(user_in.password)
+        hashed_password = await hash_password(user_in.password)
         user = UserModel(email=user_in.email, hashed_password=hashed_password)
         db_session.add(user)
         await db_session.commit()
@@ -27,15 +28,32 @@ async def register(db_session: DatabaseDependency, user_in: UserIn = Body(...)):
 async def login_for_access_token(db_session: DatabaseDependency, form_data: OAuth2PasswordRequestForm = Depends()):
     user = (await db_session.execute(select(UserModel).filter_by(email=form_data.username))).scalars().first()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
+
+    valid, new_hash = await verify_and_update_password(form_data.password, user.hashed_password)
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+        )
+
+    # Hash gerado com um custo antigo: aproveita a senha em claro para atualizá-lo
+    if new_hash:
+        user.hashed_password = new_hash
+        await db_session.commit()
+        invalidate_principal(user.email)
     
-    access_token = create_access_token(data={"sub": user.email})
+    claims = {"sub": user.email}
+    if settings.AUTH_TOKEN_CLAIMS:
+        claims["uid"] = user.pk_id
+
+    access_token = create_access_token(data=claims)
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserOut)
-async def read_users_me(current_user: UserModel = Depends(get_current_user)):
+async def read_users_me(current_user: Principal = Depends(get_current_user)):
     return current_user
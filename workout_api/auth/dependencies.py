@@ -2,12 +2,27 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.future import select
 from workout_api.auth.models import UserModel
+from workout_api.auth.schemas import Principal
 from workout_api.auth.security import decode_access_token
+from workout_api.configs.settings import settings
+from workout_api.contrib.cache import TTLCache
 from workout_api.contrib.dependencies import DatabaseDependency
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db_session: DatabaseDependency = Depends()):
+# Usuários autenticados por email (subject do token); cada worker tem o seu
+principal_cache: TTLCache[str, Principal] = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+def invalidate_principal(email: str) -> None:
+    """
+    Deve ser chamada sempre que um usuário for alterado ou removido.
+    Os demais workers enxergam a mudança em até AUTH_CACHE_TTL_SECONDS.
+    """
+    principal_cache.invalidate(email)
+
+async def get_current_user(db_session: DatabaseDependency, token: str = Depends(oauth2_scheme)) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -20,9 +35,19 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db_session: Data
     email: str = payload.get("sub")
     if email is None:
         raise credentials_exception
-        
+
+    # Token assinado com as claims do usuário: a assinatura já garante os dados
+    if settings.AUTH_TOKEN_CLAIMS and "uid" in payload:
+        return Principal(id=payload["uid"], email=email)
+
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return principal
+
     user = (await db_session.execute(select(UserModel).filter_by(email=email))).scalars().first()
     if user is None:
         raise credentials_exception
-        
-    return user
+
+    principal = Principal.model_validate(user)
+    principal_cache.set(email, principal)
+    return principal
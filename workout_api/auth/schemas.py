@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import AliasChoices, BaseModel, EmailStr, Field
 from workout_api.contrib.schemas import BaseSchema
 
 class UserIn(BaseSchema):
@@ -6,9 +6,18 @@ class UserIn(BaseSchema):
     password: str = Field(..., min_length=6, max_length=60, description="Senha do usuário")
 
 class UserOut(BaseSchema):
-    id: int = Field(..., description="ID do usuário")
+    # No UserModel o `id` é o UUID público; o identificador inteiro fica em `pk_id`
+    id: int = Field(..., description="ID do usuário", validation_alias=AliasChoices("pk_id", "id"))
     email: EmailStr = Field(..., description="Email do usuário")
 
 class TokenSchema(BaseModel):
     access_token: str
     token_type: str
+
+class Principal(BaseSchema):
+    """
+    Usuário autenticado da requisição, com o mínimo necessário para autorizar.
+    Pode vir do banco, do cache ou das claims do próprio token.
+    """
+    id: int = Field(..., description="ID do usuário", validation_alias=AliasChoices("pk_id", "id"))
+    email: EmailStr = Field(..., description="Email do usuário")
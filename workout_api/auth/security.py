@@ -1,10 +1,72 @@
+import asyncio
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 from jose import jwt, JWTError
 from workout_api.configs.settings import settings
 
+T = TypeVar('T')
+
 # Configuração para hashing de senhas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_HASH_ROUNDS,  # Hashes abaixo desse custo são marcados para atualização
+)
+
+
+class PasswordHasher:
+    """
+    Executa o bcrypt em um pool de threads limitado, para não bloquear o event loop.
+    O bcrypt libera o GIL enquanto calcula o hash, então threads bastam para paralelizar.
+    Quando há mais de `max_pending` operações em andamento, recusa com 503 + Retry-After.
+    """
+
+    def __init__(self, workers: int, max_pending: int, retry_after: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self.pending = 0  # Alterado apenas de dentro do event loop, não precisa de lock
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many password operations in progress, try again later",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(func, *args)
+        self.pending += 1
+        # Desconta só quando a thread termina: uma requisição cancelada não interrompe o bcrypt,
+        # que continua ocupando o pool até o fim
+        future.add_done_callback(lambda _: self._liberar(loop))
+        return await asyncio.wrap_future(future)
+
+    def _liberar(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Chamado na thread do bcrypt: o contador só é alterado dentro do event loop
+        with contextlib.suppress(RuntimeError):  # Event loop já encerrado
+            loop.call_soon_threadsafe(self._descontar)
+
+    def _descontar(self) -> None:
+        self.pending -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER,
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -12,6 +74,15 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+async def hash_password(password: str) -> str:
+    return await password_hasher.run(get_password_hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a senha e, se o hash estiver com um custo desatualizado, devolve também o novo hash.
+    """
+    return await password_hasher.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=30)  # Token expira em 30 minutos
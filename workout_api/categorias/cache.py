@@ -0,0 +1,5 @@
+from workout_api.categorias.models import CategoriaModel
+from workout_api.categorias.schemas import CategoriaOut
+from workout_api.contrib.reference import ReferenceCache
+
+categorias_cache = ReferenceCache(CategoriaModel.__tablename__, CategoriaModel, CategoriaOut)
@@ -1,10 +1,13 @@
 from uuid import uuid4
-from fastapi import APIRouter, Body, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Body, Header, HTTPException, Response, status
 from pydantic import UUID4
+from workout_api.categorias.cache import categorias_cache
 from workout_api.categorias.schemas import CategoriaIn, CategoriaOut
 from workout_api.categorias.models import CategoriaModel
+from workout_api.contrib.reference import bump_table_version
 
-from workout_api.contrib.dependencies import DatabaseDependency
+from workout_api.contrib.dependencies import DatabaseDependency, ReadOnlyDatabaseDependency
 from sqlalchemy.future import select
 
 router = APIRouter()
@@ -23,7 +26,9 @@ async def post(
     categoria_model = CategoriaModel(**categoria_out.model_dump())
     
     db_session.add(categoria_model)
+    await bump_table_version(db_session, CategoriaModel.__tablename__)
     await db_session.commit()
+    categorias_cache.invalidate()
 
     return categoria_out
     
@@ -32,12 +37,19 @@ async def post(
     '/', 
     summary='Consultar todas as Categorias',
     status_code=status.HTTP_200_OK,
+    responses={status.HTTP_304_NOT_MODIFIED: {'description': 'A versão em cache do cliente continua válida'}},
     response_model=list[CategoriaOut],
 )
-async def query(db_session: DatabaseDependency) -> list[CategoriaOut]:
-    categorias: list[CategoriaOut] = (await db_session.execute(select(CategoriaModel))).scalars().all()
-    
-    return categorias
+async def query(
+    db_session: ReadOnlyDatabaseDependency,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+) -> Response:
+    # A listagem sai pronta do cache de referência, já serializada (e comprimida). Enquanto o
+    # cache estiver dentro do intervalo de conferência, nem o 200 nem o 304 consultam o banco.
+    await categorias_cache.ensure_fresh(db_session)
+
+    return categorias_cache.response(if_none_match, accept_encoding)
 
 
 @router.get(
@@ -46,7 +58,7 @@ async def query(db_session: DatabaseDependency) -> list[CategoriaOut]:
     status_code=status.HTTP_200_OK,
     response_model=CategoriaOut,
 )
-async def get(id: UUID4, db_session: DatabaseDependency) -> CategoriaOut:
+async def get(id: UUID4, db_session: ReadOnlyDatabaseDependency) -> CategoriaOut:
     categoria: CategoriaOut = (
         await db_session.execute(select(CategoriaModel).filter_by(id=id))
     ).scalars().first()
@@ -1,4 +1,5 @@
-from sqlalchemy import Integer, String
+from datetime import datetime
+from sqlalchemy import DateTime, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from workout_api.contrib.models import BaseModel
 
@@ -8,4 +9,5 @@ class CategoriaModel(BaseModel):
 
     pk_id: Mapped[int] = mapped_column(Integer, primary_key=True)
     nome: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     atleta: Mapped['AtletaModel'] = relationship(back_populates="categoria")
\ No newline at end of file
@@ -0,0 +1,7 @@
+from workout_api.centro_treinamento.models import CentroTreinamentoModel
+from workout_api.centro_treinamento.schemas import CentroTreinamentoOut
+from workout_api.contrib.reference import ReferenceCache
+
+centros_treinamento_cache = ReferenceCache(
+    CentroTreinamentoModel.__tablename__, CentroTreinamentoModel, CentroTreinamentoOut
+)
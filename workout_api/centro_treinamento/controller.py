@@ -1,10 +1,13 @@
 from uuid import uuid4
-from fastapi import APIRouter, Body, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Body, Header, HTTPException, Response, status
 from pydantic import UUID4
+from workout_api.centro_treinamento.cache import centros_treinamento_cache
 from workout_api.centro_treinamento.schemas import CentroTreinamentoIn, CentroTreinamentoOut
 from workout_api.centro_treinamento.models import CentroTreinamentoModel
+from workout_api.contrib.reference import bump_table_version
 
-from workout_api.contrib.dependencies import DatabaseDependency
+from workout_api.contrib.dependencies import DatabaseDependency, ReadOnlyDatabaseDependency
 from sqlalchemy.future import select
 
 router = APIRouter()
@@ -23,7 +26,9 @@ async def post(
     centro_treinamento_model = CentroTreinamentoModel(**centro_treinamento_out.model_dump())
     
     db_session.add(centro_treinamento_model)
+    await bump_table_version(db_session, CentroTreinamentoModel.__tablename__)
     await db_session.commit()
+    centros_treinamento_cache.invalidate()
 
     return centro_treinamento_out
     
@@ -32,14 +37,19 @@ async def post(
     '/', 
     summary='Consultar todos os centros de treinamento',
     status_code=status.HTTP_200_OK,
+    responses={status.HTTP_304_NOT_MODIFIED: {'description': 'A versão em cache do cliente continua válida'}},
     response_model=list[CentroTreinamentoOut],
 )
-async def query(db_session: DatabaseDependency) -> list[CentroTreinamentoOut]:
-    centros_treinamento_out: list[CentroTreinamentoOut] = (
-        await db_session.execute(select(CentroTreinamentoModel))
-    ).scalars().all()
-    
-    return centros_treinamento_out
+async def query(
+    db_session: ReadOnlyDatabaseDependency,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+) -> Response:
+    # A listagem sai pronta do cache de referência, já serializada (e comprimida). Enquanto o
+    # cache estiver dentro do intervalo de conferência, nem o 200 nem o 304 consultam o banco.
+    await centros_treinamento_cache.ensure_fresh(db_session)
+
+    return centros_treinamento_cache.response(if_none_match, accept_encoding)
 
 
 @router.get(
@@ -48,7 +58,7 @@ async def query(db_session: DatabaseDependency) -> list[CentroTreinamentoOut]:
     status_code=status.HTTP_200_OK,
     response_model=CentroTreinamentoOut,
 )
-async def get(id: UUID4, db_session: DatabaseDependency) -> CentroTreinamentoOut:
+async def get(id: UUID4, db_session: ReadOnlyDatabaseDependency) -> CentroTreinamentoOut:
     centro_treinamento_out: CentroTreinamentoOut = (
         await db_session.execute(select(CentroTreinamentoModel).filter_by(id=id))
     ).scalars().first()
@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,9 +14,101 @@ class Settings(BaseSettings):
     )
 
     DATABASE_URL: str  # Define que a variável DATABASE_URL é esperada e deve ser uma string
+
+    # Pool de conexões com o banco
+    DATABASE_POOL_SIZE: int = 5             # Conexões mantidas abertas por worker
+    DATABASE_MAX_OVERFLOW: int = 10         # Conexões extras permitidas em picos
+    DATABASE_POOL_TIMEOUT: float = 30       # Segundos esperando uma conexão livre antes de falhar
+    DATABASE_POOL_RECYCLE: int = 1800       # Recria conexões mais velhas que isso (-1 desativa)
+    DATABASE_POOL_PRE_PING: bool = False    # Testa a conexão antes de entregá-la
+    DATABASE_POOL_WARMUP: Optional[int] = None  # Conexões abertas na inicialização (padrão: DATABASE_POOL_SIZE)
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100    # Cache de prepared statements do asyncpg, por conexão
+    DATABASE_PGBOUNCER: bool = False        # PgBouncer em modo transaction: desativa os prepared statements nomeados
+    DATABASE_EARLY_RELEASE: bool = True     # Devolve a conexão ao pool antes de enviar o corpo da resposta
+
+    # Réplicas de leitura para os GETs (URLs separadas por vírgula; vazio usa só o primário)
+    DATABASE_REPLICA_URLS: str = ''
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5     # Réplica mais atrasada que isso deixa de receber leituras
+    DATABASE_REPLICA_CHECK_SECONDS: float = 5       # Intervalo da verificação de saúde e atraso das réplicas
+    READ_YOUR_WRITES_SECONDS: float = 10            # Depois de uma escrita, o cliente lê do primário por esse tempo
     API_SECRET_KEY: str
     API_ALGORITHM: str
 
+    # Hashing de senhas (bcrypt), executado fora do event loop
+    PASSWORD_HASH_ROUNDS: int = 12          # Custo do bcrypt; hashes com custo menor são refeitos no login
+    PASSWORD_HASH_WORKERS: int = 4          # Threads dedicadas ao bcrypt
+    PASSWORD_HASH_MAX_PENDING: int = 64     # Acima disso (na fila + executando) responde 503
+    PASSWORD_HASH_RETRY_AFTER: int = 1      # Segundos sugeridos no header Retry-After do 503
+
+    # Cache do usuário autenticado (evita a consulta à tabela users a cada requisição)
+    AUTH_CACHE_TTL_SECONDS: float = 60
+    AUTH_CACHE_MAX_SIZE: int = 10_000
+    AUTH_TOKEN_CLAIMS: bool = False         # Embute os dados do usuário no token: tokens válidos dispensam o banco
+
+    # Cache de categorias e centros de treinamento; cada worker confere a versão nesse intervalo
+    REFERENCE_CACHE_POLL_SECONDS: float = 5
+
+    # Importação em lote de atletas (POST /atletas/bulk)
+    ATLETA_BULK_CHUNK_SIZE: int = 1_000     # Linhas por INSERT/commit
+    ATLETA_BULK_MAX_ITEM_BYTES: int = 65_536
+
+    # Consulta de vários atletas por id (POST /atletas/batch-get)
+    ATLETA_BATCH_MAX_IDS: int = 200
+
+    # Total das listagens paginadas (GET /atletas; o parâmetro `total` escolhe por requisição):
+    # `exact` (COUNT), `estimated` (estatísticas do postgres; nos outros bancos, COUNT),
+    # `cached` (COUNT guardado por PAGINATION_TOTAL_CACHE_SECONDS, descartado nas escritas
+    # deste worker) ou `none` (sem total)
+    PAGINATION_TOTAL_STRATEGY: Literal['exact', 'estimated', 'cached', 'none'] = 'exact'
+    PAGINATION_TOTAL_CACHE_SECONDS: float = 30
+    PAGINATION_TOTAL_CACHE_SIZE: int = 1_000
+    PAGINATION_ESTIMATE_EXACT_BELOW: int = 10_000   # Estimativas menores que isso são recontadas com COUNT
+
+    # Estatísticas (GET /atletas/stats): intervalo entre as conferências dos percentis (view
+    # materializada, só no postgres); contagens, médias e faixas de IMC são sempre atuais
+    ATLETA_STATS_REFRESH_SECONDS: float = 60
+
+    # Feed de alterações (GET /atletas/changes). No postgres os workers são avisados por
+    # LISTEN/NOTIFY e o intervalo é só a rede de segurança; nos outros bancos, é o polling
+    ATLETA_CHANGES_POLL_SECONDS: float = 5
+    ATLETA_CHANGES_PING_SECONDS: float = 15         # Comentário de keep-alive no stream
+    ATLETA_CHANGES_QUEUE_SIZE: int = 1_000          # Eventos pendentes por assinante antes de desconectá-lo
+    ATLETA_CHANGES_GAP_SECONDS: float = 10          # Espera por ids pulados (transação ainda aberta)
+    ATLETA_CHANGES_RETENTION_DAYS: float = 7
+
+    # Fila de jobs (/jobs): workers assíncronos no próprio processo da API (0 desliga; os jobs
+    # podem rodar só em `python -m workout_api.worker`). Um job em execução sem heartbeat por
+    # JOBS_LEASE_SECONDS é considerado abandonado e volta para a fila
+    JOBS_WORKERS: int = 2
+    JOBS_POLL_SECONDS: float = 1
+    JOBS_LEASE_SECONDS: float = 60
+    JOBS_MAX_ATTEMPTS: int = 3
+    JOBS_RETRY_BACKOFF_SECONDS: float = 5   # Dobra a cada tentativa
+
+    # Exportação de atletas (GET /atletas/export)
+    EXPORT_CHUNK_ROWS: int = 1_000          # Linhas buscadas do cursor do servidor por vez
+    EXPORT_GZIP_LEVEL: int = 6
+
+    # Respostas rápidas: orjson como classe padrão e respostas já validadas serializadas uma única vez
+    FAST_RESPONSES: bool = False
+
+    # Instrumentação de SQL por requisição (header Server-Timing e log estruturado)
+    SQL_INSTRUMENTATION: bool = True
+    SQL_QUERY_BUDGET_MODE: Literal['off', 'warn', 'error'] = 'off'  # error responde 500 nas leituras: só em dev/testes
+    SQL_REPEATED_STATEMENT_THRESHOLD: int = 5   # Mesmo statement repetido na requisição: provável N+1
+
+    # Métricas (GET /metrics). Com vários workers, cada um grava seu snapshot nesse diretório
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_FLUSH_SECONDS: float = 5
+
+    # Compressão das respostas: gzip sempre; zstd e br quando as bibliotecas estão instaladas
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ENCODINGS: str = 'zstd,br,gzip'  # Preferência do servidor em empates no Accept-Encoding
+    COMPRESSION_MIN_SIZE: int = 1_024       # Corpos menores (em bytes) saem sem compressão
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
 
 # Cria uma instância única das configurações para ser usada em todo o projeto
 settings = Settings()
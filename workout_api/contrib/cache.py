@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Cache em memória (por processo) com expiração por tempo e descarte LRU ao atingir `maxsize`.
+    Não usa lock: só é acessado de dentro do event loop.
+
+    Cada `clear()` abre uma nova geração: um valor calculado antes dele (uma consulta que já estava
+    em andamento) é passado a `set` com a geração em que começou e é descartado em vez de gravado.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._data: 'OrderedDict[K, Tuple[float, V]]' = OrderedDict()
+        self.generation = 0
+        self._cleared_at = -float('inf')
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> Optional[V]:
+        item = self._data.get(key)
+        if item is None or item[0] <= self._clock():
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: K, value: V, generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation:
+            return
+        self._data[key] = (self._clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.generation += 1
+        self._cleared_at = self._clock()
+
+    def cleared_within(self, seconds: float) -> bool:
+        return self._clock() - self._cleared_at < seconds
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,143 @@
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from workout_api.configs.settings import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - br só é oferecido com a biblioteca instalada
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstd só é oferecido com a biblioteca instalada
+    zstandard = None
+
+# Tipos de conteúdo que valem a pena comprimir (texto); imagens e afins já vêm comprimidos
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+# Exceções entre eles: no SSE cada evento sairia com um flush do compressor, e proxies podem segurar o stream
+UNCOMPRESSIBLE_TYPES = ('text/event-stream',)
+
+
+class StreamCompressor(ABC):
+    """
+    Compressor incremental: cada `chunk` devolve os bytes já prontos para envio (com flush),
+    para que um stream comprimido continue chegando aos poucos no cliente.
+    """
+
+    @abstractmethod
+    def chunk(self, data: bytes) -> bytes:
+        ...
+
+    @abstractmethod
+    def finish(self) -> bytes:
+        ...
+
+
+class _GzipStream(StreamCompressor):
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: cabeçalho gzip
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream(StreamCompressor):
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStream(StreamCompressor):
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def _gzip(data: bytes) -> bytes:
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+
+def _zstd(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress(data)
+
+
+_COMPRESS = {'gzip': _gzip}
+if brotli is not None:
+    _COMPRESS['br'] = _brotli
+if zstandard is not None:
+    _COMPRESS['zstd'] = _zstd
+
+# Codificações oferecidas, na ordem de preferência do servidor (desempate entre q iguais)
+AVAILABLE_ENCODINGS: List[str] = [
+    encoding.strip() for encoding in settings.COMPRESSION_ENCODINGS.split(',')
+    if encoding.strip() in _COMPRESS
+]
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    return _COMPRESS[encoding](data)
+
+
+def stream_compressor(encoding: str) -> StreamCompressor:
+    if encoding == 'br':
+        return _BrotliStream(settings.COMPRESSION_BROTLI_QUALITY)
+    if encoding == 'zstd':
+        return _ZstdStream(settings.COMPRESSION_ZSTD_LEVEL)
+    return _GzipStream(settings.COMPRESSION_GZIP_LEVEL)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Escolhe a codificação pelo `Accept-Encoding`: maior q primeiro e, em empate, a ordem de
+    COMPRESSION_ENCODINGS. Devolve None se nenhuma for aceita (resposta sem compressão).
+    """
+    if not accept_encoding or not settings.COMPRESSION_ENABLED:
+        return None
+
+    pesos: Dict[str, float] = {}
+    for item in accept_encoding.split(','):
+        nome, *params = item.split(';')
+        q = 1.0
+        for param in params:
+            chave, _, valor = param.strip().partition('=')
+            if chave.lower() == 'q':
+                try:
+                    q = float(valor)
+                except ValueError:
+                    q = 0.0
+        pesos[nome.strip().lower()] = q
+
+    escolhida, melhor = None, 0.0
+    for encoding in AVAILABLE_ENCODINGS:
+        q = pesos.get(encoding, pesos.get('*', 0.0))
+        if q > melhor:
+            escolhida, melhor = encoding, q
+    return escolhida
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return (
+        bool(content_type)
+        and content_type.startswith(COMPRESSIBLE_TYPES)
+        and not content_type.startswith(UNCOMPRESSIBLE_TYPES)
+    )
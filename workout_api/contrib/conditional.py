@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, List, Optional
+
+from fastapi import Response, status
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSEGUNDO = timedelta(microseconds=1)
+
+
+def weak_etag(valor: str) -> str:
+    return f'W/"{valor}"'
+
+
+def version_etag(updated_at: datetime) -> str:
+    """
+    ETag fraca derivada do `updated_at` da linha (microssegundos desde a epoch, em hexadecimal).
+    """
+    return weak_etag(format((updated_at - _EPOCH) // _MICROSEGUNDO, 'x'))
+
+
+def _opaque(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def _etags(header: str) -> List[str]:
+    return [_opaque(etag) for etag in header.split(',') if etag.strip()]
+
+
+def parse_version_etags(header: str) -> List[datetime]:
+    """
+    Recupera os `updated_at` das ETags de um `If-Match`; valores que não vieram de
+    `version_etag` são ignorados (e, portanto, nunca casam).
+    """
+    versoes = []
+    for etag in _etags(header):
+        try:
+            versoes.append(_EPOCH + int(etag.strip('"'), 16) * _MICROSEGUNDO)
+        except (ValueError, OverflowError):
+            continue
+    return versoes
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Comparação fraca (RFC 9110, 8.8.3.2), usada tanto no `If-None-Match` quanto no `If-Match`:
+    como as ETags da API são todas fracas, a comparação forte nunca casaria.
+    """
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return _opaque(etag) in _etags(header)
+
+
+def http_date(dt: datetime) -> str:
+    # As datas do banco são UTC sem fuso; o cabeçalho HTTP tem precisão de segundos
+    return format_datetime(dt.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def is_not_modified(
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> bool:
+    """
+    Avalia as precondições de um GET. O `If-Modified-Since` só vale sem `If-None-Match`.
+    """
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+
+    if if_modified_since and last_modified:
+        try:
+            desde = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if desde.tzinfo is None:
+            desde = desde.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= desde
+
+    return False
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    headers = {'ETag': etag}
+    if last_modified:
+        headers['Last-Modified'] = http_date(last_modified)
+    return headers
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag, last_modified))
@@ -1,20 +1,210 @@
-from typing import AsyncGenerator
+import asyncio
+import time
+from typing import Any, AsyncGenerator, Dict, MutableMapping, Optional
+from uuid import uuid4
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 # Importa as configurações
 from workout_api.configs.settings import settings
+from workout_api.contrib.instrumentation import instrument_engine
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Pool padrão do asyncio que também mede quanto tempo cada checkout espera por uma conexão.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            espera = time.perf_counter() - inicio
+            self.checkouts += 1
+            self.wait_seconds_total += espera
+            self.wait_seconds_max = max(self.wait_seconds_max, espera)
+
+
+class PoolOccupancy:
+    """
+    Mede por quanto tempo as conexões ficam fora do pool (do checkout ao checkin).
+    Vale para qualquer classe de pool, inclusive o NullPool do sqlite.
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.in_use = 0
+        self.reset()
+        event.listen(engine.sync_engine, 'checkout', self._on_checkout)
+        event.listen(engine.sync_engine, 'checkin', self._on_checkin)
+
+    def reset(self) -> None:
+        self.in_use_max = self.in_use
+        self.checkins = 0
+        self.held_seconds_total = 0.0
+        self.held_seconds_max = 0.0
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        connection_record.info['checkout_at'] = time.perf_counter()
+        self.in_use += 1
+        self.in_use_max = max(self.in_use_max, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        checkout_at = connection_record.info.pop('checkout_at', None)
+        if checkout_at is None:
+            return
+        held = time.perf_counter() - checkout_at
+        self.in_use -= 1
+        self.checkins += 1
+        self.held_seconds_total += held
+        self.held_seconds_max = max(self.held_seconds_max, held)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'in_use': self.in_use,
+            'in_use_max': self.in_use_max,
+            'held_seconds_total': self.held_seconds_total,
+            'held_seconds_mean': self.held_seconds_total / self.checkins if self.checkins else 0.0,
+            'held_seconds_max': self.held_seconds_max,
+        }
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """
+    Parâmetros do `create_async_engine` a partir das configurações de pool.
+    O sqlite (usado nos benchmarks) mantém o pool padrão do SQLAlchemy.
+    """
+    backend = make_url(url).get_backend_name()
+    if backend == 'sqlite':
+        return {}
+
+    options: Dict[str, Any] = {
+        'poolclass': TimedQueuePool,
+        'pool_size': settings.DATABASE_POOL_SIZE,
+        'max_overflow': settings.DATABASE_MAX_OVERFLOW,
+        'pool_timeout': settings.DATABASE_POOL_TIMEOUT,
+        'pool_recycle': settings.DATABASE_POOL_RECYCLE,
+        'pool_pre_ping': settings.DATABASE_POOL_PRE_PING,
+    }
+
+    if backend == 'postgresql':
+        if settings.DATABASE_PGBOUNCER:
+            # Em modo transaction o PgBouncer troca a conexão do servidor a cada transação:
+            # nenhum cache de statement pode sobreviver e os nomes não podem colidir
+            options['connect_args'] = {
+                'statement_cache_size': 0,
+                'prepared_statement_cache_size': 0,
+                'prepared_statement_name_func': lambda: f'__asyncpg_{uuid4()}__',
+            }
+        else:
+            options['connect_args'] = {
+                'prepared_statement_cache_size': settings.DATABASE_STATEMENT_CACHE_SIZE,
+            }
+
+    return options
+
 
 # Usa a variável correta: DATABASE_URL
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+engine = create_async_engine(settings.DATABASE_URL, echo=False, **engine_options(settings.DATABASE_URL))
+instrument_engine(engine.sync_engine)
 
 # Renomeado para 'async_session_maker' para ficar mais claro que é um "fabricante" de sessões
 async_session_maker = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    # Usa o 'async_session_maker' para criar a sessão
+occupancy = PoolOccupancy(engine)
+
+
+def track_session(request: Request, session: AsyncSession) -> None:
+    """
+    Registra a sessão na requisição para que o `SessionReleaseMiddleware` a feche assim
+    que o handler terminar, sem esperar o envio da resposta.
+    """
+    sessions = request.scope.setdefault('state', {}).setdefault('db_sessions', [])
+    sessions.append(session)
+
+
+async def release_sessions(state: MutableMapping[str, Any]) -> None:
+    for session in state.pop('db_sessions', []):
+        await session.close()  # Fechar de novo no fim da dependência não tem efeito
+
+
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    # A AsyncSession só pega uma conexão do pool na primeira consulta:
+    # handlers que não chegam ao banco (cache, validação) não ocupam o pool
     async with async_session_maker() as session:
+        track_session(request, session)
         yield session
+
+
+def dialect_insert(db_session: AsyncSession, table):
+    """
+    INSERT do dialeto em uso, que suporta `on_conflict_do_nothing` (postgres e sqlite).
+    """
+    if db_session.get_bind().dialect.name == 'postgresql':
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+def pool_stats(engine: AsyncEngine = engine, occupancy: Optional[PoolOccupancy] = occupancy) -> Dict[str, Any]:
+    """
+    Situação atual do pool: conexões em uso, ociosas, extras (overflow), tempo de espera no
+    checkout e por quanto tempo cada conexão fica ocupada.
+    """
+    pool = engine.pool
+    stats: Dict[str, Any] = {'pool': pool.status()}
+    if occupancy is not None:
+        stats.update(occupancy.stats())
+
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            'overflow': pool.overflow(),
+        })
+    if isinstance(pool, TimedQueuePool):
+        stats.update({
+            'checkouts': pool.checkouts,
+            'wait_seconds_total': pool.wait_seconds_total,
+            'wait_seconds_max': pool.wait_seconds_max,
+        })
+
+    return stats
+
+
+async def warm_up_pool(engine: AsyncEngine = engine) -> int:
+    """
+    Abre as conexões mínimas do pool antes de a aplicação aceitar requisições, para que as
+    primeiras requisições após um deploy não paguem o custo de conexão.
+    """
+    if not isinstance(engine.pool, QueuePool):
+        return 0
+
+    quantidade = settings.DATABASE_POOL_WARMUP
+    if quantidade is None:
+        quantidade = engine.pool.size()
+
+    async def conectar():
+        conn = engine.connect()
+        await conn.start()
+        return conn
+
+    conexoes = await asyncio.gather(*(conectar() for _ in range(quantidade)))
+    for conn in conexoes:
+        await conn.close()  # Volta para o pool, que mantém até `pool_size` conexões abertas
+
+    return len(conexoes)
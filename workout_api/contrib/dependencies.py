@@ -3,6 +3,10 @@ from fastapi import Depends
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from workout_api.configs.database import get_session
+from workout_api.contrib.database import get_session
+from workout_api.contrib.replicas import get_read_session
 
-DatabaseDependency = Annotated[AsyncSession, Depends(get_session)]
\ No newline at end of file
+DatabaseDependency = Annotated[AsyncSession, Depends(get_session)]
+
+# Para rotas somente leitura: usa uma réplica quando houver (ver contrib/replicas.py)
+ReadOnlyDatabaseDependency = Annotated[AsyncSession, Depends(get_read_session)]
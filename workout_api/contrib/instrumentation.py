@@ -0,0 +1,196 @@
+import json
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from workout_api.configs.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Tamanho máximo do statement mais lento no log (o SQL completo pode ser grande)
+_MAX_STATEMENT_LOG = 500
+
+# Métodos sem escrita: só neles o modo `error` troca a resposta por um 500
+_SEGUROS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+class QueryStats:
+    """
+    Consultas executadas durante uma requisição: quantidade, tempo total no banco,
+    o statement mais lento e quantas vezes o statement mais repetido rodou (indício de N+1).
+    """
+    __slots__ = ('count', 'total', 'slowest', 'slowest_statement', 'statements', 'budget')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Counter = Counter()
+        self.budget: Optional[int] = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.statements[statement] += 1
+        if elapsed > self.slowest:
+            self.slowest = elapsed
+            self.slowest_statement = statement
+
+    @property
+    def most_repeated(self) -> int:
+        return max(self.statements.values(), default=0)
+
+    def violations(self) -> list:
+        # Só rotas com orçamento declarado são verificadas
+        if self.budget is None:
+            return []
+
+        problemas = []
+        if self.count > self.budget:
+            problemas.append(f'{self.count} consultas para um orçamento de {self.budget}')
+        if self.most_repeated >= settings.SQL_REPEATED_STATEMENT_THRESHOLD:
+            problemas.append(f'o mesmo statement rodou {self.most_repeated} vezes (possível N+1)')
+        return problemas
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar('query_stats', default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    inicio = getattr(context, '_query_start', None)
+    if stats is not None and inicio is not None:
+        stats.record(statement, time.perf_counter() - inicio)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Registra os eventos que medem cada consulta. Recebe o `sync_engine` de um `AsyncEngine`.
+    """
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def query_budget(limite: Optional[int]) -> Any:
+    """
+    Dependência que declara o máximo de consultas por requisição das rotas de um router
+    (ver `routers.py`). Só é verificado com SQL_QUERY_BUDGET_MODE em `warn` ou `error`.
+    Declarada também na rota, prevalece sobre a do router; `None` desliga a verificação.
+    """
+    async def declarar_orcamento() -> None:
+        stats = _current.get()
+        if stats is not None:
+            stats.budget = limite
+
+    return Depends(declarar_orcamento)
+
+
+def _server_timing(stats: QueryStats) -> str:
+    return (
+        f'db;dur={stats.total * 1000:.1f};desc="{stats.count} queries", '
+        f'db-slowest;dur={stats.slowest * 1000:.1f}'
+    )
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Mede as consultas de cada requisição (ver `instrument_engine`) e as expõe no header
+    `Server-Timing` e em uma linha de log estruturada (JSON) no logger `workout_api.contrib.instrumentation`.
+
+    Com SQL_QUERY_BUDGET_MODE=`warn`, rotas que passam do orçamento (ou repetem o mesmo statement
+    SQL_REPEATED_STATEMENT_THRESHOLD vezes) geram um aviso; com `error`, a resposta vira um 500.
+    O modo `error` é para desenvolvimento e testes; nas escritas (POST, PATCH, DELETE...), que já
+    foram confirmadas quando a resposta começa, ele também só gera o aviso.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not settings.SQL_INSTRUMENTATION:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+        inicio = time.perf_counter()
+        status_code = 500
+        descartar = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, descartar
+
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                problemas = stats.violations() if settings.SQL_QUERY_BUDGET_MODE != 'off' else []
+
+                # Numa escrita o commit já aconteceu: um 500 faria o cliente repetir uma escrita confirmada
+                if problemas and settings.SQL_QUERY_BUDGET_MODE == 'error' and scope['method'] in _SEGUROS:
+                    descartar = True
+                    body = json.dumps({'detail': f'Orçamento de consultas excedido: {"; ".join(problemas)}'}).encode()
+                    status_code = 500
+                    await send({
+                        'type': 'http.response.start',
+                        'status': status_code,
+                        'headers': [
+                            (b'content-type', b'application/json'),
+                            (b'content-length', str(len(body)).encode()),
+                            (b'server-timing', _server_timing(stats).encode()),
+                        ],
+                    })
+                    await send({'type': 'http.response.body', 'body': body})
+                    return
+
+                if problemas:
+                    logger.warning('Orçamento de consultas excedido em %s %s: %s',
+                                   scope['method'], scope['path'], '; '.join(problemas))
+                MutableHeaders(scope=message).append('Server-Timing', _server_timing(stats))
+
+            elif descartar:
+                return
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            if logger.isEnabledFor(logging.INFO):
+                self._log(scope, stats, status_code, time.perf_counter() - inicio)
+
+    @staticmethod
+    def _log(scope: Scope, stats: QueryStats, status_code: int, duracao: float) -> None:
+        route = scope.get('route')
+        logger.info(json.dumps({
+            'event': 'request',
+            'method': scope['method'],
+            'path': scope['path'],
+            'route': getattr(route, 'path', None),
+            'status': status_code,
+            'duration_ms': round(duracao * 1000, 2),
+            'queries': stats.count,
+            'db_ms': round(stats.total * 1000, 2),
+            'slowest_ms': round(stats.slowest * 1000, 2),
+            'slowest_statement': (stats.slowest_statement or '')[:_MAX_STATEMENT_LOG] or None,
+            'most_repeated': stats.most_repeated,
+            'budget': stats.budget,
+        }, ensure_ascii=False))
@@ -0,0 +1,319 @@
+import asyncio
+import contextlib
+import glob
+import json
+import logging
+import os
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from workout_api.configs.settings import settings
+
+logger = logging.getLogger(__name__)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# O Starlette acrescenta o `charset=utf-8`
+CONTENT_TYPE = 'text/plain; version=0.0.4'
+
+# Limites (em segundos) dos buckets do histograma de latência
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def labels(**valores: object) -> Labels:
+    return tuple(sorted((chave, str(valor)) for chave, valor in valores.items()))
+
+
+class Metrics:
+    """
+    Registro de métricas do processo no formato do Prometheus.
+
+    Sem locks: contadores e histogramas só são alterados de dentro do event loop. Os gauges que
+    refletem estado de outros objetos (pool, caches, fila do bcrypt) são lidos pelos `collectors`
+    apenas no momento da coleta, fora do caminho das requisições.
+    """
+
+    def __init__(self) -> None:
+        self.meta: Dict[str, Tuple[str, str]] = {}
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.gauges: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], List[float]] = {}
+        self.buckets: Dict[str, Tuple[float, ...]] = {}
+        self.maximos: set = set()
+        self.razoes: Dict[str, Tuple[str, str]] = {}
+        self.collectors: List[Callable[['Metrics'], None]] = []
+
+    def counter(self, nome: str, descricao: str) -> None:
+        self.meta[nome] = ('counter', descricao)
+
+    def gauge(self, nome: str, descricao: str, agregacao: str = 'sum') -> None:
+        """
+        `agregacao` define como os valores de vários workers se combinam: `sum` ou `max`.
+        """
+        self.meta[nome] = ('gauge', descricao)
+        if agregacao == 'max':
+            self.maximos.add(nome)
+
+    def ratio(self, nome: str, descricao: str, acertos: str, erros: str) -> None:
+        """
+        Gauge calculado na coleta a partir de dois contadores: acertos / (acertos + erros).
+        Calculado depois de somar os workers, em vez de somar proporções.
+        """
+        self.meta[nome] = ('gauge', descricao)
+        self.razoes[nome] = (acertos, erros)
+
+    def histogram(self, nome: str, descricao: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.meta[nome] = ('histogram', descricao)
+        self.buckets[nome] = buckets
+
+    def inc(self, nome: str, rotulos: Labels = (), valor: float = 1) -> None:
+        chave = (nome, rotulos)
+        self.counters[chave] = self.counters.get(chave, 0) + valor
+
+    def set(self, nome: str, rotulos: Labels, valor: float) -> None:
+        self.gauges[(nome, rotulos)] = valor
+
+    def add(self, nome: str, rotulos: Labels, valor: float) -> None:
+        chave = (nome, rotulos)
+        self.gauges[chave] = self.gauges.get(chave, 0) + valor
+
+    def observe(self, nome: str, rotulos: Labels, valor: float) -> None:
+        chave = (nome, rotulos)
+        buckets = self.buckets[nome]
+        contagens = self.histograms.get(chave)
+        if contagens is None:
+            # Uma posição por bucket, mais +Inf, soma e quantidade
+            contagens = self.histograms[chave] = [0.0] * (len(buckets) + 3)
+        contagens[bisect_left(buckets, valor)] += 1
+        contagens[-2] += valor
+        contagens[-1] += 1
+
+    def collector(self, funcao: Callable[['Metrics'], None]) -> Callable[['Metrics'], None]:
+        self.collectors.append(funcao)
+        return funcao
+
+    def snapshot(self) -> dict:
+        """
+        Estado atual (com os collectors já executados) em um formato serializável em JSON.
+        """
+        for funcao in self.collectors:
+            try:
+                funcao(self)
+            except Exception:  # Um collector com problema não derruba a coleta inteira
+                logger.exception('Falha no collector de métricas %s', getattr(funcao, '__name__', funcao))
+
+        def itens(dados: dict) -> list:
+            return [[nome, [list(par) for par in rotulos], valor] for (nome, rotulos), valor in dados.items()]
+
+        return {
+            'pid': os.getpid(),
+            'counters': itens(self.counters),
+            'gauges': itens(self.gauges),
+            'histograms': itens(self.histograms),
+        }
+
+
+def merge_snapshots(snapshots: Iterable[dict], vivos: Optional[set] = None, maximos: Iterable[str] = ()) -> dict:
+    """
+    Soma os snapshots de vários processos. Contadores e histogramas somam inclusive os de
+    workers que já terminaram (um contador não pode diminuir); gauges só os de processos vivos,
+    somados ou, para os nomes em `maximos`, pelo maior valor.
+    """
+    total: Dict[str, dict] = {'counters': {}, 'gauges': {}, 'histograms': {}}
+    for snapshot in snapshots:
+        for tipo in ('counters', 'gauges', 'histograms'):
+            if tipo == 'gauges' and vivos is not None and snapshot['pid'] not in vivos:
+                continue
+            destino = total[tipo]
+            for nome, rotulos, valor in snapshot[tipo]:
+                chave = (nome, tuple(tuple(par) for par in rotulos))
+                if tipo == 'histograms':
+                    atual = destino.get(chave)
+                    destino[chave] = [a + b for a, b in zip(atual, valor)] if atual else list(valor)
+                elif nome in maximos and chave in destino:
+                    destino[chave] = max(destino[chave], valor)
+                else:
+                    destino[chave] = destino.get(chave, 0) + valor
+    return total
+
+
+def _escape(valor: str) -> str:
+    return valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _rotulos(rotulos: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pares = rotulos + extra
+    if not pares:
+        return ''
+    return '{' + ','.join(f'{chave}="{_escape(valor)}"' for chave, valor in pares) + '}'
+
+
+def _numero(valor: float) -> str:
+    return repr(float(valor)) if valor != int(valor) else f'{int(valor)}'
+
+
+def render(metrics: Metrics, dados: dict) -> str:
+    """
+    Gera o texto no formato de exposição do Prometheus (0.0.4).
+    """
+    gauges = dict(dados['gauges'])
+    for nome, (acertos, erros) in metrics.razoes.items():
+        for (contador, rotulos), valor in dados['counters'].items():
+            if contador == acertos:
+                total = valor + dados['counters'].get((erros, rotulos), 0)
+                gauges[(nome, rotulos)] = valor / total if total else 0.0
+    dados = {**dados, 'gauges': gauges}
+
+    por_nome: Dict[str, list] = {}
+    for tipo in ('counters', 'gauges', 'histograms'):
+        for (nome, rotulos), valor in dados[tipo].items():
+            por_nome.setdefault(nome, []).append((rotulos, valor))
+
+    linhas = []
+    for nome in sorted(por_nome):
+        tipo, descricao = metrics.meta.get(nome, ('untyped', ''))
+        linhas.append(f'# HELP {nome} {descricao}')
+        linhas.append(f'# TYPE {nome} {tipo}')
+        for rotulos, valor in sorted(por_nome[nome]):
+            if tipo != 'histogram':
+                linhas.append(f'{nome}{_rotulos(rotulos)} {_numero(valor)}')
+                continue
+
+            acumulado = 0.0
+            limites = [_numero(limite) for limite in metrics.buckets[nome]] + ['+Inf']
+            for limite, contagem in zip(limites, valor[:-2]):
+                acumulado += contagem
+                linhas.append(f'{nome}_bucket{_rotulos(rotulos, (("le", limite),))} {_numero(acumulado)}')
+            linhas.append(f'{nome}_sum{_rotulos(rotulos)} {_numero(valor[-2])}')
+            linhas.append(f'{nome}_count{_rotulos(rotulos)} {_numero(valor[-1])}')
+
+    return '\n'.join(linhas) + '\n'
+
+
+class MultiprocessWriter:
+    """
+    Modo multiprocesso (vários workers do uvicorn): cada worker grava seu snapshot em
+    METRICS_MULTIPROC_DIR a cada METRICS_FLUSH_SECONDS (e ao encerrar), com escrita atômica.
+    O worker que atende o `/metrics` soma os arquivos dos outros ao próprio estado atual.
+    Como no modo multiprocesso do prometheus_client, o diretório deve ser esvaziado a cada deploy.
+    """
+
+    def __init__(self, metrics: Metrics, diretorio: str, intervalo: float) -> None:
+        self.metrics = metrics
+        self.diretorio = diretorio
+        self.intervalo = intervalo
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def arquivo(self) -> str:
+        return os.path.join(self.diretorio, f'metrics_{os.getpid()}.json')
+
+    def flush(self) -> None:
+        os.makedirs(self.diretorio, exist_ok=True)
+        temporario = f'{self.arquivo}.tmp'
+        with open(temporario, 'w') as arquivo:
+            json.dump(self.metrics.snapshot(), arquivo)
+        os.replace(temporario, self.arquivo)
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.intervalo)
+            try:
+                self.flush()
+            except OSError as exc:
+                logger.warning('Não foi possível gravar as métricas em %s: %s', self.diretorio, exc)
+
+    async def start(self) -> None:
+        self.flush()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self.flush()
+
+    def collect(self) -> dict:
+        proprio = self.metrics.snapshot()
+        snapshots = [proprio]
+        vivos = {proprio['pid']}
+        for caminho in glob.glob(os.path.join(self.diretorio, 'metrics_*.json')):
+            try:
+                with open(caminho) as arquivo:
+                    snapshot = json.load(arquivo)
+            except (OSError, ValueError):
+                continue
+            if snapshot['pid'] == proprio['pid']:
+                continue
+            snapshots.append(snapshot)
+            if _processo_vivo(snapshot['pid']):
+                vivos.add(snapshot['pid'])
+        return merge_snapshots(snapshots, vivos, self.metrics.maximos)
+
+
+def _processo_vivo(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+metrics = Metrics()
+metrics.counter('workout_http_requests_total', 'Requisições HTTP atendidas')
+metrics.histogram('workout_http_request_duration_seconds', 'Latência das requisições HTTP por rota')
+metrics.gauge('workout_http_requests_in_flight', 'Requisições HTTP em andamento')
+
+multiprocess: Optional[MultiprocessWriter] = (
+    MultiprocessWriter(metrics, settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_SECONDS)
+    if settings.METRICS_MULTIPROC_DIR else None
+)
+
+
+def collect() -> str:
+    dados = multiprocess.collect() if multiprocess else merge_snapshots([metrics.snapshot()], maximos=metrics.maximos)
+    return render(metrics, dados)
+
+
+class MetricsMiddleware:
+    """
+    Conta as requisições e mede a latência por rota (o template do path, como `/atletas/{id}`,
+    para não explodir a cardinalidade). Rotas inexistentes são agrupadas em `unmatched`.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        status_code = 500
+        metrics.add('workout_http_requests_in_flight', (), 1)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.add('workout_http_requests_in_flight', (), -1)
+            route = scope.get('route')
+            rota = getattr(route, 'path', 'unmatched')
+            metrics.inc('workout_http_requests_total', labels(method=scope['method'], route=rota, status=status_code))
+            metrics.observe(
+                'workout_http_request_duration_seconds',
+                labels(method=scope['method'], route=rota),
+                time.perf_counter() - inicio,
+            )
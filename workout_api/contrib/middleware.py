@@ -0,0 +1,145 @@
+import time
+
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from workout_api.configs.settings import settings
+from workout_api.contrib.compression import (StreamCompressor, compress, is_compressible,
+                                             negotiate_encoding, stream_compressor)
+from workout_api.contrib.database import release_sessions
+from workout_api.contrib.replicas import READ_YOUR_WRITES_COOKIE
+
+WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+
+class ReadYourWritesMiddleware:
+    """
+    Depois de uma escrita bem-sucedida, marca o cliente com um cookie para que as leituras
+    seguintes, por READ_YOUR_WRITES_SECONDS, usem o primário em vez de uma réplica atrasada.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or scope['method'] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if (
+                message['type'] == 'http.response.start' and message['status'] < 400
+                and not scope.get('state', {}).get('read_only')
+            ):
+                until = time.time() + settings.READ_YOUR_WRITES_SECONDS
+                MutableHeaders(scope=message).append(
+                    'set-cookie',
+                    f'{READ_YOUR_WRITES_COOKIE}={until:.3f}; Max-Age={int(settings.READ_YOUR_WRITES_SECONDS)}; '
+                    'Path=/; HttpOnly; SameSite=Lax'
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class SessionReleaseMiddleware:
+    """
+    Fecha as sessões de banco da requisição (ver `track_session`) quando o handler termina,
+    no início da resposta, devolvendo a conexão ao pool antes do corpo ir para o cliente.
+    Handlers com StreamingResponse que leem do banco durante o stream devem abrir a própria sessão.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not settings.DATABASE_EARLY_RELEASE:
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault('state', {})
+
+        async def send_wrapper(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                await release_sessions(state)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class CompressionMiddleware:
+    """
+    Comprime as respostas de texto conforme o `Accept-Encoding` (ver `negotiate_encoding`).
+    Corpos menores que COMPRESSION_MIN_SIZE saem como estão; respostas que já trazem
+    Content-Encoding (export com `gzip=true`, dados de referência pré-comprimidos) não são tocadas.
+    Respostas em stream são comprimidas pedaço a pedaço, sem acumular o corpo.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get('accept-encoding'))
+        start: Optional[Message] = None
+        compressor: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+
+            if message['type'] == 'http.response.start':
+                headers = Headers(raw=message['headers'])
+                if (
+                    message['status'] < 200 or message['status'] in (204, 304)
+                    or 'content-encoding' in headers
+                    or not is_compressible(headers.get('content-type'))
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Segura o início da resposta até ver o primeiro pedaço do corpo
+                    start = message
+                return
+
+            if message['type'] != 'http.response.body' or passthrough:
+                await send(message)
+                return
+
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+
+            if start is not None:
+                headers = MutableHeaders(scope=start)
+                headers.add_vary_header('Accept-Encoding')
+
+                if encoding is None or (not more_body and len(body) < settings.COMPRESSION_MIN_SIZE):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                headers['Content-Encoding'] = encoding
+                if not more_body:
+                    body = compress(body, encoding)
+                    headers['Content-Length'] = str(len(body))
+                    await send(start)
+                    await send({'type': 'http.response.body', 'body': body})
+                    return
+
+                del headers['Content-Length']
+                compressor = stream_compressor(encoding)
+                await send(start)
+                start = None
+
+            data = compressor.chunk(body) if body else b''
+            if not more_body:
+                data += compressor.finish()
+            await send({'type': 'http.response.body', 'body': data, 'more_body': more_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,8 +1,27 @@
 from uuid import uuid4
-from sqlalchemy import UUID
+from sqlalchemy import UUID, Integer, String, Uuid
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 
 
-class BaseModel(DeclarativeBase):
-    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), default=uuid4, nullable=False)
\ No newline at end of file
+class Base(DeclarativeBase):
+    # Metadata comum a todas as tabelas; as tabelas internas, sem identificador público, herdam daqui
+    pass
+
+
+class BaseModel(Base):
+    __abstract__ = True
+
+    # `Uuid` vira UUID nativo no postgres e CHAR(32) nos demais bancos (ex.: sqlite nos benchmarks)
+    # As rotas públicas buscam sempre pelo `id`, por isso o índice único (ix_<tabela>_id)
+    id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), default=uuid4, nullable=False, unique=True, index=True)
+
+
+class TableVersionModel(Base):
+    """
+    Contador de versão por tabela, incrementado na mesma transação de cada escrita.
+    Os caches em memória de cada worker comparam esse valor para saber se estão desatualizados.
+    """
+    __tablename__ = 'table_versions'
+
+    tabela: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1,129 @@
+import base64
+import json
+from datetime import datetime
+from typing import Annotated, Generic, Hashable, Literal, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException, status
+from fastapi_pagination import Page
+from pydantic import Field
+from sqlalchemy import Select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from workout_api.configs.settings import settings
+from workout_api.contrib.cache import TTLCache
+from workout_api.contrib.schemas import BaseSchema
+
+T = TypeVar('T')
+
+TotalStrategy = Literal['exact', 'estimated', 'cached', 'none']
+
+TOTAL_DESCRIPTION = (
+    'Como calcular o `total` da página: `exact` (contagem), `estimated` (estimativa do banco, '
+    'bem mais barata em tabelas grandes), `cached` (contagem reaproveitada por alguns segundos) '
+    'ou `none` (sem total). Sem o parâmetro, vale PAGINATION_TOTAL_STRATEGY.'
+)
+
+
+class CursorPage(BaseSchema, Generic[T]):
+    """
+    Página de resultados paginada por cursor (keyset).
+    O `next_cursor` é opaco para o cliente e deve ser reenviado como está.
+    """
+    items: Sequence[T]
+    size: Annotated[int, Field(description='Quantidade máxima de itens por página')]
+    next_cursor: Annotated[Optional[str], Field(None, description='Cursor da próxima página (nulo na última)')]
+
+
+class OptionalTotalPage(Page[T], Generic[T]):
+    """
+    `Page` cujo `total` (e `pages`) é nulo quando a listagem é pedida sem contagem (`total=none`).
+    """
+    total: Annotated[Optional[int], Field(None, ge=0)]
+
+
+def encode_cursor(created_at: datetime, pk_id: int) -> str:
+    """
+    Codifica a chave de ordenação `(created_at, pk_id)` em um cursor opaco.
+    """
+    raw = json.dumps([created_at.isoformat(), pk_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodifica um cursor gerado por `encode_cursor`.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, pk_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(pk_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Cursor inválido: {cursor}'
+        )
+
+
+async def _contar(db_session: AsyncSession, query: Select) -> int:
+    return (await db_session.execute(query.with_only_columns(func.count(), maintain_column_froms=True))).scalar_one()
+
+
+async def _estimar(db_session: AsyncSession, query: Select) -> int:
+    """
+    Estimativa do planejador do postgres: `reltuples` da tabela sem filtros; com filtros,
+    as linhas previstas pelo EXPLAIN da consulta (nenhuma linha é lida).
+    """
+    if query.whereclause is None:
+        (tabela,) = query.get_final_froms()
+        estimativa = (await db_session.execute(
+            text('SELECT reltuples FROM pg_class WHERE oid = CAST(CAST(:tabela AS text) AS regclass)'),
+            {'tabela': tabela.name}
+        )).scalar()
+        return max(int(estimativa or 0), 0)
+
+    # O EXPLAIN não aceita parâmetros: os valores dos filtros vão escapados no SQL, enviado direto
+    # ao driver (com `text()`, um `:x` dentro de um valor seria lido como parâmetro)
+    sql = query.compile(dialect=db_session.get_bind().dialect, compile_kwargs={'literal_binds': True})
+    conn = await db_session.connection()
+    plano = (await conn.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {sql}')).scalar()
+    if isinstance(plano, str):
+        plano = json.loads(plano)
+    return int(plano[0]['Plan']['Plan Rows'])
+
+
+async def count_total(
+    db_session: AsyncSession,
+    query: Select,
+    estrategia: Optional[TotalStrategy] = None,
+    cache: Optional[TTLCache] = None,
+    chave: Hashable = None,
+) -> Optional[int]:
+    """
+    Total de linhas de `query` (o SELECT sem paginação) pela estratégia pedida ou PAGINATION_TOTAL_STRATEGY.
+    Estimativas abaixo de PAGINATION_ESTIMATE_EXACT_BELOW são contadas de verdade: nesse tamanho o
+    COUNT é barato e a estimativa pode estar bem longe (tabela recém-carregada, sem ANALYZE).
+
+    Com `cached`, um total contado enquanto uma escrita descartava o cache não é gravado.
+    """
+    estrategia = estrategia or settings.PAGINATION_TOTAL_STRATEGY
+
+    if estrategia == 'none':
+        return None
+
+    if estrategia == 'cached' and cache is not None:
+        total = cache.get(chave)
+        if total is None:
+            geracao = cache.generation
+            total = await _contar(db_session, query)
+            # Numa réplica, a contagem logo depois de uma escrita pode não incluí-la: vale só para esta resposta
+            replica = getattr(db_session, 'replica', None) is not None
+            if not (replica and cache.cleared_within(settings.DATABASE_REPLICA_MAX_LAG_SECONDS)):
+                cache.set(chave, total, generation=geracao)
+        return total
+
+    if estrategia == 'estimated' and db_session.get_bind().dialect.name == 'postgresql':
+        estimativa = await _estimar(db_session, query)
+        if estimativa >= settings.PAGINATION_ESTIMATE_EXACT_BELOW:
+            return estimativa
+
+    return await _contar(db_session, query)
@@ -0,0 +1,147 @@
+import time
+from typing import Dict, List, Optional, Type
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from workout_api.configs.settings import settings
+from workout_api.contrib.compression import compress, negotiate_encoding
+from workout_api.contrib.conditional import etag_matches, not_modified, weak_etag
+from workout_api.contrib.database import dialect_insert
+from workout_api.contrib.models import BaseModel, TableVersionModel
+from workout_api.contrib.schemas import BaseSchema
+
+
+async def get_table_version(db_session: AsyncSession, tabela: str) -> int:
+    version: Optional[int] = (await db_session.execute(
+        select(TableVersionModel.version).filter_by(tabela=tabela)
+    )).scalar()
+    return version or 0
+
+
+async def bump_table_version(db_session: AsyncSession, tabela: str) -> None:
+    """
+    Incrementa a versão da tabela (criando a linha na primeira escrita) com um único UPSERT:
+    duas transações na primeira escrita não disputam o INSERT. Deve rodar na mesma transação
+    da escrita, antes do commit.
+    """
+    versoes = TableVersionModel.__table__
+    stmt = dialect_insert(db_session, versoes).values(tabela=tabela, version=1)
+    await db_session.execute(stmt.on_conflict_do_update(
+        index_elements=[versoes.c.tabela], set_={'version': versoes.c.version + 1}
+    ))
+
+
+class ReferenceCache:
+    """
+    Cópia em memória de uma tabela de referência pequena (categorias, centros de treinamento):
+    mapas nome <-> pk_id e a resposta da listagem já serializada em JSON.
+
+    Cada worker confere a linha de `table_versions` no máximo a cada
+    REFERENCE_CACHE_POLL_SECONDS, o que limita o tempo em que um worker fica desatualizado.
+    A versão em cache só avança: uma réplica atrasada não faz o cache voltar atrás.
+    As versões comprimidas da listagem são geradas uma vez por versão da tabela.
+    """
+
+    def __init__(self, tabela: str, model: Type[BaseModel], schema_out: Type[BaseSchema]) -> None:
+        self.tabela = tabela
+        self.model = model
+        self.version: Optional[int] = None
+        self.pk_by_nome: Dict[str, int] = {}
+        self.nome_by_pk: Dict[int, str] = {}
+        self.body: bytes = b'[]'
+        self._encoded: Dict[str, bytes] = {}
+        self._adapter = TypeAdapter(List[schema_out])
+        self._checked_at = float('-inf')
+        # Acessos atendidos sem ir ao banco (hits) e com conferência de versão ou recarga (misses)
+        self.hits = 0
+        self.misses = 0
+
+    async def load(self, db_session: AsyncSession, version: Optional[int] = None) -> None:
+        # A versão é lida antes das linhas: se uma escrita acontecer no meio, a próxima conferência recarrega
+        if version is None:
+            version = await get_table_version(db_session, self.tabela)
+        rows = (await db_session.execute(select(self.model))).scalars().all()
+
+        self.pk_by_nome = {row.nome: row.pk_id for row in rows}
+        self.nome_by_pk = {row.pk_id: row.nome for row in rows}
+        self.body = self._adapter.dump_json(self._adapter.validate_python(rows, from_attributes=True))
+        self._encoded = {}
+        self.version = version
+        self._checked_at = time.monotonic()
+
+    async def ensure_fresh(self, db_session: AsyncSession, force: bool = False) -> None:
+        if not force and time.monotonic() - self._checked_at < settings.REFERENCE_CACHE_POLL_SECONDS:
+            self.hits += 1
+            return
+
+        self.misses += 1
+        version = await get_table_version(db_session, self.tabela)
+        # Nas rotas de leitura a sessão pode ser de uma réplica atrasada: uma versão mais antiga
+        # que a do cache não é motivo para recarregar (voltaria a dados já substituídos)
+        if self.version is None or version > self.version:
+            await self.load(db_session, version)
+        else:
+            self._checked_at = time.monotonic()
+
+    @property
+    def etag(self) -> str:
+        """
+        ETag da listagem, derivada da versão da tabela: muda a cada escrita, sem precisar do corpo.
+        """
+        return weak_etag(f'{self.tabela}-{self.version}')
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            'size': len(self.pk_by_nome),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+        }
+
+    def encoded(self, encoding: str) -> bytes:
+        if encoding not in self._encoded:
+            self._encoded[encoding] = compress(self.body, encoding)
+        return self._encoded[encoding]
+
+    def response(self, if_none_match: Optional[str], accept_encoding: Optional[str]) -> Response:
+        """
+        Resposta da listagem a partir do cache: 304 se a ETag do cliente ainda é a atual, senão o
+        corpo já serializado, comprimido de antemão quando o cliente aceita.
+        """
+        if etag_matches(if_none_match, self.etag):
+            return not_modified(self.etag)
+
+        headers = {'ETag': self.etag, 'Vary': 'Accept-Encoding'}
+        body = self.body
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding and len(body) >= settings.COMPRESSION_MIN_SIZE:
+            body = self.encoded(encoding)
+            headers['Content-Encoding'] = encoding
+
+        return Response(content=body, media_type='application/json', headers=headers)
+
+    def invalidate(self) -> None:
+        """
+        Força a conferência da versão no próximo acesso deste worker.
+        """
+        self._checked_at = float('-inf')
+
+    async def get_pk(self, db_session: AsyncSession, nome: str) -> Optional[int]:
+        """
+        Resolve o pk_id pelo nome. Um nome desconhecido força uma conferência da versão,
+        para enxergar na hora um registro recém-criado por outro worker.
+        """
+        await self.ensure_fresh(db_session)
+        if nome not in self.pk_by_nome:
+            await self.ensure_fresh(db_session, force=True)
+        return self.pk_by_nome.get(nome)
+
+    async def get_nome(self, db_session: AsyncSession, pk_id: int) -> Optional[str]:
+        await self.ensure_fresh(db_session)
+        if pk_id not in self.nome_by_pk:
+            await self.ensure_fresh(db_session, force=True)
+        return self.nome_by_pk.get(pk_id)
@@ -0,0 +1,184 @@
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, AsyncGenerator, Awaitable, Callable, List, Optional, TypeVar
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from workout_api.configs.settings import settings
+from workout_api.contrib.database import PoolOccupancy, async_session_maker, engine, engine_options, track_session
+from workout_api.contrib.instrumentation import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Cookie com o instante (epoch) até quando o cliente deve ler do primário
+READ_YOUR_WRITES_COOKIE = 'workout_primary_until'
+
+# Atraso de replicação em segundos; zero quando a réplica já aplicou tudo o que recebeu
+_LAG_QUERY = text(
+    'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END'
+)
+
+
+def is_connection_error(exc: Exception) -> bool:
+    # Conexão recusada ou perdida (não um erro da consulta em si)
+    return isinstance(exc, OSError) or (isinstance(exc, DBAPIError) and exc.connection_invalidated)
+
+
+class ReplicaSession(AsyncSession):
+    """
+    Sessão de leitura numa réplica. Se a conexão com a réplica é recusada ou cai, tira a réplica
+    de rotação e repete a consulta uma vez no primário; o resto da requisição segue no primário.
+    """
+
+    def __init__(self, *args, replica: Optional['Replica'] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    async def _ler(self, consulta: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        try:
+            return await consulta(*args, **kwargs)
+        except (DBAPIError, OSError) as exc:
+            if self.replica is None or not is_connection_error(exc):
+                raise
+            self.replica.mark_failed(exc)
+            self.replica = None
+
+        await self.rollback()
+        self.bind = engine
+        self.sync_session.bind = engine.sync_engine
+        return await consulta(*args, **kwargs)
+
+    async def execute(self, *args, **kwargs) -> Any:
+        return await self._ler(super().execute, *args, **kwargs)
+
+    async def scalar(self, *args, **kwargs) -> Any:
+        return await self._ler(super().scalar, *args, **kwargs)
+
+    async def scalars(self, *args, **kwargs) -> Any:
+        return await self._ler(super().scalars, *args, **kwargs)
+
+    async def get(self, *args, **kwargs) -> Any:
+        return await self._ler(super().get, *args, **kwargs)
+
+    async def stream(self, *args, **kwargs) -> Any:
+        return await self._ler(super().stream, *args, **kwargs)
+
+
+class Replica:
+    def __init__(self, url: str) -> None:
+        self.engine: AsyncEngine = create_async_engine(url, echo=False, **engine_options(url))
+        instrument_engine(self.engine.sync_engine)
+        self.session_maker = sessionmaker(self.engine, class_=ReplicaSession, expire_on_commit=False, replica=self)
+        self.occupancy = PoolOccupancy(self.engine)
+        self.healthy = True
+        self.lag: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    async def check(self) -> None:
+        try:
+            async with self.engine.connect() as conn:
+                if self.engine.dialect.name == 'postgresql':
+                    self.lag = float((await conn.execute(_LAG_QUERY)).scalar() or 0)
+                else:
+                    await conn.execute(text('SELECT 1'))
+                    self.lag = 0.0
+        except (DBAPIError, OSError) as exc:
+            self.mark_failed(exc)
+            return
+
+        healthy = self.lag <= settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+        if healthy != self.healthy:
+            logger.warning('Réplica %s %s (atraso: %.1fs)', self.name, 'voltou' if healthy else 'atrasada', self.lag)
+        self.healthy = healthy
+
+    def mark_failed(self, exc: Exception) -> None:
+        if self.healthy:
+            logger.warning('Réplica %s fora do ar: %s', self.name, exc)
+        self.healthy = False
+
+
+class ReplicaRouter:
+    """
+    Distribui as leituras entre as réplicas saudáveis (round-robin). Sem nenhuma disponível,
+    as leituras vão para o primário. A saúde e o atraso são conferidos em segundo plano.
+    """
+
+    def __init__(self, urls: List[str]) -> None:
+        self.replicas = [Replica(url) for url in urls]
+        self._next = itertools.count()
+        self._monitor: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(replica.check() for replica in self.replicas))
+
+    async def _monitor_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.DATABASE_REPLICA_CHECK_SECONDS)
+            try:
+                await self.check_all()
+            except Exception:  # Uma verificação com problema não encerra o monitoramento
+                logger.exception('Falha ao verificar as réplicas')
+
+    async def start(self) -> None:
+        if self.replicas:
+            await self.check_all()
+            self._monitor = asyncio.create_task(self._monitor_loop())
+
+    async def stop(self) -> None:
+        if self._monitor:
+            self._monitor.cancel()
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+replica_router = ReplicaRouter([url.strip() for url in settings.DATABASE_REPLICA_URLS.split(',') if url.strip()])
+
+
+def wrote_recently(request: Request) -> bool:
+    try:
+        return time.time() < float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0))
+    except ValueError:
+        return False
+
+
+def choose_replica(request: Request) -> Optional[Replica]:
+    """
+    Réplica para as leituras desta requisição, ou None para usar o primário
+    (sem réplicas saudáveis, ou o cliente acabou de escrever).
+    """
+    if wrote_recently(request):
+        return None
+    return replica_router.choose()
+
+
+def read_session_maker(request: Request) -> sessionmaker:
+    replica = choose_replica(request)
+    return replica.session_maker if replica else async_session_maker
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    # Leituras via POST (ex.: /atletas/batch-get) não marcam o cliente como autor de escrita
+    request.state.read_only = True
+
+    # Numa réplica, uma falha de conexão é repetida no primário (ver `ReplicaSession`)
+    async with read_session_maker(request)() as session:
+        track_session(request, session)
+        yield session
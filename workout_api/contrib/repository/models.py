@@ -1,3 +1,5 @@
 from workout_api.categorias.models import CategoriaModel
-from workout_api.atleta.models import AtletaModel
+from workout_api.atleta.models import AtletaChangeModel, AtletaModel, AtletaResumoModel
 from workout_api.centro_treinamento.models import CentroTreinamentoModel
+from workout_api.contrib.models import TableVersionModel
+from workout_api.jobs.models import JobModel
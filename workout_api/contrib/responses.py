@@ -0,0 +1,94 @@
+import json
+from datetime import datetime
+from functools import lru_cache
+from math import ceil
+from typing import Any, Iterable, Optional, Sequence, Type
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi_pagination import Params
+from pydantic import TypeAdapter
+
+from workout_api.configs.settings import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson é opcional; sem ele cai no json da stdlib
+    orjson = None
+
+
+def _json_default(value: Any) -> str:
+    # Mesmo formato de datas da API (ISO 8601); UUIDs e demais tipos como texto
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serializa dicts, listas e tipos simples (inclusive UUID e datetime) direto para bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_json_default)
+    return json.dumps(content, default=_json_default, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    `JSONResponse` que serializa com orjson quando disponível. É a classe de resposta padrão
+    da aplicação com FAST_RESPONSES ligado.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _adapter(model: Type) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def trusted_response(
+    content: Any,
+    model: Type,
+    response: Optional[Response] = None,
+    status_code: int = 200,
+) -> Any:
+    """
+    Devolve `content`, que o handler já montou como `model` (validado ou construído a partir do
+    banco), sem a nova validação do `response_model`: com FAST_RESPONSES, serializa uma única vez
+    pelo `TypeAdapter` e responde os bytes. Desligado, devolve o objeto e o FastAPI segue o caminho padrão.
+
+    Os cabeçalhos definidos no `response` injetado pelo FastAPI são repassados.
+    """
+    if not settings.FAST_RESPONSES:
+        return content
+
+    return Response(
+        content=_adapter(model).dump_json(content),
+        status_code=status_code,
+        headers=dict(response.headers) if response is not None else None,
+        media_type='application/json',
+    )
+
+
+def rows_to_dicts(rows: Iterable[Sequence[Any]], campos: Sequence[str]) -> list:
+    """
+    Converte linhas do banco em dicts com as primeiras colunas nomeadas por `campos`
+    (colunas excedentes, como chaves de ordenação, são descartadas).
+    """
+    return [dict(zip(campos, row)) for row in rows]
+
+
+def page_response(items: list, total: Optional[int], params: Params) -> Response:
+    """
+    Serializa uma página no mesmo formato do `Page` do fastapi-pagination, sem instanciá-lo.
+    """
+    return Response(
+        content=dumps({
+            'items': items,
+            'total': total,
+            'page': params.page,
+            'size': params.size,
+            'pages': ceil(total / params.size) if total is not None else None,
+        }),
+        media_type='application/json',
+    )
@@ -0,0 +1,144 @@
+import codecs
+import json
+import zlib
+from typing import Any, AsyncIterator, Iterator
+
+from fastapi import Request
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\r\n'
+
+
+class InvalidBody(ValueError):
+    """
+    O corpo deixou de ser legível (array malformado, registro grande demais, UTF-8 inválido).
+    Os registros anteriores já foram entregues; a leitura não continua.
+    """
+
+
+class InvalidRecord:
+    """
+    Registro que não é um JSON válido (uma linha do NDJSON): entregue no lugar do registro,
+    para ser reportado, e a leitura segue na próxima linha.
+    """
+
+    def __init__(self, detail: str) -> None:
+        self.detail = detail
+
+
+def _ndjson_record(linha: str) -> Any:
+    try:
+        return json.loads(linha)
+    except json.JSONDecodeError as exc:
+        return InvalidRecord(f'JSON inválido: {exc}')
+
+
+async def _iter_ndjson(chunks: AsyncIterator[str], max_item_size: int) -> AsyncIterator[Any]:
+    buffer = ''
+    async for chunk in chunks:
+        buffer += chunk
+        *linhas, buffer = buffer.split('\n')
+        for linha in linhas:
+            if linha.strip():
+                yield _ndjson_record(linha)
+        if len(buffer) > max_item_size:
+            raise InvalidBody(f'Registro maior que {max_item_size} bytes')
+
+    if buffer.strip():
+        yield _ndjson_record(buffer)
+
+
+async def _iter_json_array(chunks: AsyncIterator[str], max_item_size: int) -> AsyncIterator[Any]:
+    buffer = ''
+    # Próximo token: '[' no início; depois dele, um item ou ']'; depois de cada item, ',' ou ']';
+    # depois de cada ',', um item. Depois do ']' final, só espaços
+    esperado = '['
+
+    def consumir(final: bool) -> Iterator[Any]:
+        nonlocal buffer, esperado
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+
+            char = buffer[pos]
+            if esperado == 'fim':
+                raise InvalidBody('Conteúdo depois do fim do array JSON')
+            if esperado == '[':
+                if char != '[':
+                    raise InvalidBody('O corpo deve ser um array JSON')
+                esperado, pos = 'item_ou_fim', pos + 1
+            elif char == ']' and esperado in ('item_ou_fim', 'separador'):
+                esperado, pos = 'fim', pos + 1
+            elif esperado == 'separador':
+                if char != ',':
+                    raise InvalidBody("Os registros do array JSON devem ser separados por ','")
+                esperado, pos = 'item', pos + 1
+            else:
+                try:
+                    item, fim = _decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as exc:
+                    if final:
+                        raise InvalidBody(f'JSON inválido: {exc}')
+                    # Item incompleto: espera o próximo pedaço do corpo
+                    break
+                if fim == len(buffer) and not final and isinstance(item, (int, float)):
+                    # Número no fim do pedaço: pode continuar no próximo
+                    break
+                esperado, pos = 'separador', fim
+                yield item
+
+        buffer = buffer[pos:]
+
+    async for chunk in chunks:
+        buffer += chunk
+        for item in consumir(final=False):
+            yield item
+        if len(buffer) > max_item_size:
+            raise InvalidBody(f'Registro maior que {max_item_size} bytes')
+
+    for item in consumir(final=True):
+        yield item
+    if esperado != 'fim':
+        raise InvalidBody('Array JSON incompleto')
+
+
+async def iter_json_records(request: Request, max_item_size: int) -> AsyncIterator[Any]:
+    """
+    Lê o corpo da requisição aos poucos e devolve um registro por vez, seja um array JSON
+    ou NDJSON (um objeto por linha). Só um registro por vez fica em memória, não o corpo inteiro.
+
+    Uma linha inválida do NDJSON vira um `InvalidRecord` e a leitura continua; um erro que impede
+    continuar (array malformado, por exemplo) levanta `InvalidBody` depois dos registros já lidos.
+    """
+    async def chunks() -> AsyncIterator[str]:
+        # O decoder incremental evita cortar caracteres UTF-8 no meio entre dois pedaços
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        async for chunk in request.stream():
+            yield decoder.decode(chunk)
+        yield decoder.decode(b'', final=True)
+
+    content_type = request.headers.get('content-type', '').split(';')[0].strip()
+    parser = _iter_ndjson if content_type == NDJSON_MEDIA_TYPE else _iter_json_array
+
+    try:
+        async for item in parser(chunks(), max_item_size):
+            yield item
+    except UnicodeDecodeError as exc:
+        raise InvalidBody(f'Corpo inválido: {exc}')
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes], level: int) -> AsyncIterator[bytes]:
+    """
+    Comprime um stream de bytes em gzip sem acumular o conteúdo.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: cabeçalho gzip
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
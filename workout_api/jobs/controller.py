@@ -0,0 +1,79 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Depends, Query, status
+from fastapi_pagination import Page, Params
+from pydantic import UUID4
+
+from workout_api.auth.dependencies import get_current_user
+from workout_api.auth.schemas import Principal
+from workout_api.contrib.dependencies import DatabaseDependency
+from workout_api.jobs.pool import job_pool
+from workout_api.jobs.registry import JOB_TYPES
+from workout_api.jobs.schemas import JobIn, JobOut, JobStatus, JobTipoOut
+from workout_api.jobs.service import JobService
+
+router = APIRouter(tags=['jobs'])
+
+
+@router.post(
+    '/',
+    summary='Enfileirar um job',
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=JobOut,
+)
+async def post(
+    db_session: DatabaseDependency,
+    job_in: JobIn = Body(...),
+    current_user: Principal = Depends(get_current_user)
+) -> JobOut:
+    """
+    O job executa em segundo plano; acompanhe o progresso e o resultado em GET /jobs/{id}.
+    """
+    job_out = await JobService.submit(db_session=db_session, job_in=job_in, user_id=current_user.id)
+    job_pool.acordar()
+    return job_out
+
+
+@router.get(
+    '/',
+    summary='Consultar os jobs do usuário',
+    status_code=status.HTTP_200_OK,
+    response_model=Page[JobOut],
+)
+async def query(
+    db_session: DatabaseDependency,
+    status: Optional[JobStatus] = Query(None, description='Filtrar pela situação'),
+    params: Params = Depends(),
+    current_user: Principal = Depends(get_current_user)
+) -> Page[JobOut]:
+    return await JobService.query(db_session=db_session, params=params, user_id=current_user.id, status=status)
+
+
+@router.get(
+    '/tipos',
+    summary='Consultar os tipos de job disponíveis',
+    status_code=status.HTTP_200_OK,
+    response_model=List[JobTipoOut],
+)
+async def tipos() -> List[JobTipoOut]:
+    return [
+        JobTipoOut(
+            tipo=job_type.nome, descricao=job_type.descricao, concorrencia=job_type.concorrencia,
+            max_tentativas=job_type.max_tentativas, payload=job_type.payload.model_json_schema(),
+        )
+        for job_type in JOB_TYPES.values()
+    ]
+
+
+@router.get(
+    '/{id}',
+    summary='Consultar um job pelo id',
+    status_code=status.HTTP_200_OK,
+    response_model=JobOut,
+)
+async def get(
+    id: UUID4,
+    db_session: DatabaseDependency,
+    current_user: Principal = Depends(get_current_user)
+) -> JobOut:
+    return await JobService.get(db_session=db_session, id=id, user_id=current_user.id)
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Any, Optional
+from sqlalchemy import JSON, DateTime, Float, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from workout_api.contrib.models import BaseModel
+
+
+class JobModel(BaseModel):
+    """
+    Fila de jobs: cada linha é um trabalho a executar, reservado por um worker com
+    SELECT ... FOR UPDATE SKIP LOCKED (ver `JobService.claim`).
+    """
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        # Busca do próximo job de um tipo na fila
+        Index('ix_jobs_tipo_status_executar_em', 'tipo', 'status', 'executar_em'),
+    )
+
+    pk_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    tipo: Mapped[str] = mapped_column(String(50), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    payload: Mapped[Any] = mapped_column(JSON, nullable=False)
+    resultado: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)
+    erro: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    progresso: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    mensagem: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    tentativas: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_tentativas: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Usuário que criou o job (pk_id de `users`); só ele consulta o job
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
+    # Worker que reservou o job e até quando a reserva vale sem um novo heartbeat
+    worker: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    travado_ate: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Quando o job pode ser reservado (adiado entre as tentativas)
+    executar_em: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    iniciado_em: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    concluido_em: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
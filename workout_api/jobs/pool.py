@@ -0,0 +1,158 @@
+import asyncio
+import contextlib
+import itertools
+import logging
+import os
+import socket
+from typing import List, Optional
+
+from workout_api.configs.settings import settings
+from workout_api.contrib.database import async_session_maker
+from workout_api.contrib.metrics import labels, metrics
+from workout_api.jobs import tasks  # noqa: F401 - registra os tipos de job
+from workout_api.jobs.registry import JOB_TYPES, JobContext
+from workout_api.jobs.service import JobService
+
+logger = logging.getLogger(__name__)
+
+metrics.gauge('workout_jobs_running', 'Jobs em execução neste processo')
+metrics.counter('workout_jobs_finished_total', 'Tentativas de jobs encerradas, por resultado')
+
+
+class JobWorkerPool:
+    """
+    Workers assíncronos que consomem a fila de jobs: cada um reserva um job (ver `JobService.claim`),
+    executa o handler do tipo e grava o resultado. Sem job disponível, espera JOBS_POLL_SECONDS ou
+    até um `acordar()` (job enfileirado por este mesmo processo).
+
+    Enquanto um job executa, um heartbeat renova a reserva a cada terço de JOBS_LEASE_SECONDS; se
+    a reserva já passou a outro worker, a execução é cancelada. No desligamento, os jobs interrompidos
+    voltam para a fila sem gastar uma tentativa.
+    """
+
+    def __init__(self, workers: int, intervalo: float) -> None:
+        self.workers = workers
+        self.intervalo = intervalo
+        self.nome = f'{socket.gethostname()}:{os.getpid()}'
+        self._tasks: List[asyncio.Task] = []
+        self._acordar = asyncio.Event()
+        self._rodizio = itertools.count()
+
+    def acordar(self) -> None:
+        self._acordar.set()
+
+    async def _reservar(self, worker: str):
+        # Tipos em rodízio: um tipo com fila longa não impede os outros de serem reservados
+        tipos = list(JOB_TYPES.values())
+        inicio = next(self._rodizio) % len(tipos)
+        async with async_session_maker() as session:
+            for job_type in tipos[inicio:] + tipos[:inicio]:
+                job = await JobService.claim(session, job_type, worker)
+                if job:
+                    return job
+        return None
+
+    async def _heartbeat(self, pk_id: int, worker: str, progresso: Optional[float] = None,
+                         mensagem: Optional[str] = None) -> bool:
+        async with async_session_maker() as session:
+            return await JobService.heartbeat(session, pk_id, worker, progresso, mensagem)
+
+    async def _manter_reserva(self, pk_id: int, worker: str, perdida: asyncio.Event) -> None:
+        while True:
+            await asyncio.sleep(settings.JOBS_LEASE_SECONDS / 3)
+            try:
+                if not await self._heartbeat(pk_id, worker):
+                    perdida.set()
+                    return
+            except Exception:
+                logger.exception('Falha no heartbeat do job %s', pk_id)
+
+    @staticmethod
+    async def _cancelar(task: asyncio.Task) -> None:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await task
+
+    async def _executar(self, job, worker: str) -> None:
+        job_type = JOB_TYPES[job.tipo]
+        rotulos = labels(tipo=job.tipo)
+        resultado_final = 'concluido'
+        metrics.add('workout_jobs_running', rotulos, 1)
+        # Sinalizado quando um heartbeat é recusado: a reserva venceu e o job passou a outro worker,
+        # então a execução deste é cancelada para que o job não rode em dois lugares
+        perdida = asyncio.Event()
+        reserva = asyncio.create_task(self._manter_reserva(job.pk_id, worker, perdida))
+
+        async def relatar(progresso: float, mensagem: Optional[str]) -> None:
+            if not await self._heartbeat(job.pk_id, worker, progresso, mensagem):
+                perdida.set()
+
+        async def rodar():
+            # Reservado de novo depois de a reserva vencer em todas as tentativas: o job não termina
+            if job.tentativas > job.max_tentativas:
+                raise RuntimeError('Reserva vencida sem conclusão em todas as tentativas (worker interrompido)')
+
+            payload = job_type.payload.model_validate(job.payload)
+            return await job_type.handler(JobContext(job.pk_id, job.id, job.tentativas, relatar), payload)
+
+        execucao = asyncio.create_task(rodar())
+        vigia = asyncio.create_task(perdida.wait())
+        try:
+            await asyncio.wait({execucao, vigia}, return_when=asyncio.FIRST_COMPLETED)
+            if perdida.is_set():
+                resultado_final = 'reserva_perdida'
+                logger.warning('Job %s deixou de pertencer ao worker %s; execução cancelada', job.id, worker)
+                await self._cancelar(execucao)
+            else:
+                resultado = execucao.result()
+        except asyncio.CancelledError:
+            resultado_final = 'interrompido'
+            await self._cancelar(execucao)
+            async with async_session_maker() as session:
+                await JobService.release(session, job.pk_id, worker)
+            raise
+        except Exception as exc:
+            logger.exception('Job %s (%s) falhou na tentativa %s', job.id, job.tipo, job.tentativas)
+            async with async_session_maker() as session:
+                resultado_final = await JobService.fail(session, job, worker, f'{type(exc).__name__}: {exc}')
+        else:
+            if not perdida.is_set():
+                async with async_session_maker() as session:
+                    await JobService.finish(session, job.pk_id, worker, resultado)
+        finally:
+            reserva.cancel()
+            vigia.cancel()
+            metrics.add('workout_jobs_running', rotulos, -1)
+            metrics.inc('workout_jobs_finished_total', labels(tipo=job.tipo, status=resultado_final))
+
+    async def _loop(self, numero: int) -> None:
+        worker = f'{self.nome}:{numero}'
+        while True:
+            try:
+                job = await self._reservar(worker)
+            except Exception:
+                logger.exception('Falha ao reservar um job')
+                job = None
+
+            if job is not None:
+                await self._executar(job, worker)
+                continue
+
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._acordar.wait(), self.intervalo)
+            self._acordar.clear()
+
+    async def start(self) -> None:
+        if JOB_TYPES:
+            self._tasks = [asyncio.create_task(self._loop(numero)) for numero in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+
+job_pool = JobWorkerPool(settings.JOBS_WORKERS, settings.JOBS_POLL_SECONDS)
@@ -0,0 +1,59 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, Type
+
+from workout_api.configs.settings import settings
+from workout_api.contrib.schemas import BaseSchema
+
+
+class JobContext:
+    """
+    O que o handler recebe além do payload: o job em execução e o relato de progresso,
+    que também renova a reserva do job.
+    """
+
+    def __init__(
+        self, pk_id: int, id: Any, tentativa: int, relatar: Callable[[float, Optional[str]], Awaitable[None]]
+    ) -> None:
+        self.pk_id = pk_id
+        self.id = id
+        self.tentativa = tentativa
+        self._relatar = relatar
+
+    async def progresso(self, feito: float, total: Optional[float] = None, mensagem: Optional[str] = None) -> None:
+        """
+        `progresso(0.5)` ou `progresso(500, 1000)`; a mensagem aparece em GET /jobs/{id}.
+        """
+        valor = feito / total if total else feito
+        await self._relatar(min(max(valor, 0.0), 1.0), mensagem)
+
+
+Handler = Callable[[JobContext, Any], Awaitable[Any]]
+
+
+class JobType:
+    def __init__(
+        self, nome: str, handler: Handler, payload: Type[BaseSchema],
+        concorrencia: Optional[int], max_tentativas: int
+    ) -> None:
+        self.nome = nome
+        self.handler = handler
+        self.payload = payload
+        self.concorrencia = concorrencia
+        self.max_tentativas = max_tentativas
+        self.descricao = ' '.join((handler.__doc__ or '').split())
+
+
+JOB_TYPES: Dict[str, JobType] = {}
+
+
+def job_type(
+    nome: str, payload: Type[BaseSchema], concorrencia: Optional[int] = None, max_tentativas: Optional[int] = None
+) -> Callable[[Handler], Handler]:
+    """
+    Registra um tipo de job. `concorrencia` limita quantos jobs do tipo executam ao mesmo tempo,
+    somando todos os workers (None: sem limite). O resultado do handler precisa ser serializável em JSON.
+    """
+    def registrar(handler: Handler) -> Handler:
+        JOB_TYPES[nome] = JobType(nome, handler, payload, concorrencia, max_tentativas or settings.JOBS_MAX_ATTEMPTS)
+        return handler
+
+    return registrar
@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Annotated, Any, Dict, Literal, Optional
+from pydantic import Field
+from workout_api.contrib.schemas import BaseSchema, OutMixin
+
+JobStatus = Literal['pendente', 'executando', 'concluido', 'falhou']
+
+
+# Job a ser enfileirado (endpoint POST /jobs)
+class JobIn(BaseSchema):
+    tipo: Annotated[str, Field(description='Tipo do job', example='atletas.bulk', max_length=50)]
+    payload: Annotated[Dict[str, Any], Field(default_factory=dict, description='Parâmetros do job (dependem do tipo)')]
+
+
+# Situação de um job (endpoints GET /jobs e GET /jobs/{id})
+class JobOut(OutMixin):
+    tipo: Annotated[str, Field(description='Tipo do job', example='atletas.bulk')]
+    status: Annotated[JobStatus, Field(description='Situação do job', example='executando')]
+    progresso: Annotated[float, Field(description='Fração concluída, de 0 a 1', example=0.4)]
+    mensagem: Annotated[Optional[str], Field(None, description='Última mensagem de progresso', example='4000 de 10000 registros')]
+    tentativas: Annotated[int, Field(description='Tentativas iniciadas', example=1)]
+    max_tentativas: Annotated[int, Field(description='Tentativas permitidas antes de falhar', example=3)]
+    resultado: Annotated[Optional[Any], Field(None, description='Resultado do job, quando concluído')]
+    erro: Annotated[Optional[str], Field(None, description='Erro da última tentativa')]
+    iniciado_em: Annotated[Optional[datetime], Field(None, description='Início da última tentativa')]
+    concluido_em: Annotated[Optional[datetime], Field(None, description='Fim do job (concluído ou falhou)')]
+
+
+# Tipo de job disponível (endpoint GET /jobs/tipos)
+class JobTipoOut(BaseSchema):
+    tipo: Annotated[str, Field(description='Tipo do job', example='atletas.bulk')]
+    descricao: Annotated[str, Field(description='O que o job faz')]
+    concorrencia: Annotated[Optional[int], Field(None, description='Máximo de jobs do tipo executando ao mesmo tempo (todos os workers)')]
+    max_tentativas: Annotated[int, Field(description='Tentativas permitidas antes de falhar', example=3)]
+    payload: Annotated[Dict[str, Any], Field(description='JSON Schema do payload')]
@@ -0,0 +1,218 @@
+from datetime import datetime, timedelta
+from typing import Any, Optional
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+from fastapi_pagination import Page, Params, create_page
+from pydantic import ValidationError
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from workout_api.configs.settings import settings
+from workout_api.contrib.dependencies import DatabaseDependency
+from workout_api.jobs.models import JobModel
+from workout_api.jobs.registry import JOB_TYPES, JobType
+from workout_api.jobs.schemas import JobIn, JobOut
+
+# Chave (primeiro inteiro) dos advisory locks que serializam a reserva dos tipos com limite de concorrência
+_LOCK_JOBS = 0x4A4F4253
+
+# Colunas que o worker precisa para executar um job reservado
+_COLUNAS_RESERVA = (
+    JobModel.pk_id, JobModel.id, JobModel.tipo, JobModel.payload, JobModel.tentativas, JobModel.max_tentativas,
+)
+
+
+class JobService:
+    @staticmethod
+    async def submit(db_session: DatabaseDependency, job_in: JobIn, user_id: Optional[int]) -> JobOut:
+        """
+        Valida o payload pelo schema do tipo e enfileira o job.
+        """
+        job_type = JOB_TYPES.get(job_in.tipo)
+        if job_type is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f'Tipo de job desconhecido: {job_in.tipo}. Disponíveis: {", ".join(JOB_TYPES)}'
+            )
+
+        try:
+            payload = job_type.payload.model_validate(job_in.payload)
+        except ValidationError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=[{**erro, 'loc': ['body', 'payload', *erro['loc']]} for erro in exc.errors(include_url=False)]
+            )
+
+        agora = datetime.utcnow()
+        job = JobModel(
+            id=uuid4(), tipo=job_type.nome, status='pendente', payload=payload.model_dump(mode='json'),
+            progresso=0.0, tentativas=0, max_tentativas=job_type.max_tentativas, user_id=user_id,
+            executar_em=agora, created_at=agora, updated_at=agora,
+        )
+        db_session.add(job)
+        await db_session.commit()
+
+        return JobOut.model_validate(job)
+
+    @staticmethod
+    async def get(db_session: DatabaseDependency, id: str, user_id: Optional[int]) -> JobOut:
+        job = (await db_session.execute(select(JobModel).filter_by(id=id, user_id=user_id))).scalars().first()
+
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f'Job não encontrado com id: {id}'
+            )
+
+        return JobOut.model_validate(job)
+
+    @staticmethod
+    async def query(
+        db_session: DatabaseDependency, params: Params, user_id: Optional[int], status: Optional[str] = None
+    ) -> Page[JobOut]:
+        """
+        Jobs do usuário, do mais recente para o mais antigo.
+        """
+        raw_params = params.to_raw_params()
+        filtro = JobModel.user_id == user_id
+        if status:
+            filtro = and_(filtro, JobModel.status == status)
+
+        total: int = (await db_session.execute(select(func.count()).select_from(JobModel).where(filtro))).scalar_one()
+        jobs = (await db_session.execute(
+            select(JobModel).where(filtro).order_by(JobModel.pk_id.desc())
+            .limit(raw_params.limit).offset(raw_params.offset)
+        )).scalars().all()
+
+        return create_page([JobOut.model_validate(job) for job in jobs], total, params)
+
+    @staticmethod
+    async def claim(db_session: AsyncSession, job_type: JobType, worker: str):
+        """
+        Reserva o próximo job do tipo com um único UPDATE sobre um SELECT ... FOR UPDATE SKIP LOCKED:
+        workers concorrentes pulam as linhas já travadas em vez de esperar por elas.
+        Jobs em execução com a reserva vencida (worker interrompido) voltam a ser reservados.
+
+        Com limite de concorrência, a contagem e a reserva rodam sob um advisory lock do tipo, para que
+        dois workers não passem do limite ao mesmo tempo; se outro worker está reservando, devolve None.
+        """
+        agora = datetime.utcnow()
+        try:
+            if job_type.concorrencia is not None:
+                if db_session.get_bind().dialect.name == 'postgresql':
+                    travado = (await db_session.execute(
+                        select(func.pg_try_advisory_xact_lock(_LOCK_JOBS, func.hashtext(job_type.nome)))
+                    )).scalar()
+                    if not travado:
+                        return None
+
+                executando: int = (await db_session.execute(
+                    select(func.count()).select_from(JobModel).where(
+                        JobModel.tipo == job_type.nome,
+                        JobModel.status == 'executando',
+                        JobModel.travado_ate >= agora,
+                    )
+                )).scalar_one()
+                if executando >= job_type.concorrencia:
+                    return None
+
+            proximo = (
+                select(JobModel.pk_id)
+                .where(
+                    JobModel.tipo == job_type.nome,
+                    or_(
+                        and_(JobModel.status == 'pendente', JobModel.executar_em <= agora),
+                        and_(JobModel.status == 'executando', JobModel.travado_ate < agora),
+                    ),
+                )
+                .order_by(JobModel.executar_em, JobModel.pk_id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            row = (await db_session.execute(
+                update(JobModel)
+                .where(JobModel.pk_id == proximo)
+                .values(
+                    status='executando', tentativas=JobModel.tentativas + 1, worker=worker,
+                    travado_ate=agora + timedelta(seconds=settings.JOBS_LEASE_SECONDS),
+                    iniciado_em=agora, updated_at=agora,
+                )
+                .returning(*_COLUNAS_RESERVA)
+                .execution_options(synchronize_session=False)
+            )).first()
+            await db_session.commit()
+            return row
+        finally:
+            # Libera o advisory lock mesmo quando não houve reserva
+            await db_session.rollback()
+
+    @staticmethod
+    def _do_worker(pk_id: int, worker: str):
+        # Só o worker que detém a reserva altera o job (a reserva pode ter vencido e passado a outro)
+        return update(JobModel).where(JobModel.pk_id == pk_id, JobModel.worker == worker)
+
+    @staticmethod
+    async def heartbeat(
+        db_session: AsyncSession, pk_id: int, worker: str,
+        progresso: Optional[float] = None, mensagem: Optional[str] = None
+    ) -> bool:
+        """
+        Renova a reserva (e opcionalmente o progresso). Devolve False se o job não é mais deste worker.
+        """
+        agora = datetime.utcnow()
+        valores: dict = {'travado_ate': agora + timedelta(seconds=settings.JOBS_LEASE_SECONDS), 'updated_at': agora}
+        if progresso is not None:
+            valores['progresso'] = progresso
+        if mensagem is not None:
+            valores['mensagem'] = mensagem[:200]
+
+        result = await db_session.execute(
+            JobService._do_worker(pk_id, worker).where(JobModel.status == 'executando').values(**valores)
+        )
+        await db_session.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    async def finish(db_session: AsyncSession, pk_id: int, worker: str, resultado: Any) -> None:
+        agora = datetime.utcnow()
+        await db_session.execute(JobService._do_worker(pk_id, worker).values(
+            status='concluido', resultado=resultado, erro=None, progresso=1.0,
+            worker=None, travado_ate=None, concluido_em=agora, updated_at=agora,
+        ))
+        await db_session.commit()
+
+    @staticmethod
+    async def fail(db_session: AsyncSession, job, worker: str, erro: str) -> str:
+        """
+        Registra o erro da tentativa. Com tentativas restantes, o job volta para a fila depois de
+        JOBS_RETRY_BACKOFF_SECONDS (dobrando a cada tentativa); senão, termina como `falhou`.
+        """
+        agora = datetime.utcnow()
+        if job.tentativas < job.max_tentativas:
+            espera = settings.JOBS_RETRY_BACKOFF_SECONDS * 2 ** (job.tentativas - 1)
+            status_final = 'pendente'
+            valores = {'executar_em': agora + timedelta(seconds=espera)}
+        else:
+            status_final = 'falhou'
+            valores = {'concluido_em': agora}
+
+        await db_session.execute(JobService._do_worker(job.pk_id, worker).values(
+            status=status_final, erro=erro, worker=None, travado_ate=None, updated_at=agora, **valores
+        ))
+        await db_session.commit()
+        return status_final
+
+    @staticmethod
+    async def release(db_session: AsyncSession, pk_id: int, worker: str) -> None:
+        """
+        Devolve à fila um job interrompido pelo desligamento do worker, sem gastar uma tentativa.
+        """
+        agora = datetime.utcnow()
+        await db_session.execute(JobService._do_worker(pk_id, worker).values(
+            status='pendente', tentativas=JobModel.tentativas - 1, worker=None, travado_ate=None,
+            executar_em=agora, updated_at=agora,
+        ))
+        await db_session.commit()
@@ -0,0 +1,52 @@
+from typing import Annotated, Any, Dict, List
+
+from pydantic import Field
+
+from workout_api.atleta.service import AtletaService
+from workout_api.atleta.stats import percentis_refresher, reconstruir_resumo
+from workout_api.configs.settings import settings
+from workout_api.contrib.database import async_session_maker, engine
+from workout_api.contrib.schemas import BaseSchema
+from workout_api.jobs.registry import JobContext, job_type
+
+
+class AtletasBulkPayload(BaseSchema):
+    registros: Annotated[List[Dict[str, Any]], Field(
+        description='Atletas a importar, no formato de POST /atletas/', min_length=1
+    )]
+
+
+class SemPayload(BaseSchema):
+    pass
+
+
+@job_type('atletas.bulk', AtletasBulkPayload, concorrencia=2)
+async def importar_atletas(ctx: JobContext, payload: AtletasBulkPayload) -> dict:
+    """
+    Importa atletas em lote, como POST /atletas/bulk, fora da requisição. Repetir a importação
+    é seguro: CPFs já inseridos numa tentativa anterior aparecem como `cpf_duplicado`.
+    """
+    total = len(payload.registros)
+
+    async def registros():
+        for linha, registro in enumerate(payload.registros, 1):
+            yield registro
+            if linha % settings.ATLETA_BULK_CHUNK_SIZE == 0:
+                await ctx.progresso(linha, total, f'{linha} de {total} registros')
+
+    async with async_session_maker() as session:
+        resultado = await AtletaService.bulk_create(db_session=session, registros=registros())
+    return resultado.model_dump(mode='json')
+
+
+@job_type('atletas.stats', SemPayload, concorrencia=1)
+async def reconstruir_stats(ctx: JobContext, payload: SemPayload) -> dict:
+    """
+    Recalcula o resumo de GET /atletas/stats a partir da tabela de atletas e atualiza os percentis.
+    """
+    async with engine.begin() as conn:
+        await reconstruir_resumo(conn)
+    await ctx.progresso(0.5, mensagem='Resumo recalculado')
+
+    atualizados = engine.dialect.name == 'postgresql' and await percentis_refresher.refresh(engine)
+    return {'percentis_atualizados': atualizados}
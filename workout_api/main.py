@@ -1,6 +1,63 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi_pagination import add_pagination
+
+from workout_api.atleta.changes import atleta_changes
+from workout_api.atleta.stats import percentis_refresher
+from workout_api.auth.security import password_hasher
+from workout_api.categorias.cache import categorias_cache
+from workout_api.centro_treinamento.cache import centros_treinamento_cache
+from workout_api.contrib.database import async_session_maker, engine, warm_up_pool
+from workout_api.contrib.instrumentation import QueryInstrumentationMiddleware
+from workout_api.contrib.metrics import MetricsMiddleware, multiprocess
+from workout_api.contrib.middleware import (CompressionMiddleware, ReadYourWritesMiddleware,
+                                            SessionReleaseMiddleware)
+from workout_api.configs.settings import settings
+from workout_api.contrib.replicas import replica_router
+from workout_api.contrib.responses import FastJSONResponse
+from workout_api.jobs.pool import job_pool
 from workout_api.routers import api_router
 
-app = FastAPI(title='WorkoutApi')
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up_pool()
+    await replica_router.start()
+
+    # Carrega os dados de referência antes de aceitar requisições
+    async with async_session_maker() as session:
+        await categorias_cache.load(session)
+        await centros_treinamento_cache.load(session)
+
+    if multiprocess:
+        await multiprocess.start()
+    await percentis_refresher.start(engine)
+    await atleta_changes.start(engine)
+    await job_pool.start()
+
+    yield
+
+    await job_pool.stop()
+    await atleta_changes.stop()
+    await percentis_refresher.stop()
+    if multiprocess:
+        await multiprocess.stop()
+    password_hasher.shutdown()
+    await replica_router.stop()
+    await engine.dispose()
+
+
+app = FastAPI(
+    title='WorkoutApi',
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse if settings.FAST_RESPONSES else JSONResponse,
+)
+app.add_middleware(SessionReleaseMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(QueryInstrumentationMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.include_router(api_router)
 add_pagination(app)
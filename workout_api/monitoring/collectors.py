@@ -0,0 +1,81 @@
+from typing import Any, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from workout_api.atleta.service import atletas_total_cache
+from workout_api.auth.dependencies import principal_cache
+from workout_api.auth.security import password_hasher
+from workout_api.categorias.cache import categorias_cache
+from workout_api.centro_treinamento.cache import centros_treinamento_cache
+from workout_api.contrib.database import PoolOccupancy, engine, occupancy, pool_stats
+from workout_api.contrib.metrics import Metrics, labels, metrics
+from workout_api.contrib.replicas import replica_router
+
+# Estatísticas do `pool_stats` expostas e o tipo de cada uma
+_POOL = {
+    'size': ('gauge', 'Tamanho configurado do pool'),
+    'checked_out': ('gauge', 'Conexões emprestadas no momento'),
+    'checked_in': ('gauge', 'Conexões ociosas no pool'),
+    'overflow': ('gauge', 'Conexões extras além do tamanho do pool'),
+    'in_use_max': ('gauge', 'Maior número de conexões em uso ao mesmo tempo'),
+    'checkouts': ('counter', 'Conexões emprestadas pelo pool'),
+    'wait_seconds_total': ('counter', 'Tempo total de espera por uma conexão'),
+    'wait_seconds_max': ('gauge', 'Maior espera por uma conexão'),
+    'held_seconds_total': ('counter', 'Tempo total em que as conexões ficaram emprestadas'),
+}
+
+for _chave, (_tipo, _descricao) in _POOL.items():
+    if _tipo == 'counter':
+        metrics.counter(f'workout_db_pool_{_chave}', _descricao)
+    else:
+        metrics.gauge(f'workout_db_pool_{_chave}', _descricao, agregacao='max' if _chave.endswith('_max') else 'sum')
+
+metrics.gauge('workout_password_hash_pending', 'Operações de bcrypt na fila ou executando')
+metrics.gauge('workout_password_hash_max_pending', 'Limite de operações de bcrypt antes do 503')
+metrics.counter('workout_cache_hits_total', 'Acessos atendidos pelo cache')
+metrics.counter('workout_cache_misses_total', 'Acessos que foram ao banco')
+metrics.ratio(
+    'workout_cache_hit_ratio', 'Proporção de acessos atendidos pelo cache',
+    acertos='workout_cache_hits_total', erros='workout_cache_misses_total'
+)
+metrics.gauge('workout_cache_size', 'Entradas no cache')
+
+
+def _pool(m: Metrics, banco: str, engine: AsyncEngine, occupancy: Optional[PoolOccupancy]) -> None:
+    stats: Dict[str, Any] = pool_stats(engine, occupancy)
+    for chave, (tipo, _) in _POOL.items():
+        if chave not in stats:
+            continue
+        nome = f'workout_db_pool_{chave}'
+        if tipo == 'counter':
+            m.counters[(nome, labels(database=banco))] = stats[chave]
+        else:
+            m.set(nome, labels(database=banco), stats[chave])
+
+
+@metrics.collector
+def coletar_pools(m: Metrics) -> None:
+    _pool(m, 'primary', engine, occupancy)
+    for replica in replica_router.replicas:
+        _pool(m, replica.name, replica.engine, replica.occupancy)
+
+
+@metrics.collector
+def coletar_password_hasher(m: Metrics) -> None:
+    m.set('workout_password_hash_pending', (), password_hasher.pending)
+    m.set('workout_password_hash_max_pending', (), password_hasher.max_pending)
+
+
+@metrics.collector
+def coletar_caches(m: Metrics) -> None:
+    caches = {
+        'principal': principal_cache.stats(),
+        'categorias': categorias_cache.stats(),
+        'centros_treinamento': centros_treinamento_cache.stats(),
+        'atletas_total': atletas_total_cache.stats(),
+    }
+    for nome, stats in caches.items():
+        rotulos = labels(cache=nome)
+        m.counters[('workout_cache_hits_total', rotulos)] = stats['hits']
+        m.counters[('workout_cache_misses_total', rotulos)] = stats['misses']
+        m.set('workout_cache_size', rotulos, stats['size'])
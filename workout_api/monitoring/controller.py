@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Response, status
+
+from workout_api.contrib.database import pool_stats
+from workout_api.contrib.metrics import CONTENT_TYPE, collect
+from workout_api.contrib.replicas import replica_router
+from workout_api.monitoring import collectors  # noqa: F401 - registra os collectors do /metrics
+
+router = APIRouter()
+
+
+@router.get(
+    '/health',
+    summary='Verificar se a API está pronta',
+    status_code=status.HTTP_200_OK,
+)
+async def health() -> dict:
+    # Só responde depois do lifespan, ou seja, com o pool já aquecido e os caches carregados
+    return {'status': 'ok'}
+
+
+@router.get(
+    '/health/pool',
+    summary='Consultar as estatísticas do pool de conexões',
+    status_code=status.HTTP_200_OK,
+)
+async def pool() -> dict:
+    return {
+        'primary': pool_stats(),
+        'replicas': {
+            replica.name: {'healthy': replica.healthy, 'lag': replica.lag, **pool_stats(replica.engine, replica.occupancy)}
+            for replica in replica_router.replicas
+        },
+    }
+
+
+@router.get(
+    '/metrics',
+    summary='Métricas no formato do Prometheus',
+    status_code=status.HTTP_200_OK,
+    response_class=Response,
+)
+async def prometheus_metrics() -> Response:
+    return Response(content=collect(), media_type=CONTENT_TYPE)
@@ -1,11 +1,20 @@
 from fastapi import APIRouter
 from workout_api.atleta.controller import router as atleta
-from workout_api.categoria.controller import router as categoria
+from workout_api.categorias.controller import router as categoria
 from workout_api.centro_treinamento.controller import router as centro_treinamento
 from workout_api.auth.controller import router as auth
+from workout_api.contrib.instrumentation import query_budget
+from workout_api.jobs.controller import router as jobs
+from workout_api.monitoring.controller import router as monitoring
 
+# Orçamento de consultas SQL por requisição de cada router (verificado com SQL_QUERY_BUDGET_MODE).
+# Além das consultas da própria rota, qualquer requisição pode fazer até 5: o usuário autenticado
+# (fora do cache do principal) e, para categorias e centros de treinamento, a conferência da versão
+# e a recarga do cache. As rotas de escrita de /atletas declaram orçamentos próprios.
 api_router = APIRouter()
-api_router.include_router(auth, prefix='/auth')
-api_router.include_router(atleta, prefix='/atletas')
-api_router.include_router(categoria, prefix='/categorias')
-api_router.include_router(centro_treinamento, prefix='/centros_treinamento')
+api_router.include_router(auth, prefix='/auth', dependencies=[query_budget(3)])
+api_router.include_router(atleta, prefix='/atletas', dependencies=[query_budget(6)])
+api_router.include_router(categoria, prefix='/categorias', dependencies=[query_budget(4)])
+api_router.include_router(centro_treinamento, prefix='/centros_treinamento', dependencies=[query_budget(4)])
+api_router.include_router(jobs, prefix='/jobs', dependencies=[query_budget(3)])
+api_router.include_router(monitoring, tags=['monitoring'], dependencies=[query_budget(0)])
@@ -0,0 +1,44 @@
+"""
+Processo dedicado à fila de jobs (/jobs), sem servir HTTP. Pode rodar em várias máquinas ao mesmo
+tempo: a reserva com SKIP LOCKED e os limites de concorrência por tipo valem para todos os workers.
+
+    python -m workout_api.worker --workers 4
+
+Com workers dedicados, a API pode subir com JOBS_WORKERS=0.
+"""
+import argparse
+import asyncio
+import logging
+import signal
+
+from workout_api.configs.settings import settings
+from workout_api.contrib.database import engine
+from workout_api.jobs.pool import JobWorkerPool
+
+logger = logging.getLogger('workout_api.worker')
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=max(settings.JOBS_WORKERS, 1), help='jobs executando ao mesmo tempo')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s %(message)s')
+
+    parar = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sinal in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sinal, parar.set)
+
+    pool = JobWorkerPool(args.workers, settings.JOBS_POLL_SECONDS)
+    await pool.start()
+    logger.info('%s workers consumindo a fila de jobs (%s)', args.workers, pool.nome)
+
+    await parar.wait()
+    # Os jobs interrompidos voltam para a fila e serão retomados por outro worker
+    await pool.stop()
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())